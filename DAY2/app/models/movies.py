@@ -3,6 +3,9 @@ _id_counter = 0
 
 
 class MovieModel:
+    # 인스턴스마다 __dict__ 를 만들지 않도록 속성을 고정합니다. (레코드당 메모리 절약)
+    __slots__ = ("id", "title", "playtime", "genre")
+
     def __init__(self, id: int, title: str, playtime: int, genre: str):
         self.id = id
         self.title = title
@@ -22,9 +25,24 @@ class MovieModel:
         return list(_db.values())
 
     @classmethod
-    def search(cls, title: str | None = None, genre: str | None = None):
+    def page(cls, after_id: int = 0, limit: int | None = None):
+        # id는 1씩 증가하고 재사용되지 않으므로 after_id 다음 id부터 순서대로 확인합니다. (keyset 페이지네이션)
+        results = []
+        for movie_id in range(after_id + 1, _id_counter + 1):
+            movie = _db.get(movie_id)
+            if movie is not None:
+                results.append(movie)
+                if len(results) == limit:
+                    break
+        return results
+
+    @classmethod
+    def search(cls, title: str | None = None, genre: str | None = None, after_id: int = 0,
+               limit: int | None = None):
         results = []
         for movie in _db.values():
+            if movie.id <= after_id:
+                continue
             match = True
             if title is not None and title.lower() not in movie.title.lower():
                 match = False
@@ -33,6 +51,8 @@ class MovieModel:
 
             if match:
                 results.append(movie)
+                if len(results) == limit:
+                    break
 
         return results
 
@@ -27,6 +27,18 @@ class UserModel:
     def all(cls):
         return list(_db.values())
 
+    @classmethod
+    def page(cls, after_id: int = 0, limit: int | None = None):
+        # id는 1씩 증가하고 재사용되지 않으므로 after_id 다음 id부터 순서대로 확인합니다. (keyset 페이지네이션)
+        results = []
+        for user_id in range(after_id + 1, _id_counter + 1):
+            user = _db.get(user_id)
+            if user is not None:
+                results.append(user)
+                if len(results) == limit:
+                    break
+        return results
+
     def update(self, user_data):
         if user_data.username is not None:
             self.username = user_data.username
@@ -41,9 +53,12 @@ class UserModel:
         return False
 
     @classmethod
-    def search(cls, username: str | None = None, age: int | None = None, gender=None):
+    def search(cls, username: str | None = None, age: int | None = None, gender=None, after_id: int = 0,
+               limit: int | None = None):
         results = []
         for user in _db.values():
+            if user.id <= after_id:
+                continue
             match = True
             if username is not None and username.lower() not in user.username.lower():
                 match = False
@@ -54,5 +69,7 @@ class UserModel:
 
             if match:
                 results.append(user)
+                if len(results) == limit:
+                    break
 
         return results
\ No newline at end of file
@@ -0,0 +1,10 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# 목록/검색 API 공통 페이지네이션 쿼리 매개변수
+class PageParams(BaseModel):
+    limit: int = Field(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+    cursor: Optional[str] = None
@@ -0,0 +1,33 @@
+import base64
+import binascii
+from typing import Any, Callable, List, Optional
+from fastapi import HTTPException, Response, status
+
+# 다음 페이지 커서를 담는 응답 헤더
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_id: int) -> str:
+    return base64.urlsafe_b64encode(f"id:{last_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> int:
+    """커서를 마지막으로 받은 id 로 되돌립니다. 커서가 없으면 0 (첫 페이지)."""
+    if not cursor:
+        return 0
+    try:
+        decoded = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        prefix, last_id = decoded.split(":", 1)
+        if prefix != "id":
+            raise ValueError(cursor)
+        return int(last_id)
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def paginate(response: Response, items: List[Any], limit: int, get_id: Callable[[Any], int]) -> List[Any]:
+    """limit + 1 개를 조회한 결과를 받아, 다음 페이지가 있으면 커서 헤더를 붙이고 limit 개만 반환합니다."""
+    if len(items) > limit:
+        items = items[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(get_id(items[-1]))
+    return items
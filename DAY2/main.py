@@ -1,11 +1,13 @@
 # main.py
 
-from typing import List
-from fastapi import FastAPI, HTTPException, Path, Depends, status
+from typing import List, Union
+from fastapi import FastAPI, HTTPException, Path, Query, Depends, Response, status
 from app.models.users import UserModel
 from app.schemas.users import UserCreate, UserRead, UserUpdate, UserSearch
 from app.models.movies import MovieModel
 from app.schemas.movies import MovieCreate, MovieRead, MovieSearch, MovieUpdate
+from app.schemas.pagination import PageParams
+from app.utils.pagination import decode_cursor, paginate
 
 app = FastAPI()
 
@@ -22,11 +24,11 @@ async def create_user(user_data: UserCreate):
 
 
 @app.get("/users/", response_model=List[UserRead])
-async def get_all_users():
-    users = UserModel.all()
+async def get_all_users(response: Response, page: PageParams = Depends()):
+    users = UserModel.page(after_id=decode_cursor(page.cursor), limit=page.limit + 1)
     if not users:
         raise HTTPException(status_code=404, detail="User not found")
-    return users
+    return paginate(response, users, page.limit, lambda user: user.id)
 
 
 @app.get("/users/{user_id}", response_model=UserRead)
@@ -59,41 +61,49 @@ async def delete_user(user_id: int = Path(..., gt=0)):
 
 
 @app.get("/users/search/", response_model=List[UserRead])
-async def search_users(params: UserSearch = Depends()):
+async def search_users(response: Response, params: UserSearch = Depends(), page: PageParams = Depends()):
     users = UserModel.search(
         username=params.username,
         age=params.age,
-        gender=params.gender
+        gender=params.gender,
+        after_id=decode_cursor(page.cursor),
+        limit=page.limit + 1
     )
     if not users:
         raise HTTPException(status_code=404, detail="User not found")
-    return users
+    return paginate(response, users, page.limit, lambda user: user.id)
 
 
 # --- 영화 관련 라우터 ---
-@app.post("/movies/", response_model=List[MovieRead], status_code=status.HTTP_201_CREATED)
-async def create_movie(movie_data: MovieCreate):
-    MovieModel.create(
+@app.post("/movies/", response_model=Union[MovieRead, List[MovieRead]], status_code=status.HTTP_201_CREATED)
+async def create_movie(
+        movie_data: MovieCreate,
+        legacy: bool = Query(False, description="true 이면 예전처럼 전체 영화 목록을 반환합니다."),
+):
+    movie = MovieModel.create(
         title=movie_data.title,
         playtime=movie_data.playtime,
         genre=movie_data.genre
     )
-    all_movies = MovieModel.all()
-    return all_movies
+    if legacy:
+        return MovieModel.all()
+    return movie
 
 
 @app.get("/movies/", response_model=List[MovieRead], status_code=status.HTTP_200_OK)
-async def get_movies(params: MovieSearch = Depends()):
+async def get_movies(response: Response, params: MovieSearch = Depends(), page: PageParams = Depends()):
+    after_id = decode_cursor(page.cursor)
     is_search_query = params.title is not None or params.genre is not None
 
     if is_search_query:
-        movies = MovieModel.search(title=params.title, genre=params.genre)
-        if not movies:
-            movies = MovieModel.all()
+        movies = MovieModel.search(title=params.title, genre=params.genre, after_id=after_id, limit=page.limit + 1)
+        if not movies and not MovieModel.search(title=params.title, genre=params.genre, limit=1):
+            # 검색 결과가 하나도 없으면 전체 목록을 반환합니다.
+            movies = MovieModel.page(after_id=after_id, limit=page.limit + 1)
     else:
-        movies = MovieModel.all()
+        movies = MovieModel.page(after_id=after_id, limit=page.limit + 1)
 
-    return movies
+    return paginate(response, movies, page.limit, lambda movie: movie.id)
 
 
 @app.get("/movies/{movie_id}", response_model=MovieRead, status_code=status.HTTP_200_OK)
@@ -0,0 +1,78 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class VersionConflict(Exception):
+    """낙관적 갱신(expected_version)에 실패했을 때 발생합니다. current 는 현재 버전입니다."""
+
+    def __init__(self, current: int):
+        super().__init__(f"version conflict (current: {current})")
+        self.current = current
+
+    def __reduce__(self):
+        # 공유 저장소 프로세스에서 워커로 전달될 때 current 가 그대로 복원되도록 합니다.
+        return VersionConflict, (self.current,)
+
+
+class IdAllocator:
+    """스레드 안전한 id 발급기. 발급한 id 는 다시 쓰지 않습니다."""
+
+    def __init__(self, start: int = 1):
+        self._lock = threading.Lock()
+        self._next = start
+
+    def allocate(self) -> int:
+        with self._lock:
+            allocated = self._next
+            self._next += 1
+            return allocated
+
+    def reset(self, start: int = 1) -> None:
+        with self._lock:
+            self._next = start
+
+    @property
+    def last(self) -> int:
+        """지금까지 발급한 가장 큰 id (없으면 start - 1)."""
+        return self._next - 1
+
+
+class RWLock:
+    """읽기는 여러 스레드가 동시에, 쓰기는 한 스레드만 합니다.
+
+    읽기는 진행 중인 쓰기 하나만 기다리고, 대기 중인 쓰기 뒤로 줄 서지 않습니다. (reader-preferring)
+    재진입은 지원하지 않으므로 잠금 안에서 같은 잠금을 다시 잡는 메서드를 부르면 안 됩니다.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writing = False
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        with self._cond:
+            while self._writing:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        with self._cond:
+            while self._writing or self._readers:
+                self._cond.wait()
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writing = False
+                self._cond.notify_all()
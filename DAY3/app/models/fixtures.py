@@ -0,0 +1,27 @@
+import json
+import os
+from typing import Dict, Tuple
+
+from app.models.movies import MovieModel
+from app.models.users import UserModel
+
+# 기본 시드 데이터. 유저 비밀번호는 미리 bcrypt 로 해싱해 두어 불러올 때 해싱하지 않습니다.
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                            "fixtures", "seed.json")
+
+
+def load_fixture(path: str = FIXTURE_PATH) -> Dict:
+    """{"users": [{username, hashed_password, age, gender}], "movies": [{title, playtime, genre}]}"""
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def seed(path: str = FIXTURE_PATH) -> Tuple[int, int]:
+    """비어 있는 모델에 fixture 를 넣고 (유저 수, 영화 수)를 반환합니다. 이미 데이터가 있으면 건너뜁니다."""
+    fixture = load_fixture(path)
+    users = movies = 0
+    if not UserModel._db:
+        users = sum(user is not None for user in UserModel._insert_many(fixture.get("users", [])))
+    if not MovieModel.page(0, 1):
+        movies = len(MovieModel.create_many(fixture.get("movies", [])))
+    return users, movies
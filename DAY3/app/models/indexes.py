@@ -0,0 +1,457 @@
+import os
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from heapq import heapify, heappop
+from typing import (Any, Callable, Dict, Hashable, Iterable, Iterator, List, MutableSequence, Optional, Sequence, Set, Tuple,
+                    Union)
+
+# 레코드(dict 또는 객체)에서 인덱싱할 값을 꺼내는 함수
+KeyFunc = Callable[[Any], Any]
+
+# 1 이면 메모리를 덜 쓰는 대신 검색이 조금 느린 배열 기반 역색인을 사용합니다.
+COMPACT_STORAGE = os.getenv("COMPACT_STORAGE", "0") == "1"
+
+
+class HashIndex:
+    """값 -> id 집합. 동등(==) 조건 검색에 사용합니다."""
+
+    def __init__(self, key: KeyFunc):
+        self.key = key
+        self._buckets: Dict[Hashable, Set[int]] = {}
+
+    def add(self, record_id: int, record: Any) -> None:
+        self._buckets.setdefault(self.key(record), set()).add(record_id)
+
+    def remove(self, record_id: int, record: Any) -> None:
+        value = self.key(record)
+        bucket = self._buckets.get(value)
+        if bucket is None:
+            return
+        bucket.discard(record_id)
+        if not bucket:
+            del self._buckets[value]
+
+    def get(self, value: Hashable) -> Set[int]:
+        return self._buckets.get(value, set())
+
+    def items(self) -> Iterable[Tuple[Hashable, Set[int]]]:
+        return self._buckets.items()
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+
+class SortedIndex:
+    """(값, id) 순으로 정렬된 인덱스. 범위(low <= 값 <= high) 검색에 사용합니다.
+
+    (값, id) 튜플 대신 값 / id 를 나란한 두 배열에 담아 레코드당 메모리를 줄입니다.
+    typecode 를 주면 array.array(typecode) 에, 없으면 list 에 담습니다. (값이 정수가 아닐 때)
+    """
+
+    def __init__(self, key: KeyFunc, typecode: Optional[str] = None):
+        self.key = key
+        self.typecode = typecode
+        self._values: MutableSequence[Any] = self._new()
+        self._ids: MutableSequence[int] = self._new()
+
+    def _new(self) -> MutableSequence[Any]:
+        return array(self.typecode) if self.typecode else []
+
+    def add(self, record_id: int, record: Any) -> None:
+        value = self.key(record)
+        if not self._values or (value, record_id) > (self._values[-1], self._ids[-1]):
+            # 대부분 id 가 증가하는 순서로 들어오므로 끝에 붙이는 경우를 먼저 처리합니다.
+            pos = len(self._values)
+        else:
+            pos = self._position(value, record_id)
+        self._values.insert(pos, value)
+        self._ids.insert(pos, record_id)
+
+    def remove(self, record_id: int, record: Any) -> None:
+        value = self.key(record)
+        pos = self._position(value, record_id)
+        if pos < len(self._values) and self._values[pos] == value and self._ids[pos] == record_id:
+            del self._values[pos]
+            del self._ids[pos]
+
+    def _position(self, value: Any, record_id: int) -> int:
+        start = bisect_left(self._values, value)
+        end = bisect_right(self._values, value, start)
+        return bisect_left(self._ids, record_id, start, end)
+
+    def bounds(self, low: Any = None, high: Any = None) -> Tuple[int, int]:
+        start = 0 if low is None else bisect_left(self._values, low)
+        end = len(self._values) if high is None else bisect_right(self._values, high)
+        return start, max(start, end)
+
+    def ids(self, low: Any = None, high: Any = None) -> Set[int]:
+        start, end = self.bounds(low, high)
+        return set(self._ids[start:end])
+
+    def ids_after(self, value: Any = None, limit: Optional[int] = None) -> List[int]:
+        """값이 value 보다 큰 항목의 id 를 정렬 순서대로 최대 limit 개 반환합니다. (keyset 페이지네이션)"""
+        start = 0 if value is None else bisect_right(self._values, value)
+        end = len(self._values) if limit is None else start + limit
+        return list(self._ids[start:end])
+
+    def iter_after(self, value: Any = None) -> Iterator[int]:
+        """ids_after 와 같지만 복사하지 않고 하나씩 꺼냅니다. (개수를 모르는 스캔용, 읽기 잠금 안에서 사용)"""
+        ids = self._ids
+        for pos in range(0 if value is None else bisect_right(self._values, value), len(ids)):
+            yield ids[pos]
+
+    def clear(self) -> None:
+        self._values = self._new()
+        self._ids = self._new()
+
+
+class NGramIndex:
+    """n-gram -> id 모음 (역색인). 부분 문자열(substring) 검색의 후보를 좁히는 데 사용합니다.
+
+    compact 이면 posting 을 set 대신 정렬된 array('q') 에 담습니다. 레코드당 메모리는 크게 줄지만
+    posting 끼리의 교집합이 느려지므로 대량 카탈로그에서만 켭니다. (COMPACT_STORAGE=1)
+    """
+
+    def __init__(self, key: KeyFunc, n: int = 3, compact: bool = COMPACT_STORAGE):
+        self.key = key
+        self.n = n
+        self.compact = compact
+        self._postings: Dict[str, Union[Set[int], MutableSequence[int]]] = {}
+
+    def grams(self, text: str) -> Set[str]:
+        return {text[i:i + self.n] for i in range(len(text) - self.n + 1)}
+
+    def add(self, record_id: int, record: Any) -> None:
+        for gram in self.grams(self.key(record)):
+            posting = self._postings.get(gram)
+            if posting is None:
+                self._postings[gram] = array("q", (record_id,)) if self.compact else {record_id}
+            elif not self.compact:
+                posting.add(record_id)
+            elif record_id > posting[-1]:
+                posting.append(record_id)
+            else:
+                insort(posting, record_id)
+
+    def remove(self, record_id: int, record: Any) -> None:
+        for gram in self.grams(self.key(record)):
+            posting = self._postings.get(gram)
+            if posting is None:
+                continue
+            if self.compact:
+                pos = bisect_left(posting, record_id)
+                if pos < len(posting) and posting[pos] == record_id:
+                    del posting[pos]
+            else:
+                posting.discard(record_id)
+            if not posting:
+                del self._postings[gram]
+
+    def postings(self, query: str) -> Optional[List[Union[Set[int], MutableSequence[int]]]]:
+        """query 의 모든 n-gram 에 대한 posting list. query 가 n 보다 짧으면 None."""
+        if len(query) < self.n:
+            return None
+        empty = array("q") if self.compact else set()
+        return [self._postings.get(gram, empty) for gram in self.grams(query)]
+
+    def clear(self) -> None:
+        self._postings.clear()
+
+
+class Histogram:
+    """그룹 -> {값: 개수} 집계. 통계용이며, 레코드가 바뀔 때마다 해당 칸의 개수만 더하고 뺍니다.
+
+    version 은 내용이 바뀔 때마다 증가하므로 계산해 둔 통계의 캐시 키로 쓸 수 있습니다.
+    """
+
+    def __init__(self, group: KeyFunc, value: KeyFunc):
+        self.group = group
+        self.value = value
+        self.version = 0
+        self._groups: Dict[Hashable, Dict[Any, int]] = {}
+
+    def add(self, record_id: int, record: Any) -> None:
+        counts = self._groups.setdefault(self.group(record), {})
+        value = self.value(record)
+        counts[value] = counts.get(value, 0) + 1
+        self.version += 1
+
+    def remove(self, record_id: int, record: Any) -> None:
+        group = self.group(record)
+        counts = self._groups.get(group)
+        value = self.value(record)
+        if counts is None or value not in counts:
+            return
+        counts[value] -= 1
+        if not counts[value]:
+            del counts[value]
+            if not counts:
+                del self._groups[group]
+        self.version += 1
+
+    def groups(self) -> Dict[Hashable, Dict[Any, int]]:
+        return self._groups
+
+    def clear(self) -> None:
+        self._groups.clear()
+        self.version += 1
+
+
+class IndexSet(dict):
+    """모델이 선언한 인덱스들을 한 번에 갱신하기 위한 묶음입니다."""
+
+    def add(self, record_id: int, record: Any) -> None:
+        """모든 인덱스에 넣거나, 하나라도 실패하면(예: array('q') 범위를 넘는 값) 먼저 넣은 것을 되돌리고 다시 발생시킵니다."""
+        added = []
+        try:
+            for index in self.values():
+                index.add(record_id, record)
+                added.append(index)
+        except Exception:
+            for index in reversed(added):
+                index.remove(record_id, record)
+            raise
+
+    def remove(self, record_id: int, record: Any) -> None:
+        for index in self.values():
+            index.remove(record_id, record)
+
+    def clear(self) -> None:
+        for index in self.values():
+            index.clear()
+
+
+# --- 검색 조건(Predicate) ---
+# estimate(): 후보 개수 추정치 (작을수록 선택도가 높음)
+# ids(): 후보 id 집합
+# contains(): 이미 뽑힌 후보가 조건을 만족하는지 확인
+# has_set: ids()가 이미 만들어진 집합을 그대로 돌려주는지 (교집합으로 바로 걸러낼 수 있음)
+# exact: ids()가 정확한 결과인지 (False 면 후보를 contains()로 다시 확인해야 함)
+
+
+class Predicate:
+    has_set = False
+    exact = True
+
+    def estimate(self) -> float:
+        raise NotImplementedError
+
+    def ids(self) -> Set[int]:
+        raise NotImplementedError
+
+    def contains(self, record_id: int, record: Any) -> bool:
+        raise NotImplementedError
+
+
+class IdIn(Predicate):
+    """이미 알고 있는 id 집합 (예: username 유니크 인덱스 결과)."""
+
+    has_set = True
+
+    def __init__(self, ids: Set[int]):
+        self._ids = ids
+
+    def estimate(self) -> float:
+        return len(self._ids)
+
+    def ids(self) -> Set[int]:
+        return self._ids
+
+    def contains(self, record_id: int, record: Any) -> bool:
+        return record_id in self._ids
+
+
+class Eq(Predicate):
+    has_set = True
+
+    def __init__(self, index: HashIndex, value: Hashable):
+        self._bucket = index.get(value)
+
+    def estimate(self) -> float:
+        return len(self._bucket)
+
+    def ids(self) -> Set[int]:
+        return self._bucket
+
+    def contains(self, record_id: int, record: Any) -> bool:
+        return record_id in self._bucket
+
+
+class AnyKey(Predicate):
+    """키가 test 를 만족하는 모든 버킷의 합집합. 카디널리티가 낮은 컬럼(장르 등)에 사용합니다."""
+
+    def __init__(self, index: HashIndex, test: Callable[[Any], bool]):
+        self._index = index
+        self._buckets = [bucket for value, bucket in index.items() if test(value)]
+        self._test = test
+
+    def estimate(self) -> float:
+        return sum(len(bucket) for bucket in self._buckets)
+
+    def ids(self) -> Set[int]:
+        return set().union(*self._buckets)
+
+    def contains(self, record_id: int, record: Any) -> bool:
+        return self._test(self._index.key(record))
+
+
+class Between(Predicate):
+    def __init__(self, index: SortedIndex, low: Any = None, high: Any = None):
+        self._index = index
+        self._low = low
+        self._high = high
+        start, end = index.bounds(low, high)
+        self._size = end - start
+
+    def estimate(self) -> float:
+        return self._size
+
+    def ids(self) -> Set[int]:
+        return self._index.ids(self._low, self._high)
+
+    def contains(self, record_id: int, record: Any) -> bool:
+        value = self._index.key(record)
+        if self._low is not None and value < self._low:
+            return False
+        if self._high is not None and value > self._high:
+            return False
+        return True
+
+
+class Substring(Predicate):
+    """n-gram posting list 교집합으로 후보를 만들고, 살아남은 후보만 실제 문자열로 확인합니다."""
+
+    exact = False
+
+    def __init__(self, index: NGramIndex, query: str):
+        self._index = index
+        self._query = query
+        postings = index.postings(query)
+        self._postings = None if postings is None else sorted(postings, key=len)
+
+    def estimate(self) -> float:
+        if self._postings is None:
+            # n 보다 짧은 검색어는 색인으로 좁힐 수 없어 전체 스캔합니다.
+            return float("inf")
+        return len(self._postings[0])
+
+    def ids(self) -> Set[int]:
+        # 가장 짧은 posting 부터 차례로 좁혀 갑니다.
+        result = self._postings[0]
+        for posting in self._postings[1:]:
+            if not result:
+                break
+            result = result & posting if isinstance(posting, set) else _intersect_sorted(result, posting)
+        return result if isinstance(result, set) else set(result)
+
+    def contains(self, record_id: int, record: Any) -> bool:
+        return self._query in self._index.key(record)
+
+
+class Where(Predicate):
+    """인덱스가 없는 조건. 전체 스캔이 필요하므로 가장 나중에 평가됩니다."""
+
+    exact = False
+
+    def __init__(self, test: Callable[[Any], bool]):
+        self._test = test
+
+    def estimate(self) -> float:
+        return float("inf")
+
+    def ids(self) -> Set[int]:
+        raise NotImplementedError("Where 조건은 후보를 만들 수 없습니다.")
+
+    def contains(self, record_id: int, record: Any) -> bool:
+        return self._test(record)
+
+
+def _intersect_sorted(small: Iterable[int], large: Sequence[int]) -> Set[int]:
+    """id 모음과 정렬된 id 배열(compact posting)의 교집합. large 가 훨씬 길면 small 의 원소만 이진 탐색으로 확인합니다."""
+    small = small if isinstance(small, set) else set(small)
+    if len(small) * 16 < len(large):
+        result = set()
+        for record_id in small:
+            pos = bisect_left(large, record_id)
+            if pos < len(large) and large[pos] == record_id:
+                result.add(record_id)
+        return result
+    return small.intersection(large)
+
+
+# 후보가 전체의 1/SCAN_FACTOR 이상이면 순차 스캔으로 전환합니다.
+SCAN_FACTOR = 8
+
+
+def execute(db: Dict[int, Any], predicates: List[Predicate], after_id: int = 0,
+            limit: Optional[int] = None, order: Optional[SortedIndex] = None) -> List[Any]:
+    """가장 선택도가 높은 조건으로 후보를 만들고 나머지 조건으로 걸러냅니다.
+
+    집합을 가진 조건은 id 집합 교집합으로, 나머지는 레코드 단위로 확인합니다.
+    결과는 항상 id 오름차순(= 삽입 순서)이며, after_id 보다 큰 id 만 최대 limit 개 반환합니다.
+    order(id 순 SortedIndex)를 주면 순차 스캔을 처음부터가 아니라 after_id 다음부터 시작합니다.
+    """
+    if not predicates:
+        return _scan(db, None, [], after_id, limit, order)
+
+    ordered = sorted(predicates, key=lambda predicate: predicate.estimate())
+    driver = ordered[0]
+
+    if driver.estimate() >= len(db):
+        # 후보가 전체와 같다면 정렬 없이 순서대로 스캔하는 편이 빠릅니다.
+        return _scan(db, None, ordered, after_id, limit, order)
+
+    ids = driver.ids()
+    rest = [] if driver.exact else [driver]
+    for predicate in ordered[1:]:
+        if predicate.has_set:
+            ids = ids & predicate.ids()
+        else:
+            rest.append(predicate)
+
+    if len(ids) * SCAN_FACTOR >= len(db):
+        # 후보가 많으면 정렬 + 임의 접근보다 순서대로 훑는 편이 빠릅니다.
+        return _scan(db, ids, rest, after_id, limit, order)
+
+    # 페이지에 필요한 만큼만 작은 id 부터 꺼냅니다. (후보 전체 정렬 O(n log n) 대신 heapify O(n) + 꺼낸 수 × log n)
+    candidates = [record_id for record_id in ids if record_id > after_id]
+    if limit is None:
+        candidates.sort()
+        pending: Iterable[int] = candidates
+    else:
+        heapify(candidates)
+        pending = (heappop(candidates) for _ in range(len(candidates)))
+    results = []
+    for record_id in pending:
+        record = db.get(record_id)
+        if record is not None and _matches(rest, record_id, record):
+            results.append(record)
+            if len(results) == limit:
+                break
+    return results
+
+
+def _scan(db: Dict[int, Any], ids: Optional[Set[int]], predicates: List[Predicate], after_id: int,
+          limit: Optional[int], order: Optional[SortedIndex] = None) -> List[Any]:
+    results = []
+    if order is None:
+        records: Iterable[Tuple[int, Any]] = ((record_id, record) for record_id, record in db.items()
+                                               if record_id > after_id)
+    else:
+        # id 순 인덱스에서 after_id 다음 위치를 이진 탐색으로 찾아 그 뒤만 훑습니다. (keyset seek)
+        records = ((record_id, db.get(record_id)) for record_id in order.iter_after(after_id))
+    for record_id, record in records:
+        if record is None or (ids is not None and record_id not in ids):
+            continue
+        if _matches(predicates, record_id, record):
+            results.append(record)
+            if len(results) == limit:
+                break
+    return results
+
+
+def _matches(predicates: List[Predicate], record_id: int, record: Any) -> bool:
+    for predicate in predicates:
+        if not predicate.contains(record_id, record):
+            return False
+    return True
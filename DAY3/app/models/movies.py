@@ -1,53 +1,260 @@
+import sys
+
+from app.models.indexes import (HashIndex, SortedIndex, NGramIndex, Histogram, IndexSet, AnyKey, Between, Substring,
+                                execute)
+from app.models.concurrency import IdAllocator, RWLock, VersionConflict
+from app.models.storage import MemoryStorage
+
 _db = {}
-_id_counter = 0
+_ids = IdAllocator()
+# 검색/조회는 읽기 잠금, create / update / delete 는 쓰기 잠금을 잡습니다.
+_lock = RWLock()
+# 보조 인덱스 (create / update / delete 시 함께 갱신됩니다)
+_indexes = IndexSet(
+    title=NGramIndex(lambda movie: movie.title.lower()),
+    genre=HashIndex(lambda movie: movie.genre.lower()),
+    playtime_range=SortedIndex(lambda movie: movie.playtime, typecode="q"),
+    # 장르별 상영 시간 분포 (/movies/stats)
+    playtime_stats=Histogram(lambda movie: movie.genre.lower(), lambda movie: movie.playtime),
+)
+# id 정렬 순서 (keyset 페이지네이션용)
+_order = SortedIndex(lambda movie: movie.id, typecode="q")
+# 영속화 백엔드 (기본값은 메모리 전용)
+_storage = MemoryStorage()
+# 컬렉션 버전: 변경될 때마다 1씩 증가합니다. (목록 ETag 용, 초기화해도 되돌리지 않습니다)
+_version = 0
+# 변경 알림을 받을 함수 (event, movie). event 는 "create" / "update" / "delete" 입니다.
+_listeners = []
 
 
 class MovieModel:
-    def __init__(self, id: int, title: str, playtime: int, genre: str):
+    # 인스턴스마다 __dict__ 를 만들지 않도록 속성을 고정합니다. (레코드당 메모리 절약)
+    __slots__ = ("id", "title", "playtime", "genre", "version")
+
+    def __init__(self, id: int, title: str, playtime: int, genre: str, version: int = 1):
         self.id = id
         self.title = title
         self.playtime = playtime
-        self.genre = genre
+        # 장르는 종류가 적으므로 같은 문자열 객체를 공유합니다.
+        self.genre = sys.intern(genre)
+        # 수정될 때마다 1씩 증가합니다. (낙관적 갱신용)
+        self.version = version
+
+    @classmethod
+    def add_listener(cls, listener) -> None:
+        _listeners.append(listener)
+
+    @classmethod
+    def _notify(cls, event: str, movie) -> None:
+        for listener in _listeners:
+            listener(event, movie)
 
     @classmethod
     def create(cls, title: str, playtime: int, genre: str):
-        global _id_counter
-        _id_counter += 1
-        new_movie = cls(id=_id_counter, title=title, playtime=playtime, genre=genre)
+        with _lock.write():
+            new_movie = cls._insert(title, playtime, genre)
+        cls._notify("create", new_movie)
+        return new_movie
+
+    @classmethod
+    def create_many(cls, movies: list[dict]):
+        with _lock.write():
+            new_movies = [cls._insert(movie["title"], movie["playtime"], movie["genre"]) for movie in movies]
+        for movie in new_movies:
+            cls._notify("create", movie)
+        return new_movies
+
+    @classmethod
+    def _insert(cls, title: str, playtime: int, genre: str):
+        # 쓰기 잠금 안에서만 호출합니다.
+        new_movie = cls(id=_ids.allocate(), title=title, playtime=playtime, genre=genre)
+        # 인덱스에 넣지 못하면 _db 에도 넣지 않습니다.
+        _indexes.add(new_movie.id, new_movie)
+        try:
+            _order.add(new_movie.id, new_movie)
+        except Exception:
+            _indexes.remove(new_movie.id, new_movie)
+            raise
         _db[new_movie.id] = new_movie
+        _persist("create", new_movie)
         return new_movie
 
     @classmethod
-    def all(cls):
-        return list(_db.values())
+    def use_storage(cls, storage) -> None:
+        """저장소 백엔드를 바꾸고, 저장돼 있던 영화를 복구합니다."""
+        global _storage
+        records, max_id = storage.recover()
+        with _lock.write():
+            _storage = storage
+            _reset_locked()
+            for record in records.values():
+                movie = cls(**record)
+                _db[movie.id] = movie
+                _indexes.add(movie.id, movie)
+                _order.add(movie.id, movie)
+            _ids.reset(max_id + 1)
 
     @classmethod
-    def search(cls, title: str | None = None, genre: str | None = None):
-        results = []
-        for movie in _db.values():
-            match = True
-            if title is not None and title.lower() not in movie.title.lower():
-                match = False
-            if genre is not None and genre.lower() not in movie.genre.lower():
-                match = False
+    def close_storage(cls) -> None:
+        _storage.close()
 
-            if match:
-                results.append(movie)
+    @classmethod
+    def snapshot(cls) -> None:
+        with _lock.read():
+            _snapshot_locked()
 
-        return results
+    def to_record(self) -> dict:
+        return {"id": self.id, "title": self.title, "playtime": self.playtime, "genre": self.genre,
+                "version": self.version}
+
+    @classmethod
+    def all(cls):
+        with _lock.read():
+            return list(_db.values())
+
+    @classmethod
+    def page(cls, after_id: int = 0, limit: int | None = None):
+        with _lock.read():
+            return _page_locked(after_id, limit)
+
+    @classmethod
+    def search(cls, title: str | None = None, genre: str | None = None,
+               min_playtime: int | None = None, max_playtime: int | None = None,
+               after_id: int = 0, limit: int | None = None):
+        with _lock.read():
+            predicates = []
+            if title is not None:
+                predicates.append(Substring(_indexes["title"], title.lower()))
+            if genre is not None:
+                # 장르는 종류가 적으므로 전체 영화 대신 장르 키만 훑어봅니다.
+                genre = genre.lower()
+                predicates.append(AnyKey(_indexes["genre"], lambda value: genre in value))
+            if min_playtime is not None or max_playtime is not None:
+                predicates.append(Between(_indexes["playtime_range"], min_playtime, max_playtime))
+            if not predicates:
+                return _page_locked(after_id, limit)
+            return execute(_db, predicates, after_id, limit, _order)
 
     @classmethod
     def get_by_id(cls, movie_id: int):
         return _db.get(movie_id)
 
-    def update(self, title: str, playtime: int, genre: str):
+    @classmethod
+    def get_many(cls, movie_ids):
+        """찾은 영화만 {id: 영화} 로 반환합니다. 한 번의 읽기 락 안에서 조회합니다."""
+        with _lock.read():
+            return {movie_id: _db[movie_id] for movie_id in movie_ids if movie_id in _db}
+
+    @classmethod
+    def collection_version(cls) -> int:
+        return _version
+
+    @classmethod
+    def playtime_histogram(cls) -> Histogram:
+        """장르(소문자) -> {상영 시간: 영화 수}. create / update / delete 때마다 갱신됩니다."""
+        return _indexes["playtime_stats"]
+
+    def update(self, title: str, playtime: int, genre: str, expected_version: int | None = None):
+        """expected_version 을 주면 현재 버전과 같을 때만 고치고, 다르면 VersionConflict 를 발생시킵니다."""
+        with _lock.write():
+            if expected_version is not None and expected_version != self.version:
+                raise VersionConflict(self.version)
+            indexed = _db.get(self.id) is self
+            self._set_locked(title, playtime, genre, indexed)
+        if indexed:
+            self._notify("update", self)
+
+    @classmethod
+    def update_many(cls, updates: list[dict]):
+        """여러 영화를 쓰기 잠금 한 번으로 고칩니다. 각 항목은 id, title, playtime, genre 와 (선택) version 입니다.
+
+        항목 순서대로 고친 영화를 반환하고, 없는 영화는 None, 버전이 다르면 VersionConflict 를 그 자리에 담습니다.
+        """
+        results = []
+        with _lock.write():
+            for update in updates:
+                movie = _db.get(update["id"])
+                expected_version = update.get("version")
+                if movie is None:
+                    results.append(None)
+                elif expected_version is not None and expected_version != movie.version:
+                    results.append(VersionConflict(movie.version))
+                else:
+                    movie._set_locked(update["title"], update["playtime"], update["genre"], True)
+                    results.append(movie)
+        for result in results:
+            if isinstance(result, MovieModel):
+                cls._notify("update", result)
+        return results
+
+    def _set_locked(self, title: str, playtime: int, genre: str, indexed: bool):
+        # 쓰기 잠금 안에서만 호출합니다.
+        if indexed:
+            _indexes.remove(self.id, self)
         self.title = title
         self.playtime = playtime
-        self.genre = genre
+        self.genre = sys.intern(genre)
+        self.version += 1
+        if indexed:
+            _indexes.add(self.id, self)
+            _persist("update", self)
 
     @classmethod
     def delete(cls, movie_id: int):
-        if movie_id in _db:
-            del _db[movie_id]
-            return True
-        return False
\ No newline at end of file
+        with _lock.write():
+            movie = _remove_locked(movie_id)
+        if movie is None:
+            return False
+        cls._notify("delete", movie)
+        return True
+
+    @classmethod
+    def delete_many(cls, movie_ids: list[int]):
+        """여러 영화를 쓰기 잠금 한 번으로 지웁니다. id 마다 지웠는지(True) 없었는지(False) 를 반환합니다."""
+        with _lock.write():
+            movies = [_remove_locked(movie_id) for movie_id in movie_ids]
+        for movie in movies:
+            if movie is not None:
+                cls._notify("delete", movie)
+        return [movie is not None for movie in movies]
+
+
+def _remove_locked(movie_id: int):
+    # 쓰기 잠금 안에서만 호출합니다.
+    movie = _db.pop(movie_id, None)
+    if movie is not None:
+        _indexes.remove(movie_id, movie)
+        _order.remove(movie_id, movie)
+        _persist("delete", movie)
+    return movie
+
+
+def _persist(op: str, movie: MovieModel):
+    # 쓰기 잠금 안에서만 호출합니다. (로그 순서 = 변경 순서)
+    global _version
+    _version += 1
+    _storage.append(op, movie.id, None if op == "delete" else movie.to_record())
+    if _storage.needs_snapshot():
+        _snapshot_locked()
+
+
+def _page_locked(after_id: int, limit: int | None):
+    return [_db[movie_id] for movie_id in _order.ids_after(after_id, limit)]
+
+
+def _snapshot_locked():
+    _storage.snapshot([movie.to_record() for movie in _db.values()])
+
+
+def _reset():
+    with _lock.write():
+        _reset_locked()
+
+
+def _reset_locked():
+    global _version
+    _version += 1
+    _db.clear()
+    _indexes.clear()
+    _order.clear()
+    _ids.reset()
@@ -0,0 +1,214 @@
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# 레코드는 JSON 으로 저장할 수 있는 dict 입니다. (각 모델이 변환을 담당)
+Record = Dict
+
+
+class MemoryStorage:
+    """아무것도 저장하지 않는 기본 백엔드. 재시작하면 데이터가 사라집니다."""
+
+    def append(self, op: str, record_id: int, record: Optional[Record] = None) -> None:
+        pass
+
+    def recover(self) -> Tuple[Dict[int, Record], int]:
+        return {}, 0
+
+    def needs_snapshot(self) -> bool:
+        return False
+
+    def snapshot(self, records: List[Record]) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class LogStorage:
+    """append-only 로그(WAL) + 주기적 스냅샷 백엔드.
+
+    - append() 는 버퍼에만 쓰고, 백그라운드 스레드가 flush_interval 마다 모아서 한 번에 fsync 합니다. (group commit)
+      따라서 비정상 종료 시 마지막 flush_interval 동안의 기록은 잃을 수 있습니다.
+      flush_interval 이 0 이면 append() 마다 바로 fsync 합니다.
+    - snapshot() 은 전체 레코드를 새 파일에 쓰고 원자적으로 교체한 뒤, 로그에서 스냅샷 이전(seq 이하) 기록을 지웁니다.
+      파일 쓰기와 fsync 는 백그라운드 스레드가 하므로, 호출한 쪽(모델 잠금)은 레코드를 복사하는 동안만 기다립니다.
+    - recover() 는 마지막 스냅샷을 읽고 그 이후의 로그만 다시 적용합니다.
+    """
+
+    SNAPSHOT_FILE = "snapshot.json"
+    LOG_FILE = "wal.log"
+
+    def __init__(self, directory: str, flush_interval: float = 0.01, snapshot_every: int = 100_000):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.snapshot_every = snapshot_every
+        os.makedirs(directory, exist_ok=True)
+        self._snapshot_path = os.path.join(directory, self.SNAPSHOT_FILE)
+        self._log_path = os.path.join(directory, self.LOG_FILE)
+
+        self._seq = 0
+        self._max_id = 0
+        self._since_snapshot = 0
+        self._buffer = []
+        self._buffer_lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._log = self._open_log()
+        # 백그라운드 스레드가 쓸 스냅샷: (seq, max_id, 레코드)
+        self._pending_snapshot: Optional[Tuple[int, int, List[Record]]] = None
+        self._snapshot_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._wakeup = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if flush_interval > 0:
+            self._flusher = threading.Thread(target=self._flush_loop, name="wal-flusher", daemon=True)
+            self._flusher.start()
+
+    def _open_log(self):
+        # 파일은 close() 가 닫습니다. (with 로 감쌀 수 없는 수명)
+        return open(self._log_path, "a", encoding="utf-8")  # noqa: SIM115
+
+    # --- 쓰기 ---
+    def append(self, op: str, record_id: int, record: Optional[Record] = None) -> None:
+        with self._buffer_lock:
+            self._seq += 1
+            self._max_id = max(self._max_id, record_id)
+            line = json.dumps({"seq": self._seq, "op": op, "id": record_id, "data": record}, default=str)
+            self._buffer.append(line + "\n")
+            self._since_snapshot += 1
+        if self._flusher is None:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._io_lock:
+            with self._buffer_lock:
+                batch, self._buffer = self._buffer, []
+            if not batch:
+                return
+            self._log.write("".join(batch))
+            self._log.flush()
+            os.fsync(self._log.fileno())
+
+    def _flush_loop(self) -> None:
+        while not self._closed.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+            self._write_pending_snapshot()
+
+    def needs_snapshot(self) -> bool:
+        return self._since_snapshot >= self.snapshot_every
+
+    def snapshot(self, records: List[Record]) -> None:
+        """현재 상태 전체를 스냅샷으로 남기고 로그를 비웁니다.
+
+        records 는 append() 와 같은 잠금 안에서 복사한 현재 상태여야 합니다. 여기서는 seq 만 정하고,
+        파일은 백그라운드 스레드가 씁니다. (flush_interval 이 0 이면 바로 씁니다)
+        """
+        with self._buffer_lock:
+            # 이 seq 까지의 기록은 records 에 반영되어 있습니다. 이후 append() 는 seq 가 더 큽니다.
+            self._pending_snapshot = (self._seq, self._max_id, records)
+            self._since_snapshot = 0
+        if self._flusher is None:
+            self._write_pending_snapshot()
+        else:
+            self._wakeup.set()
+
+    def _write_pending_snapshot(self) -> None:
+        with self._snapshot_lock:
+            with self._buffer_lock:
+                pending, self._pending_snapshot = self._pending_snapshot, None
+            if pending is None:
+                return
+            seq, max_id, records = pending
+            tmp_path = self._snapshot_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                # 삭제된 레코드의 id 도 재사용하지 않도록 max_id 를 함께 남깁니다.
+                file.write(json.dumps({"seq": seq, "max_id": max_id}) + "\n")
+                for record in records:
+                    file.write(json.dumps(record, default=str) + "\n")
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, self._snapshot_path)
+            # 스냅샷이 안전하게 교체된 뒤에 로그를 줄입니다. (중간에 죽어도 recover() 가 seq 로 중복 적용을 막습니다)
+            self._truncate_log(seq)
+
+    def _truncate_log(self, seq: int) -> None:
+        """로그에서 seq 이후 기록만 남깁니다. 스냅샷을 쓰는 동안 들어온 기록은 그대로 이어집니다."""
+        with self._io_lock:
+            with self._buffer_lock:
+                batch, self._buffer = self._buffer, []
+            self._log.flush()
+            with open(self._log_path, encoding="utf-8") as file:
+                kept = [line for line in file if line.endswith("\n") and _line_seq(line) > seq]
+            kept.extend(line for line in batch if _line_seq(line) > seq)
+            tmp_path = self._log_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                file.write("".join(kept))
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, self._log_path)
+            self._log.close()
+            self._log = self._open_log()
+
+    # --- 복구 ---
+    def recover(self) -> Tuple[Dict[int, Record], int]:
+        """(id -> 레코드, 지금까지 사용된 가장 큰 id) 를 반환합니다."""
+        records: Dict[int, Record] = {}
+        snapshot_seq = 0
+        max_id = 0
+        if os.path.exists(self._snapshot_path):
+            with open(self._snapshot_path, encoding="utf-8") as file:
+                header = json.loads(file.readline())
+                snapshot_seq, max_id = header["seq"], header["max_id"]
+                for line in file:
+                    record = json.loads(line)
+                    records[record["id"]] = record
+                    max_id = max(max_id, record["id"])
+
+        seq = snapshot_seq
+        valid_size = 0
+        with open(self._log_path, "rb") as file:
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break  # 마지막 줄이 쓰다 만 상태일 수 있습니다.
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                valid_size += len(line)
+                if entry["seq"] <= snapshot_seq:
+                    continue
+                seq = entry["seq"]
+                max_id = max(max_id, entry["id"])
+                if entry["op"] == "delete":
+                    records.pop(entry["id"], None)
+                else:
+                    records[entry["id"]] = entry["data"]
+
+        if valid_size < os.path.getsize(self._log_path):
+            # 쓰다 만 꼬리를 잘라내야 이후 기록이 그 뒤에 이어 붙지 않습니다.
+            with self._io_lock:
+                self._log.truncate(valid_size)
+                os.fsync(self._log.fileno())
+
+        with self._buffer_lock:
+            self._seq = seq
+            self._max_id = max_id
+            self._since_snapshot = seq - snapshot_seq
+        return records, max_id
+
+    def close(self) -> None:
+        self._closed.set()
+        self._wakeup.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self._write_pending_snapshot()
+        self.flush()
+        self._log.close()
+
+
+def _line_seq(line: str) -> int:
+    # append() 가 쓰는 줄은 항상 '{"seq": N, ...' 로 시작합니다.
+    return int(line[8:line.index(",")])
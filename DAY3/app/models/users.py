@@ -1,103 +1,468 @@
 import json
-from passlib.context import CryptContext
-from typing import Optional, Dict, List
+import sys
+from typing import Callable, Container, Optional, Dict, Iterable, List
 from app.schemas.users import UserCreate, UserUpdate
 from datetime import datetime, timezone
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.models.indexes import HashIndex, SortedIndex, Histogram, IndexSet, IdIn, Eq, Between, execute
+from app.models.concurrency import IdAllocator, RWLock, VersionConflict
+from app.models.storage import MemoryStorage
+from app.utils.passwords import DUMMY_HASH, hash_password, password_service, verify_password
 
 
 class UserModel:
-    _db: List[Dict] = []
-    _id_counter: int = 1
+    # id -> user dict (dict는 삽입 순서를 유지하므로 all()의 순서가 보장됩니다)
+    _db: Dict[int, Dict] = {}
+    # username -> id (유니크 인덱스)
+    _username_index: Dict[str, int] = {}
+    # 보조 인덱스 (create / update / delete 시 함께 갱신됩니다)
+    _indexes = IndexSet(
+        gender=HashIndex(lambda user: user["gender"]),
+        age=HashIndex(lambda user: user["age"]),
+        age_range=SortedIndex(lambda user: user["age"], typecode="q"),
+        # 성별별 나이 분포 (/users/stats)
+        age_stats=Histogram(lambda user: user["gender"], lambda user: user["age"]),
+    )
+    # id 정렬 순서 (keyset 페이지네이션용)
+    _order = SortedIndex(lambda user: user["id"], typecode="q")
+    _ids = IdAllocator()
+    # 검색/조회는 읽기 잠금, 변경은 쓰기 잠금을 잡습니다. 변경 알림은 잠금을 푼 뒤에 보냅니다.
+    _lock = RWLock()
+    # 변경 알림을 받을 함수 목록: listener(event, user), event 는 "create" / "update" / "delete" / "login"
+    _listeners: List[Callable[[str, Dict], None]] = []
+    # 영속화 백엔드 (기본값은 메모리 전용)
+    _storage = MemoryStorage()
+    # 컬렉션 버전: 변경될 때마다 1씩 증가합니다. (목록 ETag 용, 초기화해도 되돌리지 않습니다)
+    _version = 0
+
+    @classmethod
+    def add_listener(cls, listener: Callable[[str, Dict], None]) -> None:
+        cls._listeners.append(listener)
+
+    @classmethod
+    def _notify(cls, event: str, user: Dict) -> None:
+        for listener in cls._listeners:
+            listener(event, user)
+
+    # --- 영속화 ---
+    @classmethod
+    def use_storage(cls, storage) -> None:
+        """저장소 백엔드를 바꾸고, 저장돼 있던 유저를 복구합니다."""
+        records, max_id = storage.recover()
+        with cls._lock.write():
+            cls._storage = storage
+            cls._reset_locked()
+            for record in records.values():
+                user = cls._from_record(record)
+                cls._db[user["id"]] = user
+                cls._username_index[user["username"]] = user["id"]
+                cls._indexes.add(user["id"], user)
+                cls._order.add(user["id"], user)
+            cls._ids.reset(max_id + 1)
+
+    @classmethod
+    def close_storage(cls) -> None:
+        cls._storage.close()
+
+    @classmethod
+    def snapshot(cls) -> None:
+        with cls._lock.read():
+            cls._snapshot_locked()
+
+    @classmethod
+    def _snapshot_locked(cls) -> None:
+        cls._storage.snapshot([cls._to_record(user) for user in cls._db.values()])
+
+    @classmethod
+    def _persist(cls, op: str, user: Dict) -> None:
+        # 쓰기 잠금 안에서만 호출합니다.
+        cls._version += 1
+        cls._storage.append(op, user["id"], None if op == "delete" else cls._to_record(user))
+        if cls._storage.needs_snapshot():
+            cls._snapshot_locked()
+
+    @staticmethod
+    def _to_record(user: Dict) -> Dict:
+        last_login = user["last_login"]
+        return {**user, "last_login": last_login.isoformat() if last_login else None}
+
+    @staticmethod
+    def _from_record(record: Dict) -> Dict:
+        last_login = record["last_login"]
+        return {"version": 1, **record, "gender": sys.intern(record["gender"]),
+                "last_login": datetime.fromisoformat(last_login) if last_login else None}
+
+    @classmethod
+    def _reset(cls) -> None:
+        with cls._lock.write():
+            cls._reset_locked()
+
+    @classmethod
+    def _reset_locked(cls) -> None:
+        cls._version += 1
+        cls._db.clear()
+        cls._username_index.clear()
+        cls._indexes.clear()
+        cls._order.clear()
+        cls._ids.reset()
 
     @classmethod
     def get_hashed_password(cls, password: str) -> str:
-        return pwd_context.hash(password)
+        return hash_password(password)
 
     @classmethod
     def verify_password(cls, plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
+        return verify_password(plain_password, hashed_password)
 
     @classmethod
     def create(cls, username: str, password: str, age: int, gender: str) -> Optional[Dict]:
-        if any(user.get("username") == username for user in cls._db):
+        if username in cls._username_index:
             return None  # 이미 존재하는 유저명
 
         # 비밀번호 해시
         # Hash the password.
         hashed_password = cls.get_hashed_password(password)
+        return cls._insert(username, hashed_password, age, gender)
+
+    @classmethod
+    async def create_async(cls, username: str, password: str, age: int, gender: str) -> Optional[Dict]:
+        """create 와 같지만 bcrypt 해싱을 워커 풀에서 실행합니다."""
+        if username in cls._username_index:
+            return None
+        hashed_password = await password_service.hash(password)
+        return cls._insert(username, hashed_password, age, gender)
+
+    @classmethod
+    async def create_many_async(cls, users: List[Dict]) -> List[Optional[Dict]]:
+        """여러 유저를 한 번에 등록합니다. 비밀번호는 워커 풀에서 병렬로 해싱합니다.
+
+        결과는 입력 순서와 같고, username 이 이미 있거나 요청 안에서 중복되면 None 입니다.
+        """
+        accepted = cls.insertable(users, cls._username_index)
+        hashed_passwords = await password_service.hash_many([users[index]["password"] for index in accepted])
+
+        # 해싱이 끝난 뒤에는 await 없이 한 번에 등록합니다.
+        results: List[Optional[Dict]] = [None] * len(users)
+        inserted = cls._insert_many([{**users[index], "hashed_password": hashed_password}
+                                     for index, hashed_password in zip(accepted, hashed_passwords)])
+        for index, user in zip(accepted, inserted):
+            results[index] = user
+        return results
+
+    @staticmethod
+    def insertable(users: List[Dict], existing: Container[str]) -> List[int]:
+        """대량 등록에서 실제로 저장될 항목의 위치. username 이 existing 에 있거나 요청 안에서 앞에 나온 항목은 뺍니다.
+
+        비밀번호는 여기서 고른 항목만 해싱합니다. (버려질 해시에 bcrypt 를 쓰지 않도록)
+        """
+        seen = set()
+        accepted = []
+        for index, user in enumerate(users):
+            if user["username"] not in existing and user["username"] not in seen:
+                seen.add(user["username"])
+                accepted.append(index)
+        return accepted
+
+    @classmethod
+    def existing_usernames(cls, usernames: List[str]) -> List[str]:
+        with cls._lock.read():
+            return [username for username in usernames if username in cls._username_index]
+
+    @classmethod
+    def _insert_many(cls, users: List[Dict]) -> List[Optional[Dict]]:
+        """해싱이 끝난 유저(hashed_password 포함)를 쓰기 잠금 한 번으로 등록합니다."""
+        with cls._lock.write():
+            results = [cls._insert_locked(user["username"], user["hashed_password"], user["age"], user["gender"])
+                       for user in users]
+        for user in results:
+            if user is not None:
+                cls._notify("create", user)
+        return results
+
+    @classmethod
+    def _insert(cls, username: str, hashed_password: str, age: int, gender: str) -> Optional[Dict]:
+        with cls._lock.write():
+            new_user = cls._insert_locked(username, hashed_password, age, gender)
+        if new_user is not None:
+            cls._notify("create", new_user)
+        return new_user
+
+    @classmethod
+    def _insert_locked(cls, username: str, hashed_password: str, age: int, gender: str) -> Optional[Dict]:
+        # 해싱을 기다리는 동안(또는 다른 스레드에서) 같은 username 이 먼저 등록됐을 수 있으므로 잠금 안에서 다시 확인합니다.
+        if username in cls._username_index:
+            return None
 
         new_user = {
-            "id": cls._id_counter,
+            "id": cls._ids.allocate(),
             "username": username,
             "hashed_password": hashed_password,
             "age": age,
-            "gender": gender,
+            "gender": sys.intern(gender),  # 종류가 적은 값은 모든 유저가 같은 문자열을 공유합니다.
             "last_login": None,  # last_login 필드 추가
+            "version": 1,  # 수정될 때마다 1씩 증가합니다. (낙관적 갱신용)
         }
-        cls._db.append(new_user)
-        cls._id_counter += 1
+        # 인덱스에 넣지 못하면 아무 데도 남기지 않습니다. (username 도 다시 쓸 수 있어야 합니다)
+        cls._indexes.add(new_user["id"], new_user)
+        try:
+            cls._order.add(new_user["id"], new_user)
+        except Exception:
+            cls._indexes.remove(new_user["id"], new_user)
+            raise
+        cls._db[new_user["id"]] = new_user
+        cls._username_index[username] = new_user["id"]
+        cls._persist("create", new_user)
         return new_user
 
     @classmethod
     def all(cls) -> List[Dict]:
-        return cls._db
+        with cls._lock.read():
+            return list(cls._db.values())
+
+    @classmethod
+    def page(cls, after_id: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        with cls._lock.read():
+            return cls._page_locked(after_id, limit)
+
+    @classmethod
+    def _page_locked(cls, after_id: int, limit: Optional[int]) -> List[Dict]:
+        return [cls._db[user_id] for user_id in cls._order.ids_after(after_id, limit)]
 
     @classmethod
     def get_by_id(cls, user_id: int) -> Optional[Dict]:
-        return next((user for user in cls._db if user["id"] == user_id), None)
+        return cls._db.get(user_id)
+
+    @classmethod
+    def get_many(cls, user_ids: Iterable[int]) -> Dict[int, Dict]:
+        """찾은 유저만 {id: 유저} 로 반환합니다. 한 번의 읽기 락 안에서 조회합니다."""
+        with cls._lock.read():
+            return {user_id: cls._db[user_id] for user_id in user_ids if user_id in cls._db}
+
+    @classmethod
+    def collection_version(cls) -> int:
+        return cls._version
+
+    @classmethod
+    def age_histogram(cls) -> Histogram:
+        """성별 -> {나이: 유저 수}. create / update / delete 때마다 갱신됩니다."""
+        return cls._indexes["age_stats"]
 
     @classmethod
     def get_by_username(cls, username: str) -> Optional[Dict]:
-        return next((user for user in cls._db if user["username"] == username), None)
+        user_id = cls._username_index.get(username)
+        if user_id is None:
+            return None
+        return cls._db.get(user_id)
 
     @classmethod
-    def update(cls, user_id: int, user_update_data: UserUpdate) -> Optional[Dict]:
-        user = cls.get_by_id(user_id)
-        if user is None:
+    def update(cls, user_id: int, user_update_data: UserUpdate,
+               expected_version: Optional[int] = None) -> Optional[Dict]:
+        """expected_version 을 주면 현재 버전과 같을 때만 고치고, 다르면 VersionConflict 를 발생시킵니다."""
+        if cls._check_version(user_id, expected_version) is None:
             return None
 
         update_data = user_update_data.model_dump(exclude_unset=True)
+        if "password" in update_data:
+            update_data["hashed_password"] = cls.get_hashed_password(update_data.pop("password"))
+        return cls._apply_update(user_id, update_data, expected_version)
+
+    @classmethod
+    async def update_async(cls, user_id: int, user_update_data: UserUpdate,
+                           expected_version: Optional[int] = None) -> Optional[Dict]:
+        """update 와 같지만 비밀번호 변경 시 bcrypt 해싱을 워커 풀에서 실행합니다."""
+        if cls._check_version(user_id, expected_version) is None:
+            return None
+
+        update_data = user_update_data.model_dump(exclude_unset=True)
+        if "password" in update_data:
+            update_data["hashed_password"] = await password_service.hash(update_data.pop("password"))
+        return cls._apply_update(user_id, update_data, expected_version)
+
+    @classmethod
+    def _check_version(cls, user_id: int, expected_version: Optional[int]) -> Optional[Dict]:
+        # 해싱 전에 미리 확인해 헛된 해싱을 피합니다. (최종 확인은 _apply_update 의 잠금 안에서)
+        user = cls.get_by_id(user_id)
+        if user is not None and expected_version is not None and user["version"] != expected_version:
+            raise VersionConflict(user["version"])
+        return user
+
+    @classmethod
+    def _apply_update(cls, user_id: int, update_data: Dict, expected_version: Optional[int] = None) -> Optional[Dict]:
+        with cls._lock.write():
+            user = cls._apply_update_locked(user_id, update_data, expected_version)
+        if user is not None:
+            cls._notify("update", user)
+        return user
+
+    @classmethod
+    def _apply_update_locked(cls, user_id: int, update_data: Dict, expected_version: Optional[int]) -> Optional[Dict]:
+        user = cls._db.get(user_id)  # 해싱 중에 삭제됐을 수 있습니다.
+        if user is None:
+            return None
+        if expected_version is not None and user["version"] != expected_version:
+            raise VersionConflict(user["version"])
+        cls._indexes.remove(user_id, user)
+        if "gender" in update_data:
+            update_data["gender"] = sys.intern(update_data["gender"])
         for key, value in update_data.items():
-            if key == "password":
-                user["hashed_password"] = cls.get_hashed_password(value)
-            elif key == "last_login":
-                user["last_login"] = value
-            else:
-                user[key] = value
+            user[key] = value
+        user["version"] += 1
+        cls._indexes.add(user_id, user)
+        cls._persist("update", user)
         return user
 
+    @classmethod
+    async def update_many_async(cls, updates: List[Dict]) -> List:
+        """여러 유저를 고칩니다. 각 항목은 id, (선택) version 과 고칠 필드입니다. (결과는 apply_updates 와 같습니다)"""
+        return cls.apply_updates(await cls.hash_updates(updates, cls.get_many([update["id"] for update in updates])))
+
+    @staticmethod
+    async def hash_updates(updates: List[Dict], found: Container[int]) -> List[Optional[Dict]]:
+        """대량 수정의 비밀번호를 해싱 풀에서 해싱해 hashed_password 로 바꿉니다.
+
+        found 에 없는 유저의 항목은 해싱하지 않고 None 으로 둡니다. (버려질 해시에 bcrypt 를 쓰지 않도록)
+        """
+        targets = [update["password"] for update in updates if update["id"] in found and "password" in update]
+        hashed_passwords = iter(await password_service.hash_many(targets))
+        prepared: List[Optional[Dict]] = []
+        for update in updates:
+            if update["id"] not in found:
+                prepared.append(None)
+                continue
+            update = dict(update)
+            if "password" in update:
+                del update["password"]
+                update["hashed_password"] = next(hashed_passwords)
+            prepared.append(update)
+        return prepared
+
+    @classmethod
+    def apply_updates(cls, updates: List[Optional[Dict]]) -> List:
+        """해싱이 끝난 변경을 쓰기 잠금 한 번으로 적용합니다.
+
+        항목 순서대로 고친 유저를 반환하고, 없는 유저(None 항목 포함)는 None, 버전이 다르면 VersionConflict 를 그 자리에 담습니다.
+        """
+        results: List = []
+        with cls._lock.write():
+            for update in updates:
+                if update is None:
+                    results.append(None)
+                    continue
+                update_data = dict(update)
+                user_id = update_data.pop("id")
+                expected_version = update_data.pop("version", None)
+                try:
+                    results.append(cls._apply_update_locked(user_id, update_data, expected_version))
+                except VersionConflict as error:
+                    results.append(error)
+        for result in results:
+            if isinstance(result, dict):
+                cls._notify("update", result)
+        return results
+
+    @classmethod
+    def record_login(cls, user: Dict) -> None:
+        """마지막 로그인 시간을 갱신합니다. 인증 정보는 그대로이므로 "update" 대신 "login" 알림을 보냅니다. (유저 캐시만 갱신)"""
+        with cls._lock.write():
+            user["last_login"] = datetime.now(timezone.utc)
+            stored = cls._db.get(user["id"]) is user
+            if stored:
+                user["version"] += 1
+                cls._persist("update", user)
+        if stored:
+            cls._notify("login", user)
+
+    @classmethod
+    def record_logins(cls, logins: Dict[int, datetime]) -> List[Dict]:
+        """여러 유저의 마지막 로그인 시간을 쓰기 잠금 한 번으로 갱신합니다. (last_login 쓰기 버퍼의 flush)
+
+        인증 정보는 그대로이므로 "update" 대신 "login" 알림을 보냅니다. (토큰 캐시는 유지, 유저 캐시만 갱신)
+        """
+        updated = []
+        with cls._lock.write():
+            for user_id, when in logins.items():
+                user = cls._db.get(user_id)
+                if user is None:
+                    continue  # 그 사이 삭제된 유저
+                user["last_login"] = when
+                user["version"] += 1
+                cls._persist("update", user)
+                updated.append(user)
+        for user in updated:
+            cls._notify("login", user)
+        return updated
+
     @classmethod
     def delete(cls, user_id: int) -> bool:
-        user_to_delete = cls.get_by_id(user_id)
+        with cls._lock.write():
+            user_to_delete = cls._delete_locked(user_id)
         if user_to_delete:
-            cls._db.remove(user_to_delete)
+            cls._notify("delete", user_to_delete)
             return True
         return False
 
+    @classmethod
+    def delete_many(cls, user_ids: List[int]) -> List[bool]:
+        """여러 유저를 쓰기 잠금 한 번으로 지웁니다. id 마다 지웠는지(True) 없었는지(False) 를 반환합니다."""
+        with cls._lock.write():
+            deleted = [cls._delete_locked(user_id) for user_id in user_ids]
+        for user in deleted:
+            if user:
+                cls._notify("delete", user)
+        return [user is not None for user in deleted]
+
+    @classmethod
+    def _delete_locked(cls, user_id: int) -> Optional[Dict]:
+        user_to_delete = cls._db.pop(user_id, None)
+        if user_to_delete:
+            del cls._username_index[user_to_delete["username"]]
+            cls._indexes.remove(user_id, user_to_delete)
+            cls._order.remove(user_id, user_to_delete)
+            cls._persist("delete", user_to_delete)
+        return user_to_delete
+
     @classmethod
     def authenticate(cls, username: str, password: str) -> Optional[Dict]:
         user = cls.get_by_username(username)
-        if user and cls.verify_password(password, user["hashed_password"]):
+        if user is None:
+            cls.verify_password(password, DUMMY_HASH)  # 없는 유저도 같은 시간이 걸리게 합니다.
+            return None
+        if cls.verify_password(password, user["hashed_password"]):
+            return user
+        return None
+
+    @classmethod
+    async def authenticate_async(cls, username: str, password: str) -> Optional[Dict]:
+        user = cls.get_by_username(username)
+        if user is None:
+            await password_service.verify_dummy(password)
+            return None
+        if await password_service.verify(password, user["hashed_password"]):
             return user
         return None
 
     @classmethod
     def create_dummy(cls):
+        # 미리 해싱해 둔 fixture 를 넣으므로 bcrypt 를 실행하지 않습니다.
+        from app.models.fixtures import load_fixture
+
         if not cls._db:
-            cls.create(username="john_doe", password="password123", age=30, gender="male")
-            cls.create(username="jane_doe", password="password456", age=25, gender="female")
-
-    @classmethod
-    def search(cls, username: Optional[str] = None, age: Optional[int] = None, gender: Optional[str] = None) -> List[
-        Dict]:
-        results = cls._db
-        if username:
-            results = [user for user in results if user.get("username") == username]
-        if age:
-            results = [user for user in results if user.get("age") == age]
-        if gender:
-            results = [user for user in results if user.get("gender") == gender]
-        return results
+            cls._insert_many(load_fixture()["users"])
 
+    @classmethod
+    def search(cls, username: Optional[str] = None, age: Optional[int] = None, gender: Optional[str] = None,
+               min_age: Optional[int] = None, max_age: Optional[int] = None,
+               after_id: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        with cls._lock.read():
+            predicates = []
+            if username:
+                user_id = cls._username_index.get(username)
+                predicates.append(IdIn(set() if user_id is None else {user_id}))
+            if age:
+                predicates.append(Eq(cls._indexes["age"], age))
+            if gender:
+                predicates.append(Eq(cls._indexes["gender"], gender))
+            if min_age is not None or max_age is not None:
+                predicates.append(Between(cls._indexes["age_range"], min_age, max_age))
+            if not predicates:
+                return cls._page_locked(after_id, limit)
+            return execute(cls._db, predicates, after_id, limit, cls._order)
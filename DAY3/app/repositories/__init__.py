@@ -0,0 +1,21 @@
+from app.repositories.base import MovieRepository, UserRepository
+from app.repositories.memory import MemoryMovieRepository, MemoryUserRepository
+
+# 현재 사용 중인 저장소 (기본값은 메모리). main.py 의 lifespan 에서 바꿀 수 있습니다.
+_user_repository: UserRepository = MemoryUserRepository()
+_movie_repository: MovieRepository = MemoryMovieRepository()
+
+
+def set_repositories(users: UserRepository, movies: MovieRepository) -> None:
+    global _user_repository, _movie_repository
+    _user_repository = users
+    _movie_repository = movies
+
+
+# --- FastAPI 의존성 ---
+def get_user_repository() -> UserRepository:
+    return _user_repository
+
+
+def get_movie_repository() -> MovieRepository:
+    return _movie_repository
@@ -0,0 +1,125 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+from app.models.movies import MovieModel
+from app.schemas.users import UserUpdate
+
+
+class UserRepository:
+    """유저 저장소 인터페이스. 라우터는 이 인터페이스만 await 합니다."""
+
+    async def create(self, username: str, password: str, age: int, gender: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    async def create_many(self, users: List[Dict]) -> List[Optional[Dict]]:
+        """입력 순서대로 결과를 반환합니다. username 이 중복된 항목은 None 입니다."""
+        raise NotImplementedError
+
+    async def get_by_id(self, user_id: int) -> Optional[Dict]:
+        raise NotImplementedError
+
+    async def get_many(self, user_ids: List[int]) -> Dict[int, Dict]:
+        """여러 유저를 한 번에 조회합니다. 찾은 유저만 {id: 유저} 로 반환합니다."""
+        raise NotImplementedError
+
+    async def get_by_username(self, username: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    async def page(self, after_id: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        raise NotImplementedError
+
+    async def search(self, username: Optional[str] = None, age: Optional[int] = None, gender: Optional[str] = None,
+                     min_age: Optional[int] = None, max_age: Optional[int] = None,
+                     after_id: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        raise NotImplementedError
+
+    async def update(self, user_id: int, user_update_data: UserUpdate,
+                     expected_version: Optional[int] = None) -> Optional[Dict]:
+        """expected_version 이 현재 버전과 다르면 VersionConflict 를 발생시킵니다."""
+        raise NotImplementedError
+
+    async def update_many(self, updates: List[Dict]) -> List:
+        """각 항목은 id, (선택) version 과 고칠 필드입니다. 입력 순서대로 고친 유저를 반환합니다.
+
+        없는 유저는 None, version 이 현재 버전과 다르면 VersionConflict 를 그 자리에 담습니다. (예외를 발생시키지 않습니다)
+        """
+        raise NotImplementedError
+
+    async def delete(self, user_id: int) -> bool:
+        raise NotImplementedError
+
+    async def delete_many(self, user_ids: List[int]) -> List[bool]:
+        """입력 순서대로 지웠는지(True) 없었는지(False) 를 반환합니다."""
+        raise NotImplementedError
+
+    async def authenticate(self, username: str, password: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    async def record_login(self, user: Dict) -> None:
+        raise NotImplementedError
+
+    async def record_logins(self, logins: Dict[int, datetime]) -> None:
+        """여러 유저의 last_login 을 한 번에 기록합니다. (last_login 쓰기 버퍼가 모아서 호출)"""
+        raise NotImplementedError
+
+    async def version(self) -> int:
+        """컬렉션 버전. 유저가 생기거나 바뀌거나 삭제될 때마다 커집니다. (목록 ETag 용)"""
+        raise NotImplementedError
+
+    async def stats(self, bin_size: int = 10) -> Dict:
+        """성별 나이 분포. app.utils.stats.age_histogram 의 반환 형식을 따릅니다."""
+        raise NotImplementedError
+
+
+class MovieRepository:
+    """영화 저장소 인터페이스. 반환값은 MovieModel 과 같은 속성(id, title, playtime, genre, version)을 가집니다."""
+
+    async def create(self, title: str, playtime: int, genre: str) -> MovieModel:
+        raise NotImplementedError
+
+    async def create_many(self, movies: List[Dict]) -> List[MovieModel]:
+        raise NotImplementedError
+
+    async def all(self) -> List[MovieModel]:
+        raise NotImplementedError
+
+    async def get_by_id(self, movie_id: int) -> Optional[MovieModel]:
+        raise NotImplementedError
+
+    async def get_many(self, movie_ids: List[int]) -> Dict[int, MovieModel]:
+        """여러 영화를 한 번에 조회합니다. 찾은 영화만 {id: 영화} 로 반환합니다."""
+        raise NotImplementedError
+
+    async def page(self, after_id: int = 0, limit: Optional[int] = None) -> List[MovieModel]:
+        raise NotImplementedError
+
+    async def search(self, title: Optional[str] = None, genre: Optional[str] = None,
+                     min_playtime: Optional[int] = None, max_playtime: Optional[int] = None,
+                     after_id: int = 0, limit: Optional[int] = None) -> List[MovieModel]:
+        raise NotImplementedError
+
+    async def update(self, movie_id: int, title: str, playtime: int, genre: str,
+                     expected_version: Optional[int] = None) -> Optional[MovieModel]:
+        """expected_version 이 현재 버전과 다르면 VersionConflict 를 발생시킵니다."""
+        raise NotImplementedError
+
+    async def update_many(self, updates: List[Dict]) -> List:
+        """각 항목은 id, title, playtime, genre 와 (선택) version 입니다. 입력 순서대로 고친 영화를 반환합니다.
+
+        없는 영화는 None, version 이 현재 버전과 다르면 VersionConflict 를 그 자리에 담습니다. (예외를 발생시키지 않습니다)
+        """
+        raise NotImplementedError
+
+    async def delete(self, movie_id: int) -> bool:
+        raise NotImplementedError
+
+    async def delete_many(self, movie_ids: List[int]) -> List[bool]:
+        """입력 순서대로 지웠는지(True) 없었는지(False) 를 반환합니다."""
+        raise NotImplementedError
+
+    async def version(self) -> int:
+        """컬렉션 버전. 영화가 생기거나 바뀌거나 삭제될 때마다 커집니다. (목록 ETag 용)"""
+        raise NotImplementedError
+
+    async def stats(self) -> Dict:
+        """장르별 상영 시간 통계. app.utils.stats.playtime_stats 의 반환 형식을 따릅니다."""
+        raise NotImplementedError
@@ -0,0 +1,117 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+from app.models.movies import MovieModel
+from app.models.users import UserModel
+from app.repositories.base import MovieRepository, UserRepository
+from app.schemas.users import UserUpdate
+from app.utils.stats import age_histogram, cached, playtime_stats
+
+
+class MemoryUserRepository(UserRepository):
+    """UserModel(프로세스 내 메모리)을 그대로 사용하는 기본 저장소."""
+
+    async def create(self, username: str, password: str, age: int, gender: str) -> Optional[Dict]:
+        return await UserModel.create_async(username=username, password=password, age=age, gender=gender)
+
+    async def create_many(self, users: List[Dict]) -> List[Optional[Dict]]:
+        return await UserModel.create_many_async(users)
+
+    async def get_by_id(self, user_id: int) -> Optional[Dict]:
+        return UserModel.get_by_id(user_id)
+
+    async def get_many(self, user_ids: List[int]) -> Dict[int, Dict]:
+        return UserModel.get_many(user_ids)
+
+    async def get_by_username(self, username: str) -> Optional[Dict]:
+        return UserModel.get_by_username(username)
+
+    async def page(self, after_id: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        return UserModel.page(after_id, limit)
+
+    async def search(self, username: Optional[str] = None, age: Optional[int] = None, gender: Optional[str] = None,
+                     min_age: Optional[int] = None, max_age: Optional[int] = None,
+                     after_id: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        return UserModel.search(username=username, age=age, gender=gender, min_age=min_age, max_age=max_age,
+                                after_id=after_id, limit=limit)
+
+    async def update(self, user_id: int, user_update_data: UserUpdate,
+                     expected_version: Optional[int] = None) -> Optional[Dict]:
+        return await UserModel.update_async(user_id, user_update_data, expected_version)
+
+    async def update_many(self, updates: List[Dict]) -> List:
+        return await UserModel.update_many_async(updates)
+
+    async def delete(self, user_id: int) -> bool:
+        return UserModel.delete(user_id)
+
+    async def delete_many(self, user_ids: List[int]) -> List[bool]:
+        return UserModel.delete_many(user_ids)
+
+    async def authenticate(self, username: str, password: str) -> Optional[Dict]:
+        return await UserModel.authenticate_async(username, password)
+
+    async def record_login(self, user: Dict) -> None:
+        UserModel.record_login(user)
+
+    async def record_logins(self, logins: Dict[int, datetime]) -> None:
+        UserModel.record_logins(logins)
+
+    async def version(self) -> int:
+        return UserModel.collection_version()
+
+    async def stats(self, bin_size: int = 10) -> Dict:
+        # 분포는 변경 때마다 갱신되고, 요약은 분포가 바뀐 뒤 처음 요청될 때만 다시 계산합니다.
+        histogram = UserModel.age_histogram()
+        return cached(("users", bin_size), histogram.version, lambda: age_histogram(histogram.groups(), bin_size))
+
+
+class MemoryMovieRepository(MovieRepository):
+    """MovieModel(프로세스 내 메모리)을 그대로 사용하는 기본 저장소."""
+
+    async def create(self, title: str, playtime: int, genre: str) -> MovieModel:
+        return MovieModel.create(title=title, playtime=playtime, genre=genre)
+
+    async def create_many(self, movies: List[Dict]) -> List[MovieModel]:
+        return MovieModel.create_many(movies)
+
+    async def all(self) -> List[MovieModel]:
+        return MovieModel.all()
+
+    async def get_by_id(self, movie_id: int) -> Optional[MovieModel]:
+        return MovieModel.get_by_id(movie_id)
+
+    async def get_many(self, movie_ids: List[int]) -> Dict[int, MovieModel]:
+        return MovieModel.get_many(movie_ids)
+
+    async def page(self, after_id: int = 0, limit: Optional[int] = None) -> List[MovieModel]:
+        return MovieModel.page(after_id, limit)
+
+    async def search(self, title: Optional[str] = None, genre: Optional[str] = None,
+                     min_playtime: Optional[int] = None, max_playtime: Optional[int] = None,
+                     after_id: int = 0, limit: Optional[int] = None) -> List[MovieModel]:
+        return MovieModel.search(title=title, genre=genre, min_playtime=min_playtime, max_playtime=max_playtime,
+                                 after_id=after_id, limit=limit)
+
+    async def update(self, movie_id: int, title: str, playtime: int, genre: str,
+                     expected_version: Optional[int] = None) -> Optional[MovieModel]:
+        movie = MovieModel.get_by_id(movie_id)
+        if movie is None:
+            return None
+        movie.update(title=title, playtime=playtime, genre=genre, expected_version=expected_version)
+        return movie
+
+    async def update_many(self, updates: List[Dict]) -> List:
+        return MovieModel.update_many(updates)
+
+    async def delete(self, movie_id: int) -> bool:
+        return MovieModel.delete(movie_id)
+
+    async def delete_many(self, movie_ids: List[int]) -> List[bool]:
+        return MovieModel.delete_many(movie_ids)
+
+    async def version(self) -> int:
+        return MovieModel.collection_version()
+
+    async def stats(self) -> Dict:
+        histogram = MovieModel.playtime_histogram()
+        return cached("movies", histogram.version, lambda: playtime_stats(histogram.groups()))
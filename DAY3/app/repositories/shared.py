@@ -0,0 +1,372 @@
+import asyncio
+import os
+import pickle
+import struct
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.models.concurrency import VersionConflict
+from app.models.movies import MovieModel
+from app.models.users import UserModel
+from app.repositories.base import MovieRepository, UserRepository
+from app.repositories.memory import MemoryMovieRepository, MemoryUserRepository
+from app.schemas.users import UserUpdate
+from app.utils.change_feed import Change, change_feeds
+from app.utils.passwords import password_service
+
+# 프레임 = 4바이트 길이 + pickle 본문. 같은 머신의 신뢰된 프로세스끼리만 쓰므로 소켓 권한을 0600 으로 둡니다.
+_HEADER = struct.Struct("!I")
+# 응답 프레임에서 요청 id 가 0 이면 저장소가 보낸 변경 알림입니다.
+_EVENT = 0
+# 변경 알림 중 변경 피드에 순번을 붙여 발행한 변경 (_EVENT, _CHANGE, (피드 이름, Change))
+_CHANGE = "change"
+
+
+class StoreError(Exception):
+    """공유 저장소 프로세스에서 발생한 예외 (VersionConflict 외)."""
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> Any:
+    (size,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    return pickle.loads(await reader.readexactly(size))
+
+
+def _write_frame(writer: asyncio.StreamWriter, value: Any) -> None:
+    payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    writer.write(_HEADER.pack(len(payload)) + payload)
+
+
+class _StoreUsers(MemoryUserRepository):
+    """저장소 프로세스 쪽 유저 연산. bcrypt 는 워커에서 끝내고 해시만 받습니다."""
+
+    async def insert(self, username: str, hashed_password: str, age: int, gender: str) -> Optional[Dict]:
+        return UserModel._insert(username, hashed_password, age, gender)
+
+    async def insert_many(self, users: List[Dict]) -> List[Optional[Dict]]:
+        return UserModel._insert_many(users)
+
+    async def existing_usernames(self, usernames: List[str]) -> List[str]:
+        return UserModel.existing_usernames(usernames)
+
+    async def apply_update(self, user_id: int, update_data: Dict,
+                           expected_version: Optional[int] = None) -> Optional[Dict]:
+        return UserModel._apply_update(user_id, update_data, expected_version)
+
+    async def apply_updates(self, updates: List[Optional[Dict]]) -> List:
+        return UserModel.apply_updates(updates)
+
+    async def record_login_by_id(self, user_id: int) -> Optional[Tuple]:
+        user = UserModel.get_by_id(user_id)
+        if user is None:
+            return None
+        UserModel.record_login(user)
+        return user["last_login"], user["version"]
+
+    async def record_logins(self, logins: Dict[int, datetime]) -> None:
+        UserModel.record_logins(logins)
+
+
+class _StoreChanges:
+    """저장소 프로세스 쪽 변경 피드. 순번은 여기서 붙입니다."""
+
+    async def seq(self) -> Dict[str, int]:
+        return {name: feed.seq for name, feed in change_feeds.items()}
+
+
+class StoreServer:
+    """메모리 모델을 한 프로세스에 두고 Unix 소켓으로 여러 워커에 제공합니다.
+
+    요청 프레임은 (요청 id, 대상, 메서드, args, kwargs) 목록이고, 같은 순서의 (요청 id, 성공 여부, 값) 목록으로 답합니다.
+    유저가 바뀌거나 삭제되면 모든 워커에 알려 워커별 토큰 캐시를 무효화하게 합니다.
+    변경 피드의 변경도 순번을 붙인 그대로 모든 워커에 보내, 어느 워커에 연결해도 같은 순번으로 이어 받을 수 있게 합니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.targets = {"users": _StoreUsers(), "movies": MemoryMovieRepository(), "changes": _StoreChanges()}
+        self._writers: Set[asyncio.StreamWriter] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+        UserModel.add_listener(self._broadcast)
+        for feed in change_feeds.values():
+            feed.add_listener(self._broadcast_change)
+
+    async def start(self) -> "StoreServer":
+        if os.path.exists(self.path):
+            os.unlink(self.path)  # 이전 실행에서 남은 소켓 파일
+        self._server = await asyncio.start_unix_server(self._handle, self.path)
+        os.chmod(self.path, 0o600)
+        return self
+
+    async def serve_forever(self) -> None:
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        await self._server.wait_closed()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._writers.add(writer)
+        try:
+            while True:
+                calls = await _read_frame(reader)
+                # 메모리 연산은 await 하지 않으므로 한 프레임은 다른 워커의 요청과 섞이지 않고 이어서 실행됩니다.
+                _write_frame(writer, [await self._run(*call) for call in calls])
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass  # 워커 종료
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _run(self, request_id: int, target: str, method: str, args: Tuple, kwargs: Dict) -> Tuple:
+        try:
+            return request_id, True, await getattr(self.targets[target], method)(*args, **kwargs)
+        except VersionConflict as error:
+            return request_id, False, error
+        except Exception as error:
+            return request_id, False, StoreError(f"{type(error).__name__}: {error}")
+
+    def _broadcast(self, event: str, user: Dict) -> None:
+        if event == "create":
+            return  # 새 유저에 대해 캐시된 토큰은 없습니다.
+        for writer in self._writers:
+            _write_frame(writer, [(_EVENT, event, user)])
+
+    def _broadcast_change(self, name: str, change: Change) -> None:
+        for writer in self._writers:
+            _write_frame(writer, [(_EVENT, _CHANGE, (name, change))])
+
+
+class StoreClient:
+    """워커 쪽 연결. 같은 이벤트 루프 반복 안에서 들어온 호출을 한 프레임으로 묶어 보냅니다."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._read_task: Optional[asyncio.Task] = None
+        self._futures: Dict[int, asyncio.Future] = {}
+        self._outbox: List[Tuple] = []
+        self._next_id = _EVENT
+        # 지표
+        self.calls = 0
+        self.frames = 0
+
+    async def connect(self, attempts: int = 50, delay: float = 0.1) -> "StoreClient":
+        # 워커가 저장소 프로세스보다 먼저 뜰 수 있으므로 잠시 재시도합니다.
+        for attempt in range(attempts):
+            try:
+                self._reader, self._writer = await asyncio.open_unix_connection(self.path)
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                if attempt == attempts - 1:
+                    raise
+                await asyncio.sleep(delay)
+        self._read_task = asyncio.create_task(self._read_loop())
+        return self
+
+    async def follow_changes(self) -> None:
+        """이 워커의 변경 피드가 저장소 프로세스의 변경을 같은 순번으로 받게 합니다."""
+        for feed in change_feeds.values():
+            feed.following = True  # 워커에서 받은 유저 변경 알림으로 따로 순번을 붙이지 않습니다.
+        for name, seq in (await self.call("changes", "seq")).items():
+            change_feeds[name].follow(seq)
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        if self._read_task is not None:
+            self._read_task.cancel()
+
+    def call(self, target: str, method: str, *args, **kwargs) -> "asyncio.Future":
+        if self._writer is None or self._writer.is_closing():
+            raise StoreError("shared store is not connected")
+        self._next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self._futures[self._next_id] = future
+        if not self._outbox:
+            asyncio.get_running_loop().call_soon(self._flush)
+        self._outbox.append((self._next_id, target, method, args, kwargs))
+        return future
+
+    def _flush(self) -> None:
+        calls, self._outbox = self._outbox, []
+        self.calls += len(calls)
+        self.frames += 1
+        _write_frame(self._writer, calls)
+
+    async def _read_loop(self) -> None:
+        try:
+            while True:
+                for request_id, ok, value in await _read_frame(self._reader):
+                    if request_id == _EVENT:
+                        if ok == _CHANGE:
+                            name, change = value
+                            change_feeds[name].ingest(change)
+                        else:
+                            UserModel._notify(ok, value)  # (이벤트 종류, 유저)
+                        continue
+                    future = self._futures.pop(request_id)
+                    if future.done():
+                        continue  # 호출한 쪽이 취소됨
+                    if ok:
+                        future.set_result(value)
+                    else:
+                        future.set_exception(value)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            # 저장소와의 연결이 끊기면 기다리던 요청을 모두 실패시킵니다.
+            for future in self._futures.values():
+                if not future.done():
+                    future.set_exception(StoreError("shared store connection lost"))
+            self._futures.clear()
+            self._writer.close()
+
+    def metrics(self) -> Dict:
+        return {"calls": self.calls, "frames": self.frames,
+                "calls_per_frame": round(self.calls / self.frames, 2) if self.frames else 0.0}
+
+
+class SharedUserRepository(UserRepository):
+    """공유 저장소 프로세스의 UserModel 을 사용하는 저장소. 해싱과 검증은 이 워커의 password_service 가 합니다."""
+
+    def __init__(self, client: StoreClient):
+        self.client = client
+
+    async def create(self, username: str, password: str, age: int, gender: str) -> Optional[Dict]:
+        if await self.get_by_username(username) is not None:
+            return None  # 이미 존재하는 유저명
+        hashed_password = await password_service.hash(password)
+        return await self.client.call("users", "insert", username, hashed_password, age, gender)
+
+    async def create_many(self, users: List[Dict]) -> List[Optional[Dict]]:
+        # 이미 있는 username 과 요청 안의 중복은 해싱하기 전에 뺍니다. (그 사이 생긴 중복은 저장소가 None 으로 거릅니다)
+        existing = await self.client.call("users", "existing_usernames", [user["username"] for user in users])
+        accepted = UserModel.insertable(users, set(existing))
+        hashed_passwords = await password_service.hash_many([users[index]["password"] for index in accepted])
+        inserted = await self.client.call("users", "insert_many", [
+            {**users[index], "hashed_password": hashed} for index, hashed in zip(accepted, hashed_passwords)])
+        results: List[Optional[Dict]] = [None] * len(users)
+        for index, user in zip(accepted, inserted):
+            results[index] = user
+        return results
+
+    async def get_by_id(self, user_id: int) -> Optional[Dict]:
+        return await self.client.call("users", "get_by_id", user_id)
+
+    async def get_many(self, user_ids: List[int]) -> Dict[int, Dict]:
+        return await self.client.call("users", "get_many", user_ids)
+
+    async def get_by_username(self, username: str) -> Optional[Dict]:
+        return await self.client.call("users", "get_by_username", username)
+
+    async def page(self, after_id: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        return await self.client.call("users", "page", after_id, limit)
+
+    async def search(self, username: Optional[str] = None, age: Optional[int] = None, gender: Optional[str] = None,
+                     min_age: Optional[int] = None, max_age: Optional[int] = None,
+                     after_id: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        return await self.client.call("users", "search", username=username, age=age, gender=gender,
+                                      min_age=min_age, max_age=max_age, after_id=after_id, limit=limit)
+
+    async def update(self, user_id: int, user_update_data: UserUpdate,
+                     expected_version: Optional[int] = None) -> Optional[Dict]:
+        user = await self.get_by_id(user_id)
+        if user is None:
+            return None
+        if expected_version is not None and user["version"] != expected_version:
+            raise VersionConflict(user["version"])  # 해싱 전에 미리 확인합니다.
+
+        update_data = user_update_data.model_dump(exclude_unset=True)
+        if "password" in update_data:
+            update_data["hashed_password"] = await password_service.hash(update_data.pop("password"))
+        return await self.client.call("users", "apply_update", user_id, update_data, expected_version)
+
+    async def update_many(self, updates: List[Dict]) -> List:
+        # 없는 유저의 비밀번호는 해싱하지 않습니다. (그 사이 삭제된 유저는 저장소가 None 으로 거릅니다)
+        found = await self.get_many([update["id"] for update in updates])
+        return await self.client.call("users", "apply_updates", await UserModel.hash_updates(updates, found))
+
+    async def delete(self, user_id: int) -> bool:
+        return await self.client.call("users", "delete", user_id)
+
+    async def delete_many(self, user_ids: List[int]) -> List[bool]:
+        return await self.client.call("users", "delete_many", user_ids)
+
+    async def authenticate(self, username: str, password: str) -> Optional[Dict]:
+        user = await self.get_by_username(username)
+        if user is None:
+            await password_service.verify_dummy(password)  # 없는 유저도 같은 시간이 걸리게 합니다.
+            return None
+        if await password_service.verify(password, user["hashed_password"]):
+            return user
+        return None
+
+    async def record_login(self, user: Dict) -> None:
+        result = await self.client.call("users", "record_login_by_id", user["id"])
+        if result is not None:
+            user["last_login"], user["version"] = result
+
+    async def record_logins(self, logins: Dict[int, datetime]) -> None:
+        await self.client.call("users", "record_logins", logins)
+
+    async def version(self) -> int:
+        return await self.client.call("users", "version")
+
+    async def stats(self, bin_size: int = 10) -> Dict:
+        return await self.client.call("users", "stats", bin_size)
+
+
+class SharedMovieRepository(MovieRepository):
+    """공유 저장소 프로세스의 MovieModel 을 사용하는 저장소. 반환되는 MovieModel 은 복사본입니다."""
+
+    def __init__(self, client: StoreClient):
+        self.client = client
+
+    async def create(self, title: str, playtime: int, genre: str) -> MovieModel:
+        return await self.client.call("movies", "create", title, playtime, genre)
+
+    async def create_many(self, movies: List[Dict]) -> List[MovieModel]:
+        return await self.client.call("movies", "create_many", movies)
+
+    async def all(self) -> List[MovieModel]:
+        return await self.client.call("movies", "all")
+
+    async def get_by_id(self, movie_id: int) -> Optional[MovieModel]:
+        return await self.client.call("movies", "get_by_id", movie_id)
+
+    async def get_many(self, movie_ids: List[int]) -> Dict[int, MovieModel]:
+        return await self.client.call("movies", "get_many", movie_ids)
+
+    async def page(self, after_id: int = 0, limit: Optional[int] = None) -> List[MovieModel]:
+        return await self.client.call("movies", "page", after_id, limit)
+
+    async def search(self, title: Optional[str] = None, genre: Optional[str] = None,
+                     min_playtime: Optional[int] = None, max_playtime: Optional[int] = None,
+                     after_id: int = 0, limit: Optional[int] = None) -> List[MovieModel]:
+        return await self.client.call("movies", "search", title=title, genre=genre, min_playtime=min_playtime,
+                                      max_playtime=max_playtime, after_id=after_id, limit=limit)
+
+    async def update(self, movie_id: int, title: str, playtime: int, genre: str,
+                     expected_version: Optional[int] = None) -> Optional[MovieModel]:
+        return await self.client.call("movies", "update", movie_id, title, playtime, genre, expected_version)
+
+    async def update_many(self, updates: List[Dict]) -> List:
+        return await self.client.call("movies", "update_many", updates)
+
+    async def delete(self, movie_id: int) -> bool:
+        return await self.client.call("movies", "delete", movie_id)
+
+    async def delete_many(self, movie_ids: List[int]) -> List[bool]:
+        return await self.client.call("movies", "delete_many", movie_ids)
+
+    async def version(self) -> int:
+        return await self.client.call("movies", "version")
+
+    async def stats(self) -> Dict:
+        return await self.client.call("movies", "stats")
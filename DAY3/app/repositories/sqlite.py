@@ -0,0 +1,520 @@
+import asyncio
+import sqlite3
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import aiosqlite
+
+from app.models.concurrency import VersionConflict
+from app.models.movies import MovieModel
+from app.models.users import UserModel
+from app.repositories.base import MovieRepository, UserRepository
+from app.schemas.users import UserUpdate
+from app.utils.passwords import password_service
+from app.utils.stats import age_histogram, cached_async, playtime_stats
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL,
+    hashed_password TEXT NOT NULL,
+    age INTEGER NOT NULL,
+    gender TEXT NOT NULL,
+    last_login TEXT,
+    version INTEGER NOT NULL DEFAULT 1
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_users_username ON users (username);
+CREATE INDEX IF NOT EXISTS ix_users_age ON users (age);
+CREATE INDEX IF NOT EXISTS ix_users_gender ON users (gender);
+
+CREATE TABLE IF NOT EXISTS movies (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    playtime INTEGER NOT NULL,
+    genre TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS ix_movies_genre ON movies (genre);
+CREATE INDEX IF NOT EXISTS ix_movies_playtime ON movies (playtime);
+
+CREATE TABLE IF NOT EXISTS collection_versions (
+    name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO collection_versions (name, version) VALUES ('users', 0), ('movies', 0);
+"""
+# 컬렉션 버전: 행이 바뀔 때마다 트리거가 1씩 올립니다. (목록 ETag 용, 다른 프로세스의 변경도 반영됩니다)
+SCHEMA += "".join(
+    f"CREATE TRIGGER IF NOT EXISTS {table}_{event.lower()}_version AFTER {event} ON {table} BEGIN "
+    f"UPDATE collection_versions SET version = version + 1 WHERE name = '{table}'; END;\n"
+    for table in ("users", "movies") for event in ("INSERT", "UPDATE", "DELETE")
+)
+
+
+class SqlitePool:
+    """aiosqlite 커넥션 풀.
+
+    커넥션마다 sqlite3 의 statement 캐시(cached_statements)가 있어, 같은 SQL 문자열은 한 번만 prepare 됩니다.
+    """
+
+    def __init__(self, path: str, size: int = 4):
+        self.path = path
+        self.size = size
+        self._connections: List[aiosqlite.Connection] = []
+        self._idle: "asyncio.Queue[aiosqlite.Connection]" = asyncio.Queue()
+
+    async def open(self) -> "SqlitePool":
+        for _ in range(self.size):
+            connection = await aiosqlite.connect(self.path, timeout=5, cached_statements=256)
+            connection.row_factory = aiosqlite.Row
+            await connection.execute("PRAGMA journal_mode=WAL")
+            await connection.execute("PRAGMA synchronous=NORMAL")
+            # 메모리 모델과 같은 결과가 나오도록 대소문자 변환은 파이썬 str.lower 를 사용합니다.
+            await connection.create_function("py_lower", 1, str.lower, deterministic=True)
+            self._connections.append(connection)
+            self._idle.put_nowait(connection)
+        async with self.acquire() as connection:
+            await connection.executescript(SCHEMA)
+            # version 컬럼이 없던 예전 DB 파일도 그대로 쓸 수 있게 컬럼을 추가합니다.
+            for table in ("users", "movies"):
+                async with connection.execute(f"PRAGMA table_info({table})") as cursor:
+                    columns = {row["name"] for row in await cursor.fetchall()}
+                if "version" not in columns:
+                    await connection.execute(f"ALTER TABLE {table} ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+            await connection.commit()
+        return self
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[aiosqlite.Connection]:
+        connection = await self._idle.get()
+        try:
+            yield connection
+        finally:
+            self._idle.put_nowait(connection)
+
+    async def fetch_one(self, sql: str, params: Tuple = ()) -> Optional[sqlite3.Row]:
+        async with self.acquire() as connection:
+            async with connection.execute(sql, params) as cursor:
+                return await cursor.fetchone()
+
+    async def fetch_all(self, sql: str, params: Tuple = ()) -> List[sqlite3.Row]:
+        async with self.acquire() as connection:
+            async with connection.execute(sql, params) as cursor:
+                return list(await cursor.fetchall())
+
+    async def execute(self, sql: str, params: Tuple = ()) -> Tuple[Optional[int], int]:
+        """쓰기 쿼리를 실행하고 커밋합니다. (lastrowid, rowcount) 를 반환합니다."""
+        async with self.acquire() as connection:
+            try:
+                async with connection.execute(sql, params) as cursor:
+                    result = cursor.lastrowid, cursor.rowcount
+                await connection.commit()
+            except BaseException:
+                # 실패한 쓰기 트랜잭션이 열린 채로 풀에 돌아가면 다른 커넥션의 쓰기가 모두 잠깁니다.
+                await connection.rollback()
+                raise
+        return result
+
+    async def execute_many(self, sql: str, rows: List[Tuple]) -> int:
+        """같은 쓰기 쿼리를 여러 행에 대해 한 트랜잭션으로 실행하고, 바뀐 행 수를 반환합니다."""
+        async with self.acquire() as connection:
+            try:
+                async with connection.executemany(sql, rows) as cursor:
+                    rowcount = cursor.rowcount
+                await connection.commit()
+            except BaseException:
+                await connection.rollback()
+                raise
+        return rowcount
+
+    async def execute_each(self, statements: List[Tuple[str, Tuple]]) -> List[int]:
+        """서로 다른 (sql, params) 쓰기 쿼리를 한 트랜잭션으로 실행하고, 쿼리마다 바뀐 행 수를 반환합니다."""
+        rowcounts = []
+        async with self.acquire() as connection:
+            try:
+                for sql, params in statements:
+                    async with connection.execute(sql, params) as cursor:
+                        rowcounts.append(cursor.rowcount)
+                await connection.commit()
+            except BaseException:
+                await connection.rollback()
+                raise
+        return rowcounts
+
+    async def insert_many(self, sql: str, rows: List[Tuple]) -> List[Optional[int]]:
+        """여러 행을 한 트랜잭션으로 넣습니다. 무시된 행(INSERT OR IGNORE)은 None 입니다."""
+        ids: List[Optional[int]] = []
+        async with self.acquire() as connection:
+            try:
+                for row in rows:
+                    async with connection.execute(sql, row) as cursor:
+                        ids.append(cursor.lastrowid if cursor.rowcount else None)
+                await connection.commit()
+            except BaseException:
+                await connection.rollback()
+                raise
+        return ids
+
+    async def close(self) -> None:
+        for connection in self._connections:
+            await connection.close()
+        self._connections.clear()
+
+
+def _where(conditions: List[Tuple[str, object]], after_id: int, limit: Optional[int]) -> Tuple[str, Tuple]:
+    clauses = ["id > ?"] + [clause for clause, _ in conditions]
+    params = [after_id] + [value for _, value in conditions]
+    sql = " WHERE " + " AND ".join(clauses) + " ORDER BY id"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    return sql, tuple(params)
+
+
+async def _collection_version(pool: SqlitePool, name: str) -> int:
+    row = await pool.fetch_one("SELECT version FROM collection_versions WHERE name = ?", (name,))
+    return row[0]
+
+
+def _groups(rows: List[sqlite3.Row]) -> Dict[str, Dict[int, int]]:
+    """(그룹, 값, 개수) 행을 메모리 모델의 Histogram 과 같은 형태로 바꿉니다."""
+    groups: Dict[str, Dict[int, int]] = {}
+    for group, value, count in rows:
+        groups.setdefault(group, {})[value] = count
+    return groups
+
+
+class SqliteUserRepository(UserRepository):
+    COLUMNS = "SELECT id, username, hashed_password, age, gender, last_login, version FROM users"
+
+    def __init__(self, pool: SqlitePool):
+        self.pool = pool
+
+    @staticmethod
+    def _to_user(row: Optional[sqlite3.Row]) -> Optional[Dict]:
+        if row is None:
+            return None
+        user = dict(row)
+        if user["last_login"]:
+            user["last_login"] = datetime.fromisoformat(user["last_login"])
+        return user
+
+    async def create(self, username: str, password: str, age: int, gender: str) -> Optional[Dict]:
+        if await self.get_by_username(username) is not None:
+            return None  # 이미 존재하는 유저명
+        hashed_password = await password_service.hash(password)
+        try:
+            user_id, _ = await self.pool.execute(
+                "INSERT INTO users (username, hashed_password, age, gender) VALUES (?, ?, ?, ?)",
+                (username, hashed_password, age, gender),
+            )
+        except sqlite3.IntegrityError:
+            return None
+        user = await self.get_by_id(user_id)
+        UserModel._notify("create", user)
+        return user
+
+    async def create_many(self, users: List[Dict]) -> List[Optional[Dict]]:
+        if not users:
+            return []
+        # 이미 있는 username 과 요청 안의 중복은 해싱하기 전에 뺍니다. (그 사이 생긴 중복은 INSERT OR IGNORE 가 거릅니다)
+        usernames = list({user["username"] for user in users})
+        rows = await self.pool.fetch_all(
+            f"SELECT username FROM users WHERE username IN ({', '.join('?' * len(usernames))})", tuple(usernames))
+        accepted = UserModel.insertable(users, {row[0] for row in rows})
+        hashed_passwords = await password_service.hash_many([users[index]["password"] for index in accepted])
+        ids = await self.pool.insert_many(
+            "INSERT OR IGNORE INTO users (username, hashed_password, age, gender) VALUES (?, ?, ?, ?)",
+            [(users[index]["username"], hashed, users[index]["age"], users[index]["gender"])
+             for index, hashed in zip(accepted, hashed_passwords)],
+        )
+        results: List[Optional[Dict]] = [None] * len(users)
+        for index, hashed, user_id in zip(accepted, hashed_passwords, ids):
+            if user_id is None:
+                continue
+            user = users[index]
+            results[index] = {
+                "id": user_id, "username": user["username"], "hashed_password": hashed,
+                "age": user["age"], "gender": user["gender"], "last_login": None, "version": 1,
+            }
+            UserModel._notify("create", results[index])
+        return results
+
+    async def get_by_id(self, user_id: int) -> Optional[Dict]:
+        return self._to_user(await self.pool.fetch_one(self.COLUMNS + " WHERE id = ?", (user_id,)))
+
+    async def get_many(self, user_ids: List[int]) -> Dict[int, Dict]:
+        if not user_ids:
+            return {}
+        rows = await self.pool.fetch_all(self.COLUMNS + f" WHERE id IN ({', '.join('?' * len(user_ids))})",
+                                         tuple(user_ids))
+        return {row["id"]: self._to_user(row) for row in rows}
+
+    async def get_by_username(self, username: str) -> Optional[Dict]:
+        return self._to_user(await self.pool.fetch_one(self.COLUMNS + " WHERE username = ?", (username,)))
+
+    async def page(self, after_id: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        return await self.search(after_id=after_id, limit=limit)
+
+    async def search(self, username: Optional[str] = None, age: Optional[int] = None, gender: Optional[str] = None,
+                     min_age: Optional[int] = None, max_age: Optional[int] = None,
+                     after_id: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        conditions = []
+        if username:
+            conditions.append(("username = ?", username))
+        if age:
+            conditions.append(("age = ?", age))
+        if gender:
+            conditions.append(("gender = ?", gender))
+        if min_age is not None:
+            conditions.append(("age >= ?", min_age))
+        if max_age is not None:
+            conditions.append(("age <= ?", max_age))
+        where, params = _where(conditions, after_id, limit)
+        return [self._to_user(row) for row in await self.pool.fetch_all(self.COLUMNS + where, params)]
+
+    async def update(self, user_id: int, user_update_data: UserUpdate,
+                     expected_version: Optional[int] = None) -> Optional[Dict]:
+        user = await self.get_by_id(user_id)
+        if user is None:
+            return None
+        if expected_version is not None and user["version"] != expected_version:
+            raise VersionConflict(user["version"])  # 해싱 전에 미리 확인합니다.
+
+        update_data = user_update_data.model_dump(exclude_unset=True)
+        if "password" in update_data:
+            update_data["hashed_password"] = await password_service.hash(update_data.pop("password"))
+        if update_data.get("last_login"):
+            update_data["last_login"] = update_data["last_login"].isoformat()
+        if update_data:
+            assignments = ", ".join(f"{column} = ?" for column in update_data)
+            sql = f"UPDATE users SET {assignments}, version = version + 1 WHERE id = ?"
+            params = (*update_data.values(), user_id)
+            if expected_version is not None:
+                sql, params = sql + " AND version = ?", (*params, expected_version)
+            _, rowcount = await self.pool.execute(sql, params)
+            user = await self.get_by_id(user_id)
+            if rowcount == 0 and user is not None:
+                raise VersionConflict(user["version"])
+        if user is not None:
+            # 토큰 캐시 무효화 등은 UserModel 의 변경 알림을 그대로 사용합니다.
+            UserModel._notify("update", user)
+        return user
+
+    async def update_many(self, updates: List[Dict]) -> List:
+        if not updates:
+            return []
+        # 없는 유저의 비밀번호는 해싱하지 않습니다.
+        found = await self.get_many(list({update["id"] for update in updates}))
+        prepared = await UserModel.hash_updates(updates, found)
+        statements, positions = [], []
+        for index, update in enumerate(prepared):
+            if update is None:
+                continue
+            update_data = dict(update)
+            user_id = update_data.pop("id")
+            expected_version = update_data.pop("version", None)
+            if update_data.get("last_login"):
+                update_data["last_login"] = update_data["last_login"].isoformat()
+            # 고칠 필드가 없어도 version 은 확인하고 올립니다. (메모리 모델과 같게)
+            assignments = "".join(f"{column} = ?, " for column in update_data)
+            sql = f"UPDATE users SET {assignments}version = version + 1 WHERE id = ?"
+            params = (*update_data.values(), user_id)
+            if expected_version is not None:
+                sql, params = sql + " AND version = ?", (*params, expected_version)
+            statements.append((sql, params))
+            positions.append(index)
+        rowcounts = await self.pool.execute_each(statements)
+        current = await self.get_many(list(found))
+        results: List = [None] * len(updates)
+        for index, rowcount in zip(positions, rowcounts):
+            user = current.get(updates[index]["id"])
+            if user is None:
+                continue  # 그 사이 삭제됨
+            results[index] = user if rowcount else VersionConflict(user["version"])
+        for result in results:
+            if isinstance(result, dict):
+                UserModel._notify("update", result)
+        return results
+
+    async def delete(self, user_id: int) -> bool:
+        user = await self.get_by_id(user_id)
+        if user is None:
+            return False
+        _, rowcount = await self.pool.execute("DELETE FROM users WHERE id = ?", (user_id,))
+        if rowcount == 0:
+            return False  # 그 사이 다른 요청이 삭제함
+        UserModel._notify("delete", user)
+        return True
+
+    async def delete_many(self, user_ids: List[int]) -> List[bool]:
+        if not user_ids:
+            return []
+        # 삭제 알림에 보낼 유저를 먼저 읽어 둡니다.
+        found = await self.get_many(list(set(user_ids)))
+        rowcounts = await self.pool.execute_each(
+            [("DELETE FROM users WHERE id = ?", (user_id,)) for user_id in user_ids])
+        for user_id, rowcount in zip(user_ids, rowcounts):
+            if rowcount and user_id in found:
+                UserModel._notify("delete", found[user_id])
+        return [rowcount > 0 for rowcount in rowcounts]
+
+    async def authenticate(self, username: str, password: str) -> Optional[Dict]:
+        user = await self.get_by_username(username)
+        if user is None:
+            await password_service.verify_dummy(password)  # 없는 유저도 같은 시간이 걸리게 합니다.
+            return None
+        if await password_service.verify(password, user["hashed_password"]):
+            return user
+        return None
+
+    async def record_login(self, user: Dict) -> None:
+        user["last_login"] = datetime.now(timezone.utc)
+        await self.pool.execute("UPDATE users SET last_login = ?, version = version + 1 WHERE id = ?",
+                                (user["last_login"].isoformat(), user["id"]))
+        user["version"] += 1
+        UserModel._notify("login", user)
+
+    async def record_logins(self, logins: Dict[int, datetime]) -> None:
+        await self.pool.execute_many("UPDATE users SET last_login = ?, version = version + 1 WHERE id = ?",
+                                     [(when.isoformat(), user_id) for user_id, when in logins.items()])
+        for user_id in logins:
+            UserModel._notify("login", {"id": user_id})
+
+    async def version(self) -> int:
+        return await _collection_version(self.pool, "users")
+
+    async def stats(self, bin_size: int = 10) -> Dict:
+        # 컬렉션 버전이 그대로면 집계 쿼리 없이 지난번 결과를 반환합니다. (메모리 저장소와 같은 방식)
+        async def compute() -> Dict:
+            rows = await self.pool.fetch_all("SELECT gender, age, COUNT(*) FROM users GROUP BY gender, age")
+            return age_histogram(_groups(rows), bin_size)
+
+        return await cached_async((self.pool.path, "users", bin_size), await self.version(), compute)
+
+
+class SqliteMovieRepository(MovieRepository):
+    COLUMNS = "SELECT id, title, playtime, genre, version FROM movies"
+
+    def __init__(self, pool: SqlitePool):
+        self.pool = pool
+
+    @staticmethod
+    def _to_movie(row: Optional[sqlite3.Row]) -> Optional[MovieModel]:
+        return None if row is None else MovieModel(**dict(row))
+
+    async def create(self, title: str, playtime: int, genre: str) -> MovieModel:
+        movie_id, _ = await self.pool.execute("INSERT INTO movies (title, playtime, genre) VALUES (?, ?, ?)",
+                                              (title, playtime, genre))
+        movie = MovieModel(id=movie_id, title=title, playtime=playtime, genre=genre)
+        # 변경 피드 등은 MovieModel 의 변경 알림을 그대로 사용합니다.
+        MovieModel._notify("create", movie)
+        return movie
+
+    async def create_many(self, movies: List[Dict]) -> List[MovieModel]:
+        ids = await self.pool.insert_many("INSERT INTO movies (title, playtime, genre) VALUES (?, ?, ?)",
+                                          [(movie["title"], movie["playtime"], movie["genre"]) for movie in movies])
+        created = [MovieModel(id=movie_id, **movie) for movie_id, movie in zip(ids, movies)]
+        for movie in created:
+            MovieModel._notify("create", movie)
+        return created
+
+    async def all(self) -> List[MovieModel]:
+        return await self.page()
+
+    async def get_by_id(self, movie_id: int) -> Optional[MovieModel]:
+        return self._to_movie(await self.pool.fetch_one(self.COLUMNS + " WHERE id = ?", (movie_id,)))
+
+    async def get_many(self, movie_ids: List[int]) -> Dict[int, MovieModel]:
+        if not movie_ids:
+            return {}
+        rows = await self.pool.fetch_all(self.COLUMNS + f" WHERE id IN ({', '.join('?' * len(movie_ids))})",
+                                         tuple(movie_ids))
+        return {row["id"]: self._to_movie(row) for row in rows}
+
+    async def page(self, after_id: int = 0, limit: Optional[int] = None) -> List[MovieModel]:
+        return await self.search(after_id=after_id, limit=limit)
+
+    async def search(self, title: Optional[str] = None, genre: Optional[str] = None,
+                     min_playtime: Optional[int] = None, max_playtime: Optional[int] = None,
+                     after_id: int = 0, limit: Optional[int] = None) -> List[MovieModel]:
+        conditions = []
+        if title is not None:
+            conditions.append(("instr(py_lower(title), ?) > 0", title.lower()))
+        if genre is not None:
+            conditions.append(("instr(py_lower(genre), ?) > 0", genre.lower()))
+        if min_playtime is not None:
+            conditions.append(("playtime >= ?", min_playtime))
+        if max_playtime is not None:
+            conditions.append(("playtime <= ?", max_playtime))
+        where, params = _where(conditions, after_id, limit)
+        return [self._to_movie(row) for row in await self.pool.fetch_all(self.COLUMNS + where, params)]
+
+    async def update(self, movie_id: int, title: str, playtime: int, genre: str,
+                     expected_version: Optional[int] = None) -> Optional[MovieModel]:
+        sql = "UPDATE movies SET title = ?, playtime = ?, genre = ?, version = version + 1 WHERE id = ?"
+        params: Tuple = (title, playtime, genre, movie_id)
+        if expected_version is not None:
+            sql, params = sql + " AND version = ?", (*params, expected_version)
+        _, rowcount = await self.pool.execute(sql, params)
+        movie = await self.get_by_id(movie_id)
+        if rowcount == 0 and movie is not None:
+            raise VersionConflict(movie.version)
+        if movie is not None:
+            MovieModel._notify("update", movie)
+        return movie
+
+    async def update_many(self, updates: List[Dict]) -> List:
+        if not updates:
+            return []
+        statements = []
+        for update in updates:
+            sql = "UPDATE movies SET title = ?, playtime = ?, genre = ?, version = version + 1 WHERE id = ?"
+            params: Tuple = (update["title"], update["playtime"], update["genre"], update["id"])
+            if update.get("version") is not None:
+                sql, params = sql + " AND version = ?", (*params, update["version"])
+            statements.append((sql, params))
+        rowcounts = await self.pool.execute_each(statements)
+        current = await self.get_many(list({update["id"] for update in updates}))
+        results: List = []
+        for update, rowcount in zip(updates, rowcounts):
+            movie = current.get(update["id"])
+            results.append(None if movie is None else movie if rowcount else VersionConflict(movie.version))
+        for result in results:
+            if isinstance(result, MovieModel):
+                MovieModel._notify("update", result)
+        return results
+
+    async def delete(self, movie_id: int) -> bool:
+        movie = await self.get_by_id(movie_id)
+        if movie is None:
+            return False
+        _, rowcount = await self.pool.execute("DELETE FROM movies WHERE id = ?", (movie_id,))
+        if rowcount == 0:
+            return False  # 그 사이 다른 요청이 삭제함
+        MovieModel._notify("delete", movie)
+        return True
+
+    async def delete_many(self, movie_ids: List[int]) -> List[bool]:
+        if not movie_ids:
+            return []
+        # 삭제 알림에 보낼 영화를 먼저 읽어 둡니다.
+        found = await self.get_many(list(set(movie_ids)))
+        rowcounts = await self.pool.execute_each(
+            [("DELETE FROM movies WHERE id = ?", (movie_id,)) for movie_id in movie_ids])
+        for movie_id, rowcount in zip(movie_ids, rowcounts):
+            if rowcount and movie_id in found:
+                MovieModel._notify("delete", found[movie_id])
+        return [rowcount > 0 for rowcount in rowcounts]
+
+    async def version(self) -> int:
+        return await _collection_version(self.pool, "movies")
+
+    async def stats(self) -> Dict:
+        async def compute() -> Dict:
+            rows = await self.pool.fetch_all(
+                "SELECT py_lower(genre), playtime, COUNT(*) FROM movies GROUP BY py_lower(genre), playtime")
+            return playtime_stats(_groups(rows))
+
+        return await cached_async((self.pool.path, "movies"), await self.version(), compute)
@@ -0,0 +1,27 @@
+from typing import Dict
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from app.utils.jwt import get_admin_user
+from app.utils.profiling import PROFILE_MAX_SECONDS, profiler
+
+debug_router = APIRouter(prefix="/debug", tags=["debug"])
+
+
+@debug_router.get("/profile", response_class=PlainTextResponse)
+async def profile(
+        seconds: float = Query(5, gt=0, le=PROFILE_MAX_SECONDS, description="샘플링할 시간(초)"),
+        threads: str = Query("loop", pattern="^(loop|all)$", description="loop: 이벤트 루프 스레드만, all: 모든 스레드"),
+        _admin: Dict = Depends(get_admin_user)
+):
+    # 실행 중인 앱을 seconds 동안 샘플링해 collapsed 스택("프레임;프레임;... 샘플 수")을 반환합니다.
+    # flamegraph.pl 이나 speedscope 에 그대로 넣을 수 있습니다.
+    if profiler.running:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Profiler is already running",
+        )
+    stacks = await profiler.profile(seconds, all_threads=threads == "all")
+    body = "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+    return PlainTextResponse(body, headers={"Content-Disposition": 'attachment; filename="profile.collapsed"'})
@@ -1,50 +1,223 @@
-from typing import Annotated
+from typing import List, Optional, Union
 
-from fastapi import Path, HTTPException, Query, APIRouter
+from fastapi import APIRouter, HTTPException, Header, Path, Query, Depends, Request, Response, status
 
-from app.models.movies import MovieModel
-from app.schemas.movies import MovieResponse, CreateMovieRequest, MovieSearchParams, MovieUpdateRequest
+from app.models.concurrency import VersionConflict
+from app.repositories import MovieRepository, get_movie_repository
+from app.schemas.batch import BatchGetRequest, MovieBatch
+from app.schemas.bulk import BulkDeleteResult, BulkResult, BulkUpdateResult
+from app.schemas.movies import MovieBulkUpdate, MovieCreate, MoviePatch, MovieRead, MovieSearch, MovieUpdate
+from app.schemas.pagination import PageParams
+from app.schemas.stats import MovieStats
+from app.utils.bulk import process_bulk, process_bulk_delete, process_bulk_update
+from app.utils.change_feed import change_stream, movie_changes
+from app.utils.etag import (ListETagCache, etag, is_not_modified, list_etag, not_modified, parse_if_match,
+                            precondition_failed, set_cache_headers, set_etag)
+from app.utils.export import ExportFormat, stream_export
+from app.utils.pagination import decode_cursor, paginate
+from app.utils.response_cache import movie_search_cache
+from app.utils.serializers import batch_result, movie_encoder, render
 
 movie_router = APIRouter(prefix="/movies", tags=["movies"])
+# 목록 쿼리별 ETag (컬렉션 버전이 바뀌면 무효)
+list_etags = ListETagCache()
 
 
-@movie_router.post('', response_model=MovieResponse, status_code=201)
-async def create_movie(data: CreateMovieRequest):
-    movie = MovieModel.create(**data.model_dump())
+@movie_router.post("/", response_model=Union[MovieRead, List[MovieRead]], status_code=status.HTTP_201_CREATED)
+async def create_movie(
+        movie_data: MovieCreate,
+        legacy: bool = Query(False, description="true 이면 예전처럼 전체 영화 목록을 반환합니다."),
+        movies: MovieRepository = Depends(get_movie_repository)
+):
+    movie = await movies.create(
+        title=movie_data.title,
+        playtime=movie_data.playtime,
+        genre=movie_data.genre
+    )
+    if legacy:
+        return await movies.all()
     return movie
 
 
-@movie_router.get('', response_model=list[MovieResponse], status_code=200)
-async def get_movies(query_params: Annotated[MovieSearchParams, Query()]):
-    valid_query = {key: value for key, value in query_params.model_dump().items() if value is not None}
+@movie_router.post("/bulk", response_model=BulkResult, status_code=status.HTTP_200_OK)
+async def bulk_create_movies(request: Request, movies: MovieRepository = Depends(get_movie_repository)):
+    """JSON 배열 또는 NDJSON(application/x-ndjson) 으로 여러 영화를 한 번에 등록합니다."""
+    return await process_bulk(request, MovieCreate, movies.create_many, lambda movie: movie.id,
+                              conflict_detail="Movie could not be created.")
 
-    if valid_query:
-        return MovieModel.filter(**valid_query)
 
-    return MovieModel.all()
+@movie_router.put("/bulk", response_model=BulkUpdateResult, status_code=status.HTTP_200_OK)
+async def bulk_update_movies(request: Request, movies: MovieRepository = Depends(get_movie_repository)):
+    """JSON 배열 또는 NDJSON 으로 여러 영화를 한 번에 고칩니다. 항목은 id 와 PUT 본문, (선택) version 입니다."""
+    return await process_bulk_update(request, MovieBulkUpdate, movies.update_many, lambda movie: movie.version,
+                                     not_found_detail="Movie not found")
 
 
-@movie_router.get('/{movie_id}', response_model=MovieResponse, status_code=200)
-async def get_movie(movie_id: int = Path(gt=0)):
-    movie = MovieModel.get(id=movie_id)
+@movie_router.post("/bulk-delete", response_model=BulkDeleteResult, status_code=status.HTTP_200_OK)
+async def bulk_delete_movies(request: Request, movies: MovieRepository = Depends(get_movie_repository)):
+    """JSON 배열 또는 NDJSON 의 {"id": ...} 항목으로 여러 영화를 한 번에 지웁니다."""
+    return await process_bulk_delete(request, movies.delete_many, not_found_detail="Movie not found")
+
+
+@movie_router.post("/batch-get", response_model=MovieBatch, status_code=status.HTTP_200_OK)
+async def batch_get_movies(
+        response: Response,
+        batch: BatchGetRequest,
+        movies: MovieRepository = Depends(get_movie_repository)
+):
+    """여러 영화를 id 로 한 번에 조회합니다. 요청한 순서대로 반환하고, 없는 id 는 missing 에 담습니다."""
+    ids = list(dict.fromkeys(batch.ids))  # 같은 id 는 한 번만
+    return render(response, batch_result(ids, await movies.get_many(ids)), movie_encoder.batch)
+
+
+@movie_router.get("/", response_model=List[MovieRead], status_code=status.HTTP_200_OK)
+async def get_movies(
+        response: Response,
+        params: MovieSearch = Depends(),
+        page: PageParams = Depends(),
+        if_none_match: Optional[str] = Header(None),
+        movies: MovieRepository = Depends(get_movie_repository)
+):
+    """If-None-Match 가 현재 목록의 ETag 와 같으면 304 를 반환합니다."""
+    after_id = decode_cursor(page.cursor)
+    search_query = {key: value for key, value in params.model_dump().items() if value is not None}
+
+    # 제목 / 장르 검색은 대소문자를 구분하지 않으므로 소문자로 맞춘 쿼리를 캐시 키로 씁니다.
+    normalized = {key: value.lower() if isinstance(value, str) else value for key, value in search_query.items()}
+    query = (tuple(sorted(normalized.items())), after_id, page.limit)
+    version = await movies.version()
+    # 컬렉션이 그대로면 기억해 둔 ETag 로 조회 없이 304 를, 아니면 직렬화해 둔 응답을 반환합니다.
+    tag = list_etags.get(query, version)
+    if tag is not None and is_not_modified(if_none_match, tag):
+        return not_modified(tag)
+    cached = movie_search_cache.get(query, version)
+    if cached is not None:
+        return cached
+
+    if search_query:
+        found = await movies.search(**search_query, after_id=after_id, limit=page.limit + 1)
+        if not found and not await movies.search(**search_query, limit=1):
+            # 검색 결과가 하나도 없으면 전체 목록을 반환합니다.
+            found = await movies.page(after_id=after_id, limit=page.limit + 1)
+    else:
+        found = await movies.page(after_id=after_id, limit=page.limit + 1)
+
+    if tag is None:
+        # 다음 페이지 여부도 ETag 에 반영되도록 limit + 1 개 전체로 만듭니다.
+        tag = list_etag(found, lambda movie: (movie.id, movie.version))
+        list_etags.put(query, version, tag)
+        if is_not_modified(if_none_match, tag):
+            return not_modified(tag)
+    set_cache_headers(response, tag)
+    return movie_search_cache.render(query, version, response,
+                                     paginate(response, found, page.limit, lambda movie: movie.id), movie_encoder)
+
+
+@movie_router.get("/export", status_code=status.HTTP_200_OK)
+async def export_movies(fmt: str = ExportFormat, movies: MovieRepository = Depends(get_movie_repository)):
+    """전체 영화 목록을 NDJSON 또는 CSV 로 스트리밍합니다."""
+    return stream_export(
+        "movies",
+        lambda after_id, limit: movies.page(after_id=after_id, limit=limit),
+        lambda movie: movie.id,
+        movie_encoder.row,
+        movie_encoder.fields,
+        fmt,
+    )
+
+
+@movie_router.get("/changes", status_code=status.HTTP_200_OK)
+async def stream_movie_changes(
+        after: Optional[int] = Query(None, ge=0, description="이 순번 다음 변경부터 받습니다. 없으면 지금부터 받습니다."),
+        last_event_id: Optional[str] = Header(None)
+):
+    """영화 create / update / delete 를 server-sent events 로 보냅니다.
+
+    각 이벤트의 id 는 순번입니다. 끊긴 뒤 after(또는 Last-Event-ID)로 이어 받을 수 있고,
+    이어 받을 수 없으면 resync 이벤트를 보내고 끝냅니다. (목록을 다시 읽은 뒤 그 id 부터 이어 받기)
+    """
+    return change_stream(movie_changes, after, last_event_id)
+
+
+@movie_router.get("/stats", response_model=MovieStats, status_code=status.HTTP_200_OK)
+async def get_movie_stats(movies: MovieRepository = Depends(get_movie_repository)):
+    """장르별 영화 수, 상영 시간 합계 / 평균 / 백분위수(p50, p90, p99)."""
+    return await movies.stats()
+
+
+@movie_router.get("/{movie_id}", response_model=MovieRead, status_code=status.HTTP_200_OK)
+async def get_movie_by_id(
+        response: Response,
+        movie_id: int = Path(..., gt=0),
+        if_none_match: Optional[str] = Header(None),
+        movies: MovieRepository = Depends(get_movie_repository)
+):
+    """ETag 는 영화의 버전입니다. If-None-Match 가 같으면 304 를 반환합니다."""
+    movie = await movies.get_by_id(movie_id)
     if movie is None:
-        raise HTTPException(status_code=404)
-    return movie
+        raise HTTPException(status_code=404, detail="Movie not found")
+    tag = etag(movie.version)
+    if is_not_modified(if_none_match, tag):
+        return not_modified(tag)
+    set_cache_headers(response, tag)
+    return render(response, movie, movie_encoder.one)
 
 
-@movie_router.patch('/{movie_id}', response_model=MovieResponse, status_code=200)
-async def edit_movie(data: MovieUpdateRequest, movie_id: int = Path(gt=0)):
-    movie = MovieModel.get(id=movie_id)
+@movie_router.put("/{movie_id}", response_model=MovieRead, status_code=status.HTTP_200_OK)
+async def update_movie(
+        response: Response,
+        movie_id: int = Path(..., gt=0),
+        movie_update_data: MovieUpdate = ...,
+        if_match: Optional[str] = Header(None),
+        movies: MovieRepository = Depends(get_movie_repository)
+):
+    """If-Match 헤더(ETag)를 주면 그 버전일 때만 고치고, 그 사이 다른 요청이 고쳤다면 412 를 반환합니다."""
+    try:
+        movie = await movies.update(
+            movie_id,
+            title=movie_update_data.title,
+            playtime=movie_update_data.playtime,
+            genre=movie_update_data.genre,
+            expected_version=parse_if_match(if_match),
+        )
+    except VersionConflict as error:
+        raise precondition_failed(error)
     if movie is None:
-        raise HTTPException(status_code=404)
-    movie.update(**data.model_dump())
+        raise HTTPException(status_code=404, detail="Movie not found")
+    set_etag(response, movie.version)
     return movie
 
 
-@movie_router.delete('/{movie_id}', status_code=204)
-async def delete_movie(movie_id: int = Path(gt=0)):
-    movie = MovieModel.get(id=movie_id)
+@movie_router.patch("/{movie_id}", response_model=MovieRead, status_code=status.HTTP_200_OK)
+async def patch_movie(
+        response: Response,
+        movie_id: int = Path(..., gt=0),
+        movie_patch_data: MoviePatch = ...,
+        if_match: Optional[str] = Header(None),
+        movies: MovieRepository = Depends(get_movie_repository)
+):
+    """보낸 필드만 고칩니다. If-Match 가 없으면 읽은 시점의 버전으로 확인해, 그 사이의 변경을 덮어쓰지 않습니다."""
+    movie = await movies.get_by_id(movie_id)
+    if movie is None:
+        raise HTTPException(status_code=404, detail="Movie not found")
+    fields = {"title": movie.title, "playtime": movie.playtime, "genre": movie.genre}
+    fields.update(movie_patch_data.model_dump(exclude_unset=True, exclude_none=True))
+    expected_version = parse_if_match(if_match)
+    try:
+        movie = await movies.update(
+            movie_id,
+            **fields,
+            expected_version=movie.version if expected_version is None else expected_version,
+        )
+    except VersionConflict as error:
+        raise precondition_failed(error)
     if movie is None:
-        raise HTTPException(status_code=404)
-    movie.delete()
-    return
\ No newline at end of file
+        raise HTTPException(status_code=404, detail="Movie not found")
+    set_etag(response, movie.version)
+    return movie
+
+
+@movie_router.delete("/{movie_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_movie(movie_id: int = Path(..., gt=0), movies: MovieRepository = Depends(get_movie_repository)):
+    if not await movies.delete(movie_id):
+        raise HTTPException(status_code=404, detail="Movie not found")
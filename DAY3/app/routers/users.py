@@ -1,11 +1,25 @@
-from datetime import datetime, timezone
-from typing import List, Dict
-from fastapi import APIRouter, HTTPException, Path, Depends, status
+from typing import List, Dict, Optional
+from fastapi import APIRouter, HTTPException, Header, Path, Query, Depends, Request, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
-from app.models.users import UserModel
-from app.schemas.users import UserCreate, UserRead, UserUpdate, UserSearch
+from app.models.concurrency import VersionConflict
+from app.repositories import UserRepository, get_user_repository
+from app.schemas.batch import BatchGetRequest, UserBatch
+from app.schemas.bulk import BulkDeleteResult, BulkResult, BulkUpdateResult
+from app.schemas.users import UserBulkUpdate, UserCreate, UserRead, UserUpdate, UserSearch
+from app.schemas.pagination import PageParams
+from app.schemas.stats import UserStats
 from app.schemas.token import Token
+from app.utils.bulk import process_bulk, process_bulk_delete, process_bulk_update
+from app.utils.change_feed import change_stream, user_changes
+from app.utils.etag import (etag, is_not_modified, not_modified, parse_if_match, precondition_failed, set_cache_headers,
+                            set_etag)
+from app.utils.export import ExportFormat, stream_export
 from app.utils.jwt import create_access_token, get_current_user
+from app.utils.login_buffer import last_login_buffer
+from app.utils.pagination import decode_cursor, paginate
+from app.utils.rate_limit import login_guard
+from app.utils.response_cache import user_search_cache
+from app.utils.serializers import batch_result, render, user_encoder
 
 # APIRouter 인스턴스를 생성하고, 경로 prefix와 태그를 설정합니다.
 router = APIRouter(
@@ -15,8 +29,8 @@ router = APIRouter(
 
 
 @router.post("/", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-async def create_user(user_data: UserCreate):
-    new_user = UserModel.create(
+async def create_user(user_data: UserCreate, users: UserRepository = Depends(get_user_repository)):
+    new_user = await users.create(
         username=user_data.username,
         password=user_data.password,
         age=user_data.age,
@@ -30,54 +44,172 @@ async def create_user(user_data: UserCreate):
     return new_user
 
 
+@router.post("/bulk", response_model=BulkResult, status_code=status.HTTP_200_OK)
+async def bulk_create_users(request: Request, users: UserRepository = Depends(get_user_repository)):
+    """JSON 배열 또는 NDJSON(application/x-ndjson) 으로 여러 유저를 한 번에 등록합니다."""
+    return await process_bulk(request, UserCreate, users.create_many, lambda user: user["id"],
+                              conflict_detail="User with this username already exists.")
+
+
+@router.put("/bulk", response_model=BulkUpdateResult, status_code=status.HTTP_200_OK)
+async def bulk_update_users(request: Request, users: UserRepository = Depends(get_user_repository)):
+    """JSON 배열 또는 NDJSON 으로 여러 유저를 한 번에 고칩니다. 항목은 id 와 고칠 필드, (선택) version 입니다."""
+    return await process_bulk_update(request, UserBulkUpdate, users.update_many, lambda user: user["version"],
+                                     not_found_detail="User not found")
+
+
+@router.post("/bulk-delete", response_model=BulkDeleteResult, status_code=status.HTTP_200_OK)
+async def bulk_delete_users(request: Request, users: UserRepository = Depends(get_user_repository)):
+    """JSON 배열 또는 NDJSON 의 {"id": ...} 항목으로 여러 유저를 한 번에 지웁니다."""
+    return await process_bulk_delete(request, users.delete_many, not_found_detail="User not found")
+
+
+@router.post("/batch-get", response_model=UserBatch, status_code=status.HTTP_200_OK)
+async def batch_get_users(
+        response: Response,
+        batch: BatchGetRequest,
+        users: UserRepository = Depends(get_user_repository)
+):
+    """여러 유저를 id 로 한 번에 조회합니다. 요청한 순서대로 반환하고, 없는 id 는 missing 에 담습니다."""
+    ids = list(dict.fromkeys(batch.ids))  # 같은 id 는 한 번만
+    return render(response, batch_result(ids, await users.get_many(ids)), user_encoder.batch)
+
+
 @router.get("/", response_model=List[UserRead], status_code=status.HTTP_200_OK)
-async def get_all_users():
-    users = UserModel.all()
-    if not users:
+async def get_all_users(
+        response: Response,
+        page: PageParams = Depends(),
+        users: UserRepository = Depends(get_user_repository)
+):
+    page_users = await users.page(after_id=decode_cursor(page.cursor), limit=page.limit + 1)
+    if not page_users:
         raise HTTPException(status_code=404, detail="User not found")
-    return users
+    return render(response, paginate(response, page_users, page.limit, lambda user: user["id"]), user_encoder.many)
+
+
+@router.get("/export", status_code=status.HTTP_200_OK)
+async def export_users(fmt: str = ExportFormat, users: UserRepository = Depends(get_user_repository)):
+    """전체 유저 목록을 NDJSON 또는 CSV 로 스트리밍합니다. (hashed_password 제외)"""
+    return stream_export(
+        "users",
+        lambda after_id, limit: users.page(after_id=after_id, limit=limit),
+        lambda user: user["id"],
+        user_encoder.row,
+        user_encoder.fields,
+        fmt,
+    )
+
+
+@router.get("/stats", response_model=UserStats, status_code=status.HTTP_200_OK)
+async def get_user_stats(
+        bin_size: int = Query(10, ge=1, le=100, description="나이 구간 크기"),
+        users: UserRepository = Depends(get_user_repository)
+):
+    """성별 나이 분포."""
+    return await users.stats(bin_size)
+
+
+@router.get("/changes", status_code=status.HTTP_200_OK)
+async def stream_user_changes(
+        after: Optional[int] = Query(None, ge=0, description="이 순번 다음 변경부터 받습니다. 없으면 지금부터 받습니다."),
+        last_event_id: Optional[str] = Header(None)
+):
+    """유저 create / update / delete 를 server-sent events 로 보냅니다. (/movies/changes 와 같은 형식, last_login 변경 제외)"""
+    return change_stream(user_changes, after, last_event_id)
 
 
 @router.get("/me", response_model=UserRead, status_code=status.HTTP_200_OK)
-async def read_users_me(current_user: Dict = Depends(get_current_user)):
-    return current_user
+async def read_users_me(response: Response, current_user: Dict = Depends(get_current_user)):
+    # 아직 쓰기 버퍼에 있는 last_login 도 자기 정보에는 바로 보이게 합니다.
+    last_login = last_login_buffer.pending(current_user["id"])
+    if last_login is not None:
+        current_user = {**current_user, "last_login": last_login}
+    return render(response, current_user, user_encoder.one)
+
+
+@router.get("/{user_id}", response_model=UserRead, status_code=status.HTTP_200_OK)
+async def get_user_by_id(
+        response: Response,
+        user_id: int = Path(..., gt=0),
+        if_none_match: Optional[str] = Header(None),
+        users: UserRepository = Depends(get_user_repository)
+):
+    user = await users.get_by_id(user_id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    tag = etag(user["version"])
+    if is_not_modified(if_none_match, tag):
+        return not_modified(tag)
+    set_cache_headers(response, tag)
+    return render(response, user, user_encoder.one)
 
 
 @router.put("/{user_id}", response_model=UserRead, status_code=status.HTTP_200_OK)
+@router.patch("/{user_id}", response_model=UserRead, status_code=status.HTTP_200_OK)
 async def update_user(
+        response: Response,
         user_id: int = Path(..., gt=0),
-        user_update_data: UserUpdate = ...
+        user_update_data: UserUpdate = ...,
+        if_match: Optional[str] = Header(None),
+        users: UserRepository = Depends(get_user_repository)
 ):
-    user = UserModel.get_by_id(user_id)
+    """보낸 필드만 고칩니다. If-Match 헤더(ETag)를 주면 그 버전일 때만 고치고, 아니면 412 를 반환합니다."""
+    try:
+        user = await users.update(user_id, user_update_data, expected_version=parse_if_match(if_match))
+    except VersionConflict as error:
+        raise precondition_failed(error)
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
-    user.update(user_update_data)
+    set_etag(response, user["version"])
     return user
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_user(user_id: int = Path(..., gt=0)):
-    user = UserModel.get_by_id(user_id)
-    if user is None:
+async def delete_user(user_id: int = Path(..., gt=0), users: UserRepository = Depends(get_user_repository)):
+    if not await users.delete(user_id):
         raise HTTPException(status_code=404, detail="User not found")
-    UserModel.delete(user_id)
 
 
 @router.get("/search/", response_model=List[UserRead], status_code=status.HTTP_200_OK)
-async def search_users(params: UserSearch = Depends()):
-    users = UserModel.search(
+async def search_users(
+        response: Response,
+        params: UserSearch = Depends(),
+        page: PageParams = Depends(),
+        users: UserRepository = Depends(get_user_repository)
+):
+    after_id = decode_cursor(page.cursor)
+    # 빈 값(username="", age=0)은 조건이 없는 것과 같으므로 캐시 키에서도 None 으로 맞춥니다.
+    query = (params.username or None, params.age or None, params.gender or None, params.min_age, params.max_age,
+             after_id, page.limit)
+    version = await users.version()
+    cached = user_search_cache.get(query, version)
+    if cached is not None:
+        return cached
+
+    found = await users.search(
         username=params.username,
         age=params.age,
-        gender=params.gender
+        gender=params.gender,
+        min_age=params.min_age,
+        max_age=params.max_age,
+        after_id=after_id,
+        limit=page.limit + 1
     )
-    if not users:
+    if not found:
         raise HTTPException(status_code=404, detail="User not found")
-    return users
+    return user_search_cache.render(query, version, response,
+                                    paginate(response, found, page.limit, lambda user: user["id"]), user_encoder)
 
 
 @router.post("/login", response_model=Token, status_code=status.HTTP_200_OK)
-async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
-    user = UserModel.authenticate(form_data.username, form_data.password)
+async def login_for_access_token(
+        request: Request,
+        form_data: OAuth2PasswordRequestForm = Depends(),
+        users: UserRepository = Depends(get_user_repository)
+):
+    # 유저명 / IP 별 시도 횟수를 bcrypt 검증 전에 확인합니다. (한도를 넘으면 429)
+    login_guard.check(form_data.username, request.client.host if request.client else "unknown")
+    user = await users.authenticate(form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -85,8 +217,12 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # 마지막 로그인 시간을 업데이트합니다.
-    user["last_login"] = datetime.now(timezone.utc)
+    login_guard.succeeded(form_data.username)
+    # 마지막 로그인 시간을 업데이트합니다. 쓰기 버퍼가 동작 중이면 모아서 나중에 한 번에 씁니다.
+    if last_login_buffer.running:
+        last_login_buffer.record(user["id"])
+    else:
+        await users.record_login(user)
 
     # JWT 토큰을 생성합니다.
     access_token = create_access_token(data={"user_id": str(user["id"])})
@@ -0,0 +1,2 @@
+# 정수 필드의 상한. 인덱스가 값을 array('q')(64비트 정수)에 담으므로 이 범위를 넘는 값은 받지 않습니다.
+INT64_MAX = 2 ** 63 - 1
@@ -0,0 +1,21 @@
+import os
+from typing import List
+from pydantic import BaseModel, Field, PositiveInt
+from app.schemas.movies import MovieRead
+from app.schemas.users import UserRead
+
+# 요청 하나에 조회할 수 있는 최대 id 수
+BATCH_GET_MAX_IDS = int(os.getenv("BATCH_GET_MAX_IDS", "1000"))
+
+# 여러 id 를 한 번에 조회하는 요청 (POST /movies/batch-get, /users/batch-get)
+class BatchGetRequest(BaseModel):
+    ids: List[PositiveInt] = Field(..., min_length=1, max_length=BATCH_GET_MAX_IDS)
+
+# 찾은 항목은 요청한 id 순서대로, 없는 id 는 missing 에 담습니다.
+class MovieBatch(BaseModel):
+    items: List[MovieRead]
+    missing: List[int]
+
+class UserBatch(BaseModel):
+    items: List[UserRead]
+    missing: List[int]
@@ -0,0 +1,30 @@
+from typing import Any, List, Optional
+from pydantic import BaseModel, Field
+
+# 대량 등록 / 수정 / 삭제 요청의 항목별 처리 결과
+class BulkItemResult(BaseModel):
+    index: int
+    status: int
+    id: Optional[int] = None
+    # 수정한 뒤의 버전, 412 면 현재 버전
+    version: Optional[int] = None
+    detail: Optional[Any] = None
+
+class BulkResult(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkItemResult]
+
+class BulkUpdateResult(BaseModel):
+    updated: int
+    failed: int
+    results: List[BulkItemResult]
+
+class BulkDeleteResult(BaseModel):
+    deleted: int
+    failed: int
+    results: List[BulkItemResult]
+
+# 대량 삭제 요청의 항목
+class BulkDeleteItem(BaseModel):
+    id: int = Field(gt=0)
@@ -1,9 +1,10 @@
 from pydantic import BaseModel, Field
 from typing import Optional
+from app.schemas import INT64_MAX
 
 class MovieCreate(BaseModel):
     title: str
-    playtime: int
+    playtime: int = Field(..., gt=0, le=INT64_MAX)
     genre: str
 
 class MovieRead(BaseModel):
@@ -15,9 +16,22 @@ class MovieRead(BaseModel):
 class MovieSearch(BaseModel):
     title: Optional[str] = None
     genre: Optional[str] = None
+    min_playtime: Optional[int] = Field(None, gt=0)
+    max_playtime: Optional[int] = Field(None, gt=0)
 
 # 영화 정보 업데이트 요청에 사용되는 모델
 class MovieUpdate(BaseModel):
     title: str
-    playtime: int = Field(gt=0)
-    genre: str
\ No newline at end of file
+    playtime: int = Field(gt=0, le=INT64_MAX)
+    genre: str
+
+# 일부 필드만 고치는 요청 (PATCH)
+class MoviePatch(BaseModel):
+    title: Optional[str] = None
+    playtime: Optional[int] = Field(None, gt=0, le=INT64_MAX)
+    genre: Optional[str] = None
+
+# 대량 수정 요청의 항목. version 을 주면 If-Match 처럼 그 버전일 때만 고칩니다.
+class MovieBulkUpdate(MovieUpdate):
+    id: int = Field(gt=0)
+    version: Optional[int] = None
@@ -0,0 +1,21 @@
+from typing import Dict
+from pydantic import BaseModel
+
+# 통계 응답 모델 (/movies/stats, /users/stats)
+class GenreStats(BaseModel):
+    count: int
+    total_playtime: int
+    avg_playtime: float
+    p50_playtime: int
+    p90_playtime: int
+    p99_playtime: int
+
+class MovieStats(BaseModel):
+    count: int
+    genres: Dict[str, GenreStats]
+
+class UserStats(BaseModel):
+    count: int
+    bin_size: int
+    # 성별 -> {"20-29": 유저 수, ...}
+    age_histogram: Dict[str, Dict[str, int]]
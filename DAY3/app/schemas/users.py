@@ -1,11 +1,12 @@
 from typing import Optional
 from datetime import datetime
 from pydantic import BaseModel, Field
+from app.schemas import INT64_MAX
 
 class UserCreate(BaseModel):
     username: str = Field(..., min_length=1, max_length=50)
     password: str = Field(..., min_length=8)
-    age: int = Field(..., gt=0)
+    age: int = Field(..., gt=0, le=INT64_MAX)
     gender: str = Field(..., pattern="^(male|female|other)$")
 
 class UserRead(BaseModel):
@@ -17,7 +18,7 @@ class UserRead(BaseModel):
 
 class UserUpdate(BaseModel):
     password: Optional[str] = Field(None, min_length=8)
-    age: Optional[int] = Field(None, gt=0)
+    age: Optional[int] = Field(None, gt=0, le=INT64_MAX)
     gender: Optional[str] = Field(None, pattern="^(male|female|other)$")
     last_login: Optional[datetime] = None
 
@@ -25,3 +26,10 @@ class UserSearch(BaseModel):
     username: Optional[str] = None
     age: Optional[int] = None
     gender: Optional[str] = None
+    min_age: Optional[int] = Field(None, gt=0)
+    max_age: Optional[int] = Field(None, gt=0)
+
+# 대량 수정 요청의 항목. 보낸 필드만 고치고, version 을 주면 If-Match 처럼 그 버전일 때만 고칩니다.
+class UserBulkUpdate(UserUpdate):
+    id: int = Field(gt=0)
+    version: Optional[int] = None
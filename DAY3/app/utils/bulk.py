@@ -0,0 +1,169 @@
+import json
+import os
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Tuple, Type
+from fastapi import HTTPException, Request, status
+from pydantic import BaseModel, ValidationError
+from app.models.concurrency import VersionConflict
+from app.schemas.bulk import BulkDeleteItem
+
+# 한 번에 검증하고 저장하는 항목 수 / 요청 하나에 허용하는 최대 항목 수
+BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", "1000"))
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "100000"))
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+class _InvalidJson:
+    """NDJSON 에서 파싱하지 못한 줄."""
+
+
+class _TooMany:
+    """NDJSON 에서 BULK_MAX_ITEMS 를 넘은 줄. 앞 묶음은 이미 저장됐으므로 요청 전체를 413 으로 끝내지 않고 항목별 413 으로 돌려줍니다."""
+
+
+_TOO_MANY = _TooMany()
+
+
+async def read_bulk_items(request: Request) -> AsyncIterator[List[Tuple[int, Any]]]:
+    """JSON 배열 또는 NDJSON 본문을 (index, item) 묶음 단위로 읽습니다.
+
+    NDJSON 은 본문 전체를 기다리지 않고 도착하는 대로 한 줄씩 처리합니다.
+    JSON 배열은 항목 수를 먼저 확인하므로, 한도를 넘으면 아무것도 저장하지 않고 413 입니다.
+    NDJSON 은 한도를 넘은 줄을 파싱하지 않고 _TOO_MANY 로 넘깁니다. (항목별 413)
+    """
+    batch: List[Tuple[int, Any]] = []
+    count = 0
+
+    def add(item: Any) -> None:
+        nonlocal count
+        batch.append((count, item))
+        count += 1
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type in NDJSON_MEDIA_TYPES:
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    add(_parse_line(line) if count < BULK_MAX_ITEMS else _TOO_MANY)
+            if len(batch) >= BULK_BATCH_SIZE:
+                yield batch
+                batch = []
+        if buffer.strip():
+            add(_parse_line(buffer) if count < BULK_MAX_ITEMS else _TOO_MANY)
+    else:
+        try:
+            items = json.loads(await request.body())
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON body")
+        if not isinstance(items, list):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Expected a JSON array")
+        if len(items) > BULK_MAX_ITEMS:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                                detail=f"Too many items. Maximum is {BULK_MAX_ITEMS}.")
+        for item in items:
+            add(item)
+            if len(batch) >= BULK_BATCH_SIZE:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def _parse_line(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError:
+        return _InvalidJson()
+
+
+async def process_bulk(
+        request: Request,
+        schema: Type[BaseModel],
+        create_many: Callable[[List[Dict]], Awaitable[List[Any]]],
+        get_id: Callable[[Any], int],
+        conflict_detail: str,
+) -> Dict:
+    """묶음마다 항목을 검증하고, 통과한 항목만 create_many 로 한 번에 저장합니다."""
+    async def apply(items: List[Dict]) -> List[Dict]:
+        return [{"status": status.HTTP_409_CONFLICT, "detail": conflict_detail} if record is None
+                else {"status": status.HTTP_201_CREATED, "id": get_id(record)}
+                for record in await create_many(items)]
+
+    return await _process_batches(request, schema, apply, status.HTTP_201_CREATED, "created")
+
+
+async def process_bulk_update(
+        request: Request,
+        schema: Type[BaseModel],
+        update_many: Callable[[List[Dict]], Awaitable[List[Any]]],
+        get_version: Callable[[Any], int],
+        not_found_detail: str,
+) -> Dict:
+    """묶음마다 항목을 검증하고, 통과한 항목만 update_many 로 한 번에 고칩니다. (보낸 필드만 고칩니다)
+
+    항목의 version 이 현재 버전과 다르면 그 항목만 412 이고, 결과의 version 으로 현재 버전을 알려줍니다.
+    """
+    async def apply(items: List[Dict]) -> List[Dict]:
+        outcomes = []
+        for item, result in zip(items, await update_many(items)):
+            if result is None:
+                outcomes.append({"status": status.HTTP_404_NOT_FOUND, "id": item["id"], "detail": not_found_detail})
+            elif isinstance(result, VersionConflict):
+                outcomes.append({"status": status.HTTP_412_PRECONDITION_FAILED, "id": item["id"],
+                                 "version": result.current, "detail": "Resource was modified by another request."})
+            else:
+                outcomes.append({"status": status.HTTP_200_OK, "id": item["id"], "version": get_version(result)})
+        return outcomes
+
+    return await _process_batches(request, schema, apply, status.HTTP_200_OK, "updated")
+
+
+async def process_bulk_delete(
+        request: Request,
+        delete_many: Callable[[List[int]], Awaitable[List[bool]]],
+        not_found_detail: str,
+) -> Dict:
+    """묶음마다 {"id": ...} 항목을 검증하고, 통과한 항목만 delete_many 로 한 번에 지웁니다."""
+    async def apply(items: List[Dict]) -> List[Dict]:
+        ids = [item["id"] for item in items]
+        return [{"status": status.HTTP_204_NO_CONTENT, "id": item_id} if deleted
+                else {"status": status.HTTP_404_NOT_FOUND, "id": item_id, "detail": not_found_detail}
+                for item_id, deleted in zip(ids, await delete_many(ids))]
+
+    return await _process_batches(request, BulkDeleteItem, apply, status.HTTP_204_NO_CONTENT, "deleted")
+
+
+async def _process_batches(
+        request: Request,
+        schema: Type[BaseModel],
+        apply: Callable[[List[Dict]], Awaitable[List[Dict]]],
+        success_status: int,
+        success_key: str,
+) -> Dict:
+    results = []
+    async for batch in read_bulk_items(request):
+        valid, indexes = [], []
+        for index, item in batch:
+            if item is _TOO_MANY:
+                results.append({"index": index, "status": status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                                "detail": f"Too many items. Maximum is {BULK_MAX_ITEMS}."})
+                continue
+            if isinstance(item, _InvalidJson):
+                results.append({"index": index, "status": status.HTTP_400_BAD_REQUEST, "detail": "Invalid JSON"})
+                continue
+            try:
+                # 보낸 필드만 넘깁니다. (대량 수정은 PATCH 처럼 보낸 필드만 고칩니다)
+                valid.append(schema.model_validate(item).model_dump(exclude_unset=True))
+                indexes.append(index)
+            except ValidationError as error:
+                results.append({"index": index, "status": 422,
+                                "detail": error.errors(include_url=False, include_context=False)})
+        if valid:
+            for index, outcome in zip(indexes, await apply(valid)):
+                results.append({"index": index, **outcome})
+
+    results.sort(key=lambda result: result["index"])
+    succeeded = sum(1 for result in results if result["status"] == success_status)
+    return {success_key: succeeded, "failed": len(results) - succeeded, "results": results}
@@ -0,0 +1,228 @@
+import asyncio
+import os
+from collections import deque
+from itertools import islice
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Set
+
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from app.models.movies import MovieModel
+from app.models.users import UserModel
+from app.utils.serializers import dumps, movie_encoder, user_encoder
+
+# 이어 받기(resume)용으로 기억하는 최근 변경 수. 0 이면 구독자가 없을 때 변경마다 프레임을 만들지 않습니다.
+CHANGE_FEED_HISTORY = int(os.getenv("CHANGE_FEED_HISTORY", "10000"))
+# 구독자 하나에 밀려 있을 수 있는 최대 변경 수. 넘으면 그 구독자에게 resync 를 보내고 연결을 끊습니다.
+CHANGE_FEED_SUBSCRIBER_BUFFER = int(os.getenv("CHANGE_FEED_SUBSCRIBER_BUFFER", "1000"))
+CHANGE_FEED_MAX_SUBSCRIBERS = int(os.getenv("CHANGE_FEED_MAX_SUBSCRIBERS", "1000"))
+# 변경이 없을 때 연결 유지용 주석(: keep-alive)을 보내는 간격(초)
+CHANGE_FEED_HEARTBEAT_SECONDS = float(os.getenv("CHANGE_FEED_HEARTBEAT_SECONDS", "15"))
+
+EVENTS = ("create", "update", "delete")
+
+
+class Change:
+    """순번이 붙은 변경 하나. SSE 프레임을 발행할 때 한 번만 만들고, 모든 구독자가 같은 객체를 공유합니다."""
+
+    __slots__ = ("seq", "event", "id", "frame")
+
+    def __init__(self, seq: int, event: str, id: int, frame: bytes):
+        self.seq = seq
+        self.event = event
+        self.id = id
+        self.frame = frame
+
+
+def _frame(seq: int, event: str, data: Any) -> bytes:
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (seq, event.encode(), dumps(data))
+
+
+class Subscription:
+    """구독자 하나의 대기열. 최대 maxsize 개까지 쌓이고, 넘으면 resync 상태가 됩니다."""
+
+    def __init__(self, start: int, backlog: List[Change], maxsize: int, resync: Optional[str] = None):
+        self.start = start
+        self.maxsize = maxsize
+        # 이어 받기로 처음 보내는 변경은 한도와 별개입니다.
+        self._limit = maxsize + len(backlog)
+        self._queue: Deque[Change] = deque(backlog)
+        self._wakeup = asyncio.Event()
+        self.resync = resync
+
+    def push(self, change: Change) -> bool:
+        """대기열이 가득 찼으면 비우고 False 를 반환합니다. (구독 해제 대상)"""
+        if len(self._queue) >= self._limit:
+            self._queue.clear()
+            self.resync = "overflow"
+            self._wakeup.set()
+            return False
+        self._queue.append(change)
+        self._wakeup.set()
+        return True
+
+    def drain(self) -> List[Change]:
+        changes = list(self._queue)
+        self._queue.clear()
+        self._limit = self.maxsize
+        return changes
+
+    async def wait(self, timeout: float) -> List[Change]:
+        """변경이 올 때까지 최대 timeout 초 기다린 뒤, 그동안 쌓인 변경을 모두 꺼냅니다."""
+        if not self._queue and self.resync is None:
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.drain()
+
+
+class ChangeFeed:
+    """모델의 create / update / delete 를 순번과 함께 구독자에게 보내는 변경 피드.
+
+    최근 history 개의 변경을 기억해 두므로, 연결이 끊긴 구독자는 마지막으로 받은 순번부터 이어 받을 수 있습니다.
+    더 오래된 순번이거나 대기열이 넘친 구독자에게는 resync 이벤트를 보냅니다. (목록을 다시 읽고 그 순번부터 이어 받기)
+    shared 모드의 워커는 저장소 프로세스가 순번을 붙인 변경을 그대로 받습니다. (follow)
+    """
+
+    def __init__(self, name: str, encode: Callable[[Any], Dict], get_id: Callable[[Any], int],
+                 history: int = CHANGE_FEED_HISTORY, buffer: int = CHANGE_FEED_SUBSCRIBER_BUFFER,
+                 max_subscribers: int = CHANGE_FEED_MAX_SUBSCRIBERS):
+        self.name = name
+        self.encode = encode
+        self.get_id = get_id
+        self.buffer = buffer
+        self.max_subscribers = max_subscribers
+        self.seq = 0
+        self.following = False
+        self._history: Deque[Change] = deque(maxlen=history)
+        self._subscribers: Set[Subscription] = set()
+        self._listeners: List[Callable[[str, Change], None]] = []
+        # 지표
+        self.published = 0
+        self.resyncs = 0
+
+    def add_listener(self, listener: Callable[[str, Change], None]) -> None:
+        """발행된 변경마다 (피드 이름, Change) 로 호출됩니다. (공유 저장소가 워커에 전달)"""
+        self._listeners.append(listener)
+
+    def on_change(self, event: str, record: Any) -> None:
+        """모델 변경 알림 listener."""
+        if self.following or event not in EVENTS:
+            return
+        record_id = self.get_id(record)
+        self.seq += 1
+        if not self._history.maxlen and not self._subscribers and not self._listeners:
+            return  # 기억할 곳도 받을 구독자도 없으면 프레임을 만들지 않습니다.
+        data = {"id": record_id} if event == "delete" else self.encode(record)
+        change = Change(self.seq, event, record_id, _frame(self.seq, event, data))
+        self._append(change)
+        for listener in self._listeners:
+            listener(self.name, change)
+
+    def follow(self, seq: int) -> None:
+        """저장소 프로세스의 피드를 따라갑니다. seq 는 저장소의 현재 순번입니다."""
+        self.following = True
+        if seq != self.seq:
+            self._history.clear()
+            self.seq = seq
+
+    def ingest(self, change: Change) -> None:
+        """저장소 프로세스가 보낸 변경 (follow 중일 때)."""
+        if change.seq <= self.seq:
+            return
+        self.seq = change.seq
+        self._append(change)
+
+    def _append(self, change: Change) -> None:
+        self.published += 1
+        self._history.append(change)
+        overflowed = [subscriber for subscriber in self._subscribers if not subscriber.push(change)]
+        for subscriber in overflowed:
+            self._subscribers.discard(subscriber)
+            self.resyncs += 1
+
+    @property
+    def full(self) -> bool:
+        return len(self._subscribers) >= self.max_subscribers
+
+    def subscribe(self, after: Optional[int] = None) -> Subscription:
+        """after 순번 다음 변경부터 받는 구독. after 가 없으면 지금부터 받습니다."""
+        if after is None:
+            after = self.seq
+        missed = self.seq - after
+        if missed < 0 or missed > len(self._history):
+            # 기억하는 범위보다 오래됐거나, 서버가 재시작해 순번이 되돌아간 경우
+            self.resyncs += 1
+            return Subscription(after, [], self.buffer, resync="expired")
+        backlog = list(islice(self._history, len(self._history) - missed, None)) if missed else []
+        subscription = Subscription(after, backlog, self.buffer)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def close(self) -> None:
+        """종료할 때 열려 있는 스트림을 모두 끝냅니다."""
+        for subscription in self._subscribers:
+            subscription.resync = "shutdown"
+            subscription._wakeup.set()
+        self._subscribers.clear()
+
+    def stats(self) -> Dict:
+        return {
+            "seq": self.seq,
+            "history": len(self._history),
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "resyncs": self.resyncs,
+        }
+
+
+async def _stream(feed: ChangeFeed, after: Optional[int], heartbeat: float) -> AsyncIterator[bytes]:
+    # 구독과 첫 전송 사이에 await 가 없으므로 그 사이의 변경은 대기열에 들어갑니다.
+    subscription = feed.subscribe(after)
+    try:
+        # ready 의 id 는 이어 받는 위치입니다. (EventSource 가 재연결할 때 Last-Event-ID 로 보냅니다)
+        frames = [] if subscription.resync else [_frame(subscription.start, "ready", {"seq": subscription.start})]
+        frames.extend(change.frame for change in subscription.drain())
+        while True:
+            if subscription.resync == "shutdown":
+                yield b"".join(frames)
+                return
+            if subscription.resync is not None:
+                # id 를 현재 순번으로 보내므로, 목록을 다시 읽은 클라이언트는 여기서부터 이어 받으면 됩니다.
+                frames.append(_frame(feed.seq, "resync", {"seq": feed.seq, "reason": subscription.resync}))
+                yield b"".join(frames)
+                return
+            # 대기열에 쌓인 변경은 한 번에 보냅니다. 변경이 없으면 연결 유지용 주석을 보냅니다.
+            yield b"".join(frames) if frames else b": keep-alive\n\n"
+            frames = [change.frame for change in await subscription.wait(heartbeat)]
+    finally:
+        feed.unsubscribe(subscription)
+
+
+def change_stream(feed: ChangeFeed, after: Optional[int], last_event_id: Optional[str]) -> StreamingResponse:
+    """변경 피드를 server-sent events 로 보내는 응답. after 가 없으면 Last-Event-ID 헤더부터 이어 받습니다."""
+    if after is None and last_event_id is not None and last_event_id.isdigit():
+        after = int(last_event_id)
+    if feed.full:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail="Too many change feed subscribers.")
+    return StreamingResponse(
+        _stream(feed, after, CHANGE_FEED_HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+movie_changes = ChangeFeed("movies", lambda movie: {**movie_encoder.row(movie), "version": movie.version},
+                           lambda movie: movie.id)
+user_changes = ChangeFeed("users", lambda user: {**user_encoder.row(user), "version": user["version"]},
+                          lambda user: user["id"])
+change_feeds = {feed.name: feed for feed in (movie_changes, user_changes)}
+
+MovieModel.add_listener(movie_changes.on_change)
+UserModel.add_listener(user_changes.on_change)
@@ -0,0 +1,107 @@
+import hashlib
+import os
+import secrets
+from array import array
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable, Optional, Tuple
+from fastapi import HTTPException, Response, status
+from app.models.concurrency import VersionConflict
+
+# 조회 응답의 Cache-Control. 기본값 no-cache 는 "저장해도 되지만 쓰기 전에 ETag 로 재검증" 입니다.
+CACHE_CONTROL = os.getenv("CACHE_CONTROL", "no-cache")
+# 쿼리별 목록 ETag 를 기억하는 개수
+LIST_ETAG_CACHE_SIZE = int(os.getenv("LIST_ETAG_CACHE_SIZE", "1024"))
+# ETag 앞에 붙이는 세대(epoch). 메모리 저장소는 재시작하면 버전이 1 부터 다시 시작하므로, 재시작 전의 ETag 가
+# 다른 내용에 304 / If-Match 로 맞지 않도록 프로세스마다 새로 정합니다.
+# 버전이 유지되는 저장소(SQLite, STORAGE_DIR)에서 워커끼리 ETag 를 맞추려면 같은 값을 지정합니다.
+ETAG_EPOCH = os.getenv("ETAG_EPOCH") or secrets.token_hex(4)
+
+
+def etag(version: int) -> str:
+    return f'"{ETAG_EPOCH}-{version}"'
+
+
+def set_etag(response: Response, version: int) -> None:
+    response.headers["ETag"] = etag(version)
+
+
+def set_cache_headers(response: Response, tag: str) -> None:
+    response.headers["ETag"] = tag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def is_not_modified(if_none_match: Optional[str], tag: str) -> bool:
+    """If-None-Match 헤더(쉼표로 구분된 ETag 목록 또는 "*")에 tag 가 있는지 확인합니다. (약한 비교)"""
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == tag for candidate in if_none_match.split(","))
+
+
+def not_modified(tag: str) -> Response:
+    """본문 없는 304 응답. 직렬화를 전혀 하지 않습니다."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": tag, "Cache-Control": CACHE_CONTROL})
+
+
+def list_etag(records: Iterable, key: Callable[[object], Tuple[int, int]]) -> str:
+    """목록 ETag: 응답에 들어가는 레코드의 (id, version) 으로 만듭니다.
+
+    컬렉션의 다른 레코드가 바뀌어도 이 목록의 내용이 같으면 ETag 도 같습니다.
+    """
+    pairs = array("q")
+    for record in records:
+        pairs.extend(key(record))
+    return f'"{ETAG_EPOCH}-{hashlib.blake2b(pairs.tobytes(), digest_size=8).hexdigest()}"'
+
+
+class ListETagCache:
+    """쿼리 -> (컬렉션 버전, 목록 ETag) LRU 캐시.
+
+    컬렉션 버전이 그대로면 조회 없이 ETag 를 알 수 있어, If-None-Match 가 맞으면 바로 304 를 반환합니다.
+    """
+
+    def __init__(self, size: int = LIST_ETAG_CACHE_SIZE):
+        self.size = size
+        self._entries: "OrderedDict[Hashable, Tuple[int, str]]" = OrderedDict()
+
+    def get(self, query: Hashable, version: int) -> Optional[str]:
+        entry = self._entries.get(query)
+        if entry is None or entry[0] != version:
+            return None
+        self._entries.move_to_end(query)
+        return entry[1]
+
+    def put(self, query: Hashable, version: int, tag: str) -> None:
+        self._entries[query] = (version, tag)
+        self._entries.move_to_end(query)
+        if len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+
+def parse_if_match(value: Optional[str]) -> Optional[int]:
+    """If-Match 헤더를 기대하는 레코드 버전으로 바꿉니다. 헤더가 없거나 "*" 이면 None (버전 확인 안 함).
+
+    ETag("<epoch>-<version>") 또는 버전 숫자("<version>")를 받습니다. 다른 epoch 의 ETag 는 어떤 버전과도
+    맞지 않으므로 0 (버전은 1 부터 시작)을 반환해 412 가 되게 합니다.
+    """
+    if value is None or value.strip() == "*":
+        return None
+    value = value.strip()
+    if value.startswith("W/"):
+        value = value[2:]
+    epoch, _, version = value.strip('"').rpartition("-")
+    try:
+        parsed = int(version)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid If-Match header")
+    return 0 if epoch and epoch != ETAG_EPOCH else parsed
+
+
+def precondition_failed(error: VersionConflict) -> HTTPException:
+    """다른 요청이 먼저 고친 레코드를 고치려 할 때의 응답. 현재 버전을 ETag 로 알려줍니다."""
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="Resource was modified by another request.",
+        headers={"ETag": etag(error.current)},
+    )
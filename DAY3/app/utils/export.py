@@ -0,0 +1,72 @@
+import csv
+import io
+import os
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Sequence
+from fastapi import Query
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json, to_jsonable_python
+
+# 한 번에 조회하고 직렬화하는 행 수
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "1000"))
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# 내보내기 형식 쿼리 매개변수 (?format=ndjson|csv)
+ExportFormat = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="ndjson 또는 csv")
+
+FetchPage = Callable[[int, int], Awaitable[List[Any]]]
+
+
+async def _chunks(fetch_page: FetchPage, get_id: Callable[[Any], int]) -> AsyncIterator[List[Any]]:
+    """keyset 페이지네이션으로 전체 레코드를 EXPORT_CHUNK_SIZE 개씩 읽습니다."""
+    after_id = 0
+    while True:
+        chunk = await fetch_page(after_id, EXPORT_CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
+        if len(chunk) < EXPORT_CHUNK_SIZE:
+            return
+        after_id = get_id(chunk[-1])
+
+
+async def export_rows(fetch_page: FetchPage, get_id: Callable[[Any], int],
+                      get_row: Callable[[Any], dict], fields: Sequence[str], fmt: str) -> AsyncIterator[bytes]:
+    """청크 하나를 바이트 한 덩어리로 직렬화해 내보냅니다.
+
+    값 형식(datetime 등)은 일반 JSON 응답과 같도록 pydantic 직렬화기를 사용합니다.
+    """
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        async for chunk in _chunks(fetch_page, get_id):
+            writer.writerows([_csv_value(row[field]) for field in fields] for row in map(get_row, chunk))
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+    else:
+        async for chunk in _chunks(fetch_page, get_id):
+            yield b"".join(to_json(get_row(record)) + b"\n" for record in chunk)
+
+
+def _csv_value(value: Any) -> Any:
+    # 문자열/숫자는 그대로 두고, datetime 등만 JSON 응답과 같은 문자열로 바꿉니다.
+    if value is None or type(value) in (str, int, float):
+        return value
+    return to_jsonable_python(value)
+
+
+def stream_export(name: str, fetch_page: FetchPage, get_id: Callable[[Any], int],
+                  get_row: Callable[[Any], dict], fields: Sequence[str], fmt: str) -> StreamingResponse:
+    """전체 목록을 한 번에 만들지 않고 청크 단위로 흘려보내는 응답을 만듭니다.
+
+    다음 청크는 클라이언트가 이전 청크를 받아 간 뒤에 조회하므로 메모리 사용량이 테이블 크기와 무관합니다.
+    """
+    return StreamingResponse(
+        export_rows(fetch_page, get_id, get_row, fields, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
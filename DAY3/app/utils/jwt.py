@@ -1,16 +1,32 @@
+import os
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
 from app.models.users import UserModel
+from app.repositories import UserRepository, get_user_repository
+from app.utils.metrics import dependency_duration, timed
+from app.utils.token_cache import token_cache
+from app.utils.user_cache import user_cache
 
 SECRET_KEY = "your-super-secret-key"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+# 디버그 엔드포인트(/debug/...)를 쓸 수 있는 유저명 목록 (쉼표로 구분). 비어 있으면 아무도 쓸 수 없습니다.
+ADMIN_USERNAMES = {name.strip() for name in os.getenv("ADMIN_USERNAMES", "").split(",") if name.strip()}
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+
+# 유저 정보가 바뀌거나 삭제되면 해당 유저의 캐시된 토큰을 무효화합니다.
+def _invalidate_cached_tokens(event: str, user: Dict) -> None:
+    if event in ("update", "delete"):
+        token_cache.invalidate_user(user["id"])
+
+
+UserModel.add_listener(_invalidate_cached_tokens)
+UserModel.add_listener(user_cache.on_change)
+
 def create_access_token(data: Dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     if expires_delta:
@@ -18,27 +34,55 @@ def create_access_token(data: Dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
+    from jose import jwt  # python-jose 는 처음 토큰을 만들거나 검증할 때 불러옵니다.
+
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(token: str = Depends(oauth2_scheme)):
+@timed(dependency_duration.labels("get_current_user"))
+async def get_current_user(
+        token: str = Depends(oauth2_scheme),
+        users: UserRepository = Depends(get_user_repository)
+):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: Optional[str] = payload.get("user_id")
-        if user_id is None:
+    # 이미 검증한 토큰이면 서명 검증과 JSON 파싱을 건너뜁니다.
+    user_id = token_cache.get(token)
+    if user_id is None:
+        from jose import JWTError, jwt
+
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            claim: Optional[str] = payload.get("user_id")
+            if claim is None:
+                raise credentials_exception
+            user_id = int(claim)
+        except (JWTError, ValueError):
             raise credentials_exception
-    except JWTError:
-        raise credentials_exception
+        token_cache.put(token, user_id, payload.get("exp"))
 
-    user = UserModel.get_by_id(int(user_id))
+    # 유저가 바뀌지 않았으면 저장소를 읽지 않습니다. (변경 알림이 오면 캐시에서 빠집니다)
+    user = user_cache.get(user_id)
+    if user is None:
+        generation = user_cache.generation(user_id)
+        user = await users.get_by_id(user_id)
+        if user is not None:
+            user_cache.put(user, generation)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
     return user
+
+
+async def get_admin_user(current_user: Dict = Depends(get_current_user)):
+    if current_user["username"] not in ADMIN_USERNAMES:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required",
+        )
+    return current_user
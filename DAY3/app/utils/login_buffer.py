@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+
+from app.repositories.base import UserRepository
+
+logger = logging.getLogger("app.login_buffer")
+
+# last_login 을 모아서 쓰는 간격(초). 0 이면 로그인마다 바로 씁니다.
+LAST_LOGIN_FLUSH_SECONDS = float(os.getenv("LAST_LOGIN_FLUSH_SECONDS", "1"))
+# 기다리는 유저가 이만큼 쌓이면 간격을 기다리지 않고 바로 씁니다.
+LAST_LOGIN_MAX_PENDING = int(os.getenv("LAST_LOGIN_MAX_PENDING", "10000"))
+
+
+class LastLoginBuffer:
+    """last_login 쓰기 버퍼 (write-behind).
+
+    로그인 때는 {user_id: 시각} 에만 기록하고, interval 마다(또는 max_pending 에 도달하면, 종료할 때) 저장소의
+    record_logins 로 한 번에 씁니다. 같은 유저가 그 사이 여러 번 로그인하면 마지막 시각만 한 번 씁니다.
+    비정상 종료 시 마지막 interval 동안의 last_login 은 잃을 수 있습니다.
+    """
+
+    def __init__(self, interval: float = LAST_LOGIN_FLUSH_SECONDS, max_pending: int = LAST_LOGIN_MAX_PENDING):
+        self.interval = interval
+        self.max_pending = max_pending
+        self._pending: Dict[int, datetime] = {}
+        self._users: Optional[Callable[[], UserRepository]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flushing: Optional[asyncio.Task] = None
+        # 지표
+        self.recorded = 0
+        self.coalesced = 0
+        self.flushes = 0
+        self.written = 0
+        self.failures = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self, users: Callable[[], UserRepository]) -> None:
+        """users 는 현재 유저 저장소를 반환하는 함수입니다. (get_user_repository)"""
+        if self.interval <= 0:
+            return
+        self._users = users
+        self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        task.cancel()
+        # 취소된 flush 는 묶음을 _pending 에 되돌려 놓으므로, 끝날 때까지 기다린 뒤 마지막 flush 를 합니다.
+        await asyncio.gather(task, return_exceptions=True)
+        if self._flushing is not None:
+            await asyncio.gather(self._flushing, return_exceptions=True)
+        await self.flush()
+
+    def record(self, user_id: int) -> datetime:
+        now = datetime.now(timezone.utc)
+        if user_id in self._pending:
+            self.coalesced += 1
+        self._pending[user_id] = now
+        self.recorded += 1
+        if len(self._pending) >= self.max_pending and (self._flushing is None or self._flushing.done()):
+            self._flushing = asyncio.create_task(self.flush())
+        return now
+
+    def pending(self, user_id: int) -> Optional[datetime]:
+        """아직 쓰지 않은 last_login (자기 로그인 직후의 /users/me 에 반영합니다)."""
+        return self._pending.get(user_id)
+
+    async def flush(self) -> None:
+        if not self._pending or self._users is None:
+            return
+        batch, self._pending = self._pending, {}
+        try:
+            await self._users().record_logins(batch)
+        except BaseException as error:
+            # 다음 flush 때 다시 씁니다. (종료 중 취소된 경우 포함) 그 사이 새로 로그인한 유저는 새 시각을 유지합니다.
+            for user_id, when in batch.items():
+                self._pending.setdefault(user_id, when)
+            if not isinstance(error, Exception):
+                raise
+            self.failures += 1
+            logger.exception("failed to write %d last_login updates", len(batch))
+            return
+        self.flushes += 1
+        self.written += len(batch)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    def stats(self) -> Dict:
+        return {
+            "interval_seconds": self.interval,
+            "pending": len(self._pending),
+            "recorded": self.recorded,
+            "coalesced": self.coalesced,
+            "flushes": self.flushes,
+            "written": self.written,
+            "failures": self.failures,
+        }
+
+
+last_login_buffer = LastLoginBuffer()
@@ -0,0 +1,257 @@
+import os
+import time
+from bisect import bisect_left
+from functools import wraps
+from inspect import iscoroutinefunction
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# 0 이면 미들웨어와 모델/해싱/직렬화 훅을 붙이지 않습니다.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+
+# 지연 시간 구간(초): 0.1 ms ~ 10 s
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                   10.0)
+# 응답 크기 구간(바이트)
+SIZE_BUCKETS = (128, 1024, 8192, 65536, 524288, 4194304, 33554432)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    """구간별 개수를 미리 만들어 둔 리스트에 쌓는 히스토그램.
+
+    기록은 이벤트 루프 스레드에서만 하므로 잠금을 쓰지 않습니다. (구간은 누적하지 않고, 내보낼 때 누적합니다)
+    """
+
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # 마지막 칸은 +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class Counter:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+
+class _Family:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str]):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self.children: Dict[Tuple[str, ...], object] = {}
+
+    def labels(self, *values: str):
+        child = self.children.get(values)
+        if child is None:
+            child = self.children[values] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+
+
+class HistogramFamily(_Family):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str], buckets: Tuple[float, ...]):
+        super().__init__(name, help_text, label_names)
+        self.buckets = buckets
+
+    def _new_child(self) -> Histogram:
+        return Histogram(self.buckets)
+
+    def render(self) -> Iterable[str]:
+        yield from super().render()
+        for values, histogram in list(self.children.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), histogram.counts):
+                cumulative += count
+                le = f'le="{bound}"'
+                yield f"{self.name}_bucket{_labels(self.label_names, values, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.label_names, values)} {histogram.sum}"
+            yield f"{self.name}_count{_labels(self.label_names, values)} {cumulative}"
+
+
+class CounterFamily(_Family):
+    kind = "counter"
+
+    def _new_child(self) -> Counter:
+        return Counter()
+
+    def render(self) -> Iterable[str]:
+        yield from super().render()
+        for values, counter in list(self.children.items()):
+            yield f"{self.name}{_labels(self.label_names, values)} {counter.value}"
+
+
+class Registry:
+    """지표 모음. render() 는 Prometheus 텍스트 형식(0.0.4)을 만듭니다.
+
+    collector 는 {이름: 숫자} dict 를 반환하는 함수로, 기존 지표(토큰 캐시, 해싱 워커 풀 등)를 gauge 로 내보낼 때 씁니다.
+    """
+
+    def __init__(self):
+        self._families: List[_Family] = []
+        self._collectors: List[Tuple[str, Callable[[], Dict]]] = []
+
+    def histogram(self, name: str, help_text: str, label_names: Sequence[str] = (),
+                  buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> HistogramFamily:
+        family = HistogramFamily(name, help_text, label_names, buckets)
+        self._families.append(family)
+        return family
+
+    def counter(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> CounterFamily:
+        family = CounterFamily(name, help_text, label_names)
+        self._families.append(family)
+        return family
+
+    def add_collector(self, prefix: str, collect: Callable[[], Dict]) -> None:
+        self._collectors.append((prefix, collect))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for family in self._families:
+            lines.extend(family.render())
+        for prefix, collect in self._collectors:
+            for key, value in collect().items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    lines.append(f"# TYPE {prefix}_{key} gauge")
+                    lines.append(f"{prefix}_{key} {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route"))
+http_response_size = registry.histogram(
+    "http_response_size_bytes", "HTTP response body size by route template.", ("method", "route"), SIZE_BUCKETS)
+http_requests = registry.counter("http_requests_total", "HTTP requests by route and status.",
+                                 ("method", "route", "status"))
+model_call_duration = registry.histogram(
+    "model_call_duration_seconds", "UserModel / MovieModel method latency.", ("model", "method"))
+dependency_duration = registry.histogram(
+    "dependency_duration_seconds", "FastAPI dependency latency.", ("dependency",))
+password_duration = registry.histogram(
+    "password_duration_seconds", "bcrypt hash / verify latency including worker pool wait.", ("operation",))
+serialization_duration = registry.histogram(
+    "serialization_duration_seconds", "JSON encoding latency of fast responses.", ("encoder",))
+loop_lag = registry.histogram(
+    "event_loop_lag_seconds", "Delay of the loop lag monitor's periodic callback.").labels()
+
+
+def timed(histogram: Histogram) -> Callable:
+    """함수(동기 / async) 실행 시간을 histogram 에 기록하는 데코레이터. 지표가 꺼져 있으면 함수를 그대로 둡니다."""
+
+    def decorator(func: Callable) -> Callable:
+        if not METRICS_ENABLED:
+            return func
+        perf_counter = time.perf_counter
+        observe = histogram.observe
+
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    observe(perf_counter() - start)
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def instrument(cls: type, model: str, names: Iterable[str]) -> None:
+    """cls 의 메서드(classmethod 포함)를 실행 시간을 기록하는 버전으로 바꿉니다."""
+    for name in names:
+        raw = cls.__dict__[name]
+        if isinstance(raw, classmethod):
+            setattr(cls, name, classmethod(timed(model_call_duration.labels(model, name))(raw.__func__)))
+        else:
+            setattr(cls, name, timed(model_call_duration.labels(model, name))(raw))
+
+
+class MetricsMiddleware:
+    """라우트 템플릿별 지연 시간 / 응답 크기 / 상태 코드와 처리 중인 요청 수를 기록하는 ASGI 미들웨어."""
+
+    def __init__(self, app):
+        self.app = app
+        self.in_flight = 0
+        # (method, route) -> (지연 시간, 응답 크기, {상태 코드: 요청 수}). 요청마다 라벨을 찾지 않도록 묶어 둡니다.
+        self._series: Dict[Tuple[str, str], Tuple[Histogram, Histogram, Dict[int, Counter]]] = {}
+        registry.add_collector("http_requests", lambda: {"in_flight": self.in_flight})
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        self.in_flight += 1
+        start = time.perf_counter()
+        status_code = 500
+        size = 0
+
+        async def send_wrapper(message) -> None:
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.in_flight -= 1
+            # 라우터가 찾은 경로 템플릿("/movies/{movie_id}")을 라벨로 써서 시계열 개수를 제한합니다.
+            route: Optional[object] = scope.get("route")
+            key = (scope["method"], getattr(route, "path", "unmatched"))
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = (http_request_duration.labels(*key), http_response_size.labels(*key), {})
+            latency, sizes, statuses = series
+            latency.observe(elapsed)
+            sizes.observe(size)
+            counter = statuses.get(status_code)
+            if counter is None:
+                counter = statuses[status_code] = http_requests.labels(*key, str(status_code))
+            counter.value += 1
@@ -0,0 +1,144 @@
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional
+from functools import lru_cache
+from fastapi import HTTPException, status
+from app.utils.metrics import password_duration
+
+# 환경 변수로 워커 종류 / 개수 / 대기열 크기를 조정합니다.
+PASSWORD_EXECUTOR = os.getenv("PASSWORD_EXECUTOR", "thread")  # "thread" 또는 "process"
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", str(os.cpu_count() or 1)))
+PASSWORD_MAX_PENDING = int(os.getenv("PASSWORD_MAX_PENDING", str(PASSWORD_WORKERS * 8)))
+
+# 없는 유저로 로그인할 때 검증할 해시 (임의 문자열, 실제 비밀번호와 같은 cost 12). 응답 시간으로 유저 존재 여부가 드러나지 않게 합니다.
+DUMMY_HASH = "$2b$12$THLR6AkDxizzrGvEDPf3IOuajivlEAPfmiqyTq8hQEmg.04S4Wqc."
+
+
+@lru_cache(maxsize=None)
+def pwd_context():
+    """passlib 과 bcrypt 백엔드는 처음 해싱 / 검증할 때 불러옵니다. (시작 시간 단축)"""
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+# 프로세스 풀에서도 실행할 수 있도록 모듈 수준 함수로 둡니다.
+def hash_password(password: str) -> str:
+    return pwd_context().hash(password)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context().verify(plain_password, hashed_password)
+
+
+class PasswordService:
+    """bcrypt 해싱/검증을 워커 풀에서 실행해 이벤트 루프가 막히지 않게 합니다.
+
+    대기 중인 작업이 max_pending 에 도달하면 바로 503 을 반환합니다. (backpressure)
+    """
+
+    def __init__(self, workers: int = PASSWORD_WORKERS, max_pending: int = PASSWORD_MAX_PENDING,
+                 executor: str = PASSWORD_EXECUTOR):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.executor_type = executor
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        # 작업이 끝날 때마다 set 됩니다. (대량 해싱이 빈 칸을 기다릴 때 사용)
+        self._freed = asyncio.Event()
+        # 지표
+        self.completed = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password")
+        return self._executor
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def verify_dummy(self, plain_password: str) -> bool:
+        """실제 검증과 같은 비용으로 DUMMY_HASH 를 검증하고 False 를 반환합니다."""
+        await self._run(verify_password, plain_password, DUMMY_HASH)
+        return False
+
+    async def hash_many(self, passwords: List[str]) -> List[str]:
+        """여러 비밀번호를 병렬로 해싱합니다. (대량 등록용)
+
+        비밀번호 하나가 작업 하나(대기열 한 칸)이고, 한 번에 최대 workers 개만 넣습니다. 그 사이 들어온 로그인은
+        bcrypt 한 번 정도만 기다리고, 대기열 지표와 503 판단도 실제 작업 수를 봅니다.
+        시작할 때 빈 칸이 없으면 503 을 반환하고, 시작한 뒤에는 칸이 빌 때까지 기다립니다. (로그인이 먼저 칸을 씁니다)
+        """
+        if not passwords:
+            return []
+        if self._pending >= self.max_pending:
+            self._reject()
+        hashed: List[Optional[str]] = [None] * len(passwords)
+        remaining = iter(enumerate(passwords))
+
+        async def worker():
+            for index, password in remaining:
+                while self._pending >= self.max_pending:
+                    self._freed.clear()
+                    await self._freed.wait()
+                hashed[index] = await self._run(hash_password, password)
+
+        await asyncio.gather(*(worker() for _ in range(min(self.workers, len(passwords)))))
+        return hashed
+
+    def _reject(self):
+        self.rejected += 1
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Password service is busy. Try again later.",
+            headers={"Retry-After": "1"},
+        )
+
+    async def _run(self, func, *args):
+        if self._pending >= self.max_pending:
+            self._reject()
+        self._pending += 1
+        start = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._pending -= 1
+            self._freed.set()
+            self.completed += 1
+            self.total_seconds += elapsed
+            self.max_seconds = max(self.max_seconds, elapsed)
+            password_duration.labels(func.__name__).observe(elapsed)
+
+    def metrics(self) -> Dict:
+        return {
+            "executor": self.executor_type,
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "in_flight": min(self._pending, self.workers),
+            "queue_depth": max(0, self._pending - self.workers),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_latency_ms": self.total_seconds / self.completed * 1000 if self.completed else 0.0,
+            "max_latency_ms": self.max_seconds * 1000,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+password_service = PasswordService()
@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from types import FrameType
+from typing import Dict, Optional
+
+from app.utils.metrics import loop_lag
+
+logger = logging.getLogger("app.loop_lag")
+
+# 샘플링 간격과 한 번에 허용하는 최대 프로파일링 시간
+PROFILE_INTERVAL_SECONDS = float(os.getenv("PROFILE_INTERVAL_MS", "5")) / 1000
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+# 이벤트 루프가 이 시간(ms) 이상 멈추면 멈춘 지점의 스택을 로그로 남깁니다. 0 이면 감시하지 않습니다.
+LOOP_LAG_THRESHOLD_SECONDS = float(os.getenv("LOOP_LAG_THRESHOLD_MS", "100")) / 1000
+
+
+def _frame_name(frame: FrameType) -> str:
+    code = frame.f_code
+    # collapsed 형식에서 ";" 는 프레임 구분자, 공백은 개수 구분자이므로 이름에 넣지 않습니다.
+    name = f"{frame.f_globals.get('__name__', '?')}:{getattr(code, 'co_qualname', code.co_name)}"
+    return name.replace(";", ":").replace(" ", "_")
+
+
+def collapse(frame: FrameType) -> str:
+    """프레임을 바깥쪽부터 ";" 로 이은 한 줄(flamegraph.pl / speedscope 의 collapsed 형식)로 만듭니다."""
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class SamplingProfiler:
+    """별도 스레드에서 일정 간격으로 대상 스레드의 스택을 읽어 세는 샘플링 프로파일러.
+
+    대상 코드에 훅을 걸지 않으므로 오버헤드는 샘플 간격에만 비례합니다. 한 번에 하나의 프로파일만 실행합니다.
+    """
+
+    def __init__(self, interval: float = PROFILE_INTERVAL_SECONDS):
+        self.interval = interval
+        self.running = False
+
+    async def profile(self, seconds: float, all_threads: bool = False) -> Counter:
+        """seconds 동안 이벤트 루프 스레드(all_threads 이면 모든 스레드)를 샘플링해 {collapsed 스택: 샘플 수}를 반환합니다."""
+        if self.running:
+            raise RuntimeError("profiler is already running")
+        self.running = True
+        stacks: Counter = Counter()
+        stop = threading.Event()
+        sampler = threading.Thread(target=self._sample, args=(threading.get_ident(), all_threads, stop, stacks),
+                                   name="profiler", daemon=True)
+        try:
+            sampler.start()
+            await asyncio.sleep(seconds)
+        finally:
+            stop.set()
+            await asyncio.to_thread(sampler.join)
+            self.running = False
+        return stacks
+
+    def _sample(self, loop_thread: int, all_threads: bool, stop: threading.Event, stacks: Counter) -> None:
+        me = threading.get_ident()
+        while not stop.wait(self.interval):
+            frames = sys._current_frames()
+            if not all_threads:
+                frame = frames.get(loop_thread)
+                if frame is not None:
+                    stacks[collapse(frame)] += 1
+                continue
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in frames.items():
+                if thread_id != me:
+                    stacks[f"{names.get(thread_id, thread_id)};{collapse(frame)}"] += 1
+
+
+class LoopLagMonitor:
+    """이벤트 루프 지연 감시.
+
+    루프에서는 interval 마다 도는 콜백이 마지막 실행 시각을 남기고, 감시 스레드는 그 시각이 threshold 이상 갱신되지 않으면
+    (어떤 콜백이 루프를 막고 있으면) 루프 스레드의 현재 스택을 로그로 남깁니다. 멈춤 하나당 한 번만 기록합니다.
+    """
+
+    def __init__(self, threshold: float = LOOP_LAG_THRESHOLD_SECONDS, interval: Optional[float] = None):
+        self.threshold = threshold
+        self.interval = interval or max(threshold / 4, 0.005)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._last_beat = 0.0
+        self._reported = False
+        # 지표
+        self.stalls = 0
+        self.max_lag_seconds = 0.0
+
+    def start(self) -> "LoopLagMonitor":
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._handle = self._loop.call_later(self.interval, self._beat, self._last_beat + self.interval)
+        self._stop.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-monitor", daemon=True)
+        self._watchdog.start()
+        return self
+
+    def stop(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+        self._stop.set()
+        if self._watchdog is not None:
+            self._watchdog.join()
+
+    def _beat(self, expected: float) -> None:
+        now = time.monotonic()
+        lag = max(now - expected, 0.0)
+        loop_lag.observe(lag)
+        if lag > self.max_lag_seconds:
+            self.max_lag_seconds = lag
+        self._last_beat = now
+        self._reported = False
+        self._handle = self._loop.call_later(self.interval, self._beat, now + self.interval)
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval):
+            blocked = time.monotonic() - self._last_beat - self.interval
+            if blocked < self.threshold or self._reported:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            self._reported = True
+            self.stalls += 1
+            logger.warning("event loop blocked for %.0f ms (still running):\n%s", blocked * 1000,
+                           "".join(traceback.format_stack(frame)))
+
+    def stats(self) -> Dict:
+        return {"threshold_seconds": self.threshold, "stalls": self.stalls, "max_lag_seconds": self.max_lag_seconds}
+
+
+profiler = SamplingProfiler()
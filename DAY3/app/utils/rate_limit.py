@@ -0,0 +1,109 @@
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException, status
+
+# 최근 window 초 동안 허용하는 로그인 시도 수 (0 이면 제한하지 않습니다)
+LOGIN_RATE_WINDOW_SECONDS = float(os.getenv("LOGIN_RATE_WINDOW_SECONDS", "60"))
+LOGIN_RATE_PER_USERNAME = int(os.getenv("LOGIN_RATE_PER_USERNAME", "10"))
+LOGIN_RATE_PER_IP = int(os.getenv("LOGIN_RATE_PER_IP", "30"))
+# 키(유저명 / IP)를 이 개수까지만 기억하고, 넘으면 가장 오래 안 쓴 키부터 버립니다.
+LOGIN_RATE_MAX_KEYS = int(os.getenv("LOGIN_RATE_MAX_KEYS", "100000"))
+
+
+class SlidingWindowLimiter:
+    """키별 슬라이딩 윈도 카운터.
+
+    고정 윈도 두 칸(현재, 직전)의 개수만 저장하고, 최근 window 초의 시도 수를
+    "직전 개수 × 직전 윈도가 겹치는 비율 + 현재 개수"로 근사합니다. 키 하나에 숫자 세 개만 쓰므로 메모리가 작고,
+    max_keys 를 넘으면 LRU 로 버립니다.
+    """
+
+    def __init__(self, limit: int, window: float = LOGIN_RATE_WINDOW_SECONDS, max_keys: int = LOGIN_RATE_MAX_KEYS):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        # 키 -> [윈도 번호, 현재 윈도 개수, 직전 윈도 개수]
+        self._entries: "OrderedDict[str, List]" = OrderedDict()
+        # 지표
+        self.allowed = 0
+        self.rejected = 0
+        self.evictions = 0
+
+    def hit(self, key: str, now: Optional[float] = None) -> float:
+        """시도 한 번을 기록합니다. 허용하면 0, 한도를 넘었으면 다시 시도할 수 있을 때까지의 초를 반환합니다."""
+        if self.limit <= 0:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        index, offset = divmod(now, self.window)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = [index, 0, 0]
+            while len(self._entries) > self.max_keys:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        else:
+            self._entries.move_to_end(key)
+            if entry[0] != index:
+                # 윈도가 하나 넘어가면 현재 → 직전, 둘 이상 넘어가면 둘 다 비웁니다.
+                entry[2] = entry[1] if index - entry[0] == 1 else 0
+                entry[1] = 0
+                entry[0] = index
+        _, current, previous = entry
+        overlap = 1 - offset / self.window
+        if previous * overlap + current + 1 > self.limit:
+            self.rejected += 1
+            return self._retry_after(current, previous, offset)
+        entry[1] += 1
+        self.allowed += 1
+        return 0.0
+
+    def _retry_after(self, current: int, previous: int, offset: float) -> float:
+        room = self.limit - 1 - current
+        if previous and room >= 0:
+            # 직전 윈도의 비중이 줄어 한 번 더 들어갈 자리가 생기는 시점
+            return max((1 - room / previous) * self.window - offset, 0.001)
+        # 현재 윈도만으로 한도를 채웠으면(current >= limit) 다음 윈도에서 그 개수가 직전 개수로 넘어간 뒤의 시점
+        return self.window - offset + (1 - (self.limit - 1) / current) * self.window
+
+    def reset(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict:
+        return {"limit": self.limit, "window_seconds": self.window, "keys": len(self._entries),
+                "max_keys": self.max_keys, "allowed": self.allowed, "rejected": self.rejected,
+                "evictions": self.evictions}
+
+
+class LoginGuard:
+    """로그인 시도를 유저명별 / 클라이언트 IP 별로 제한합니다. bcrypt 검증 전에 호출합니다."""
+
+    def __init__(self, per_username: int = LOGIN_RATE_PER_USERNAME, per_ip: int = LOGIN_RATE_PER_IP):
+        self.by_username = SlidingWindowLimiter(per_username)
+        self.by_ip = SlidingWindowLimiter(per_ip)
+
+    def check(self, username: str, client_ip: str) -> None:
+        """한도를 넘었으면 429 를 반환합니다. IP 한도에 걸린 시도는 유저명 카운터에 세지 않습니다."""
+        retry_after = self.by_ip.hit(client_ip) or self.by_username.hit(username)
+        if retry_after:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts. Try again later.",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+    def succeeded(self, username: str) -> None:
+        # 로그인에 성공하면 그 유저명의 실패 기록은 잊습니다. (IP 카운터는 그대로 둡니다)
+        self.by_username.reset(username)
+
+    def stats(self) -> Dict:
+        return {"username": self.by_username.stats(), "ip": self.by_ip.stats()}
+
+
+login_guard = LoginGuard()
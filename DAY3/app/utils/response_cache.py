@@ -0,0 +1,90 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+from fastapi import Response
+from app.utils.serializers import FAST_RESPONSES, RecordEncoder, render
+
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "1024"))  # 0 이면 캐시를 사용하지 않습니다.
+SEARCH_CACHE_TTL_SECONDS = float(os.getenv("SEARCH_CACHE_TTL_SECONDS", "60"))
+
+
+class ResponseCache:
+    """직렬화까지 끝난 조회 응답(본문 + 헤더)을 쿼리별로 보관하는 LRU + TTL 캐시.
+
+    엔트리는 만들 때의 컬렉션 버전을 함께 저장하고, 조회 시 버전이 다르면(그 사이 쓰기가 있었으면) 버립니다.
+    """
+
+    def __init__(self, maxsize: int = SEARCH_CACHE_SIZE, ttl: float = SEARCH_CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # 쿼리 -> (컬렉션 버전, 만료 시각, 본문, 헤더)
+        self._entries: "OrderedDict[Hashable, Tuple[int, float, bytes, List[Tuple[bytes, bytes]]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.expirations = 0
+
+    def get(self, query: Hashable, version: int) -> Optional[Response]:
+        if self.maxsize <= 0:
+            return None
+        entry = self._entries.get(query)
+        if entry is None:
+            self.misses += 1
+            return None
+        entry_version, expires_at, body, headers = entry
+        if entry_version != version:
+            del self._entries[query]
+            self.invalidations += 1
+            self.misses += 1
+            return None
+        if time.monotonic() >= expires_at:
+            del self._entries[query]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(query)
+        self.hits += 1
+        cached = Response(body, media_type="application/json")
+        cached.raw_headers.extend(headers)
+        return cached
+
+    def render(self, query: Hashable, version: int, response: Response, data: Any, encoder: RecordEncoder) -> Any:
+        """serializers.render 와 같지만, 캐시를 쓰면 항상 직렬화한 Response 를 만들어 보관합니다.
+
+        FAST_RESPONSES 가 꺼져 있으면 response_model 경로처럼 스키마로 검증한 결과를 보관합니다.
+        """
+        if self.maxsize <= 0:
+            return render(response, data, encoder.many)
+        body = encoder.many(data) if FAST_RESPONSES else encoder.checked_many(data)
+        headers = list(response.raw_headers)
+        self._entries[query] = (version, time.monotonic() + self.ttl, body, headers)
+        self._entries.move_to_end(query)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        fresh = Response(body, media_type="application/json")
+        fresh.raw_headers.extend(headers)
+        return fresh
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "expirations": self.expirations,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+movie_search_cache = ResponseCache()
+user_search_cache = ResponseCache()
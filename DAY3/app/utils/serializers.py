@@ -0,0 +1,81 @@
+import os
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Type
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+from app.schemas.movies import MovieRead
+from app.schemas.users import UserRead
+from app.utils.metrics import serialization_duration, timed
+
+try:
+    import orjson
+except ImportError:  # orjson 이 없으면 pydantic 의 직렬화기를 사용합니다.
+    orjson = None
+
+# 1 이면 목록/단건 조회 응답을 response_model 검증 없이 바로 JSON 으로 만듭니다.
+FAST_RESPONSES = os.getenv("FAST_RESPONSES", "0") == "1"
+
+
+@timed(serialization_duration.labels("json"))
+def dumps(data: Any) -> bytes:
+    """pydantic 응답과 같은 형식의 JSON 바이트. (UTC datetime 은 'Z' 로 끝납니다)"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_UTC_Z)
+    return to_json(data)
+
+
+class RecordEncoder:
+    """스키마에 선언된 필드만 골라 dict 로 만드는 인코더.
+
+    필드 값을 한 번에 꺼내는 attrgetter / itemgetter 를 스키마마다 한 번만 만들어 재사용합니다.
+    검증을 하지 않으므로 저장소에서 꺼낸(이미 스키마를 만족하는) 레코드에만 사용해야 합니다.
+    """
+
+    def __init__(self, schema: Type[BaseModel], access: str):
+        self.fields = tuple(schema.model_fields)
+        getter = attrgetter(*self.fields) if access == "attr" else itemgetter(*self.fields)
+        if len(self.fields) == 1:
+            # 필드가 하나면 getter 가 튜플 대신 값 하나를 반환합니다.
+            field = self.fields[0]
+            self.row: Callable[[Any], Dict[str, Any]] = lambda record: {field: getter(record)}
+        else:
+            fields = self.fields
+            self.row = lambda record: dict(zip(fields, getter(record)))
+        self._list = TypeAdapter(List[schema])
+
+    def one(self, record: Any) -> bytes:
+        return dumps(self.row(record))
+
+    def many(self, records: Iterable[Any]) -> bytes:
+        return dumps([self.row(record) for record in records])
+
+    def checked_many(self, records: Iterable[Any]) -> bytes:
+        """many 와 같은 JSON 이지만, response_model 경로처럼 스키마로 검증한 뒤 직렬화합니다."""
+        return self._list.dump_json(self._list.validate_python(list(records), from_attributes=True))
+
+    def batch(self, result: Dict[str, Any]) -> bytes:
+        """batch_result 의 반환값 ({"items": [...], "missing": [...]})."""
+        return dumps({"items": [self.row(record) for record in result["items"]], "missing": result["missing"]})
+
+
+def batch_result(ids: List[int], found: Dict[int, Any]) -> Dict[str, Any]:
+    """get_many 결과를 요청한 id 순서대로 찾은 항목(items)과 없는 id(missing)로 나눕니다."""
+    return {"items": [found[i] for i in ids if i in found], "missing": [i for i in ids if i not in found]}
+
+
+def render(response: Response, data: Any, encode: Callable[[Any], bytes], status_code: int = 200) -> Any:
+    """FAST_RESPONSES 가 켜져 있으면 직렬화를 마친 Response 를, 아니면 data 를 그대로(response_model 경로) 반환합니다.
+
+    Response 를 직접 반환하면 주입받은 response 의 헤더(X-Next-Cursor 등)가 붙지 않으므로 옮겨 담습니다.
+    """
+    if not FAST_RESPONSES:
+        return data
+    fast = Response(encode(data), status_code=status_code, media_type="application/json")
+    fast.raw_headers.extend(response.raw_headers)
+    return fast
+
+
+# MovieModel 은 속성으로, 유저는 dict 키로 필드를 꺼냅니다.
+movie_encoder = RecordEncoder(MovieRead, "attr")
+user_encoder = RecordEncoder(UserRead, "item")
@@ -0,0 +1,35 @@
+import importlib
+import os
+from typing import Dict
+
+from fastapi import FastAPI
+
+# "eager"(기본값): import 할 때 라우터를 모두 등록합니다.
+# "lazy": 경로가 맞는 첫 요청이 올 때 그 라우터 모듈(스키마, JWT 등 의존성 포함)을 import 해 등록합니다.
+STARTUP_MODE = os.getenv("STARTUP_MODE", "eager")
+
+# API 문서는 모든 라우터가 필요하므로, 이 경로로 요청이 오면 남은 라우터를 모두 등록합니다.
+_DOC_PATHS = ("/docs", "/redoc", "/openapi.json")
+
+
+def load_router(target: str):
+    """"모듈:속성" 문자열로 라우터를 불러옵니다."""
+    module, _, name = target.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+class LazyRouters:
+    """prefix -> "모듈:라우터" 중 요청 경로에 맞는 라우터를 처음 쓸 때 import 해 앱에 등록하는 ASGI 미들웨어."""
+
+    def __init__(self, app, target: FastAPI, routers: Dict[str, str]):
+        self.app = app
+        self.target = target
+        self.pending = dict(routers)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if self.pending and scope["type"] in ("http", "websocket"):
+            path = scope["path"]
+            for prefix in list(self.pending):
+                if path == prefix or path.startswith(prefix + "/") or path.startswith(_DOC_PATHS):
+                    self.target.include_router(load_router(self.pending.pop(prefix)))
+        await self.app(scope, receive, send)
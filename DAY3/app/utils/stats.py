@@ -0,0 +1,81 @@
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# /movies/stats 에서 계산하는 백분위수
+PERCENTILES = (50, 90, 99)
+
+# 통계 캐시: 이름 -> (집계 version, 결과)
+_cache: Dict[Hashable, Tuple[Any, Any]] = {}
+
+
+def cached(key: Hashable, version: Any, compute: Callable[[], Any]) -> Any:
+    """집계의 version 이 그대로면 지난번 결과를 반환합니다."""
+    entry = _cache.get(key)
+    if entry is None or entry[0] != version:
+        entry = _cache[key] = (version, compute())
+    return entry[1]
+
+
+async def cached_async(key: Hashable, version: Any, compute: Callable[[], Awaitable[Any]]) -> Any:
+    """cached 와 같지만 compute 가 코루틴입니다. (SQLite 집계 쿼리)"""
+    entry = _cache.get(key)
+    if entry is None or entry[0] != version:
+        entry = _cache[key] = (version, await compute())
+    return entry[1]
+
+
+def _columns(counts: Dict[int, int]) -> Tuple["np.ndarray", "np.ndarray"]:
+    """{값: 개수} 를 값 기준으로 정렬된 (값, 개수) 배열로 바꿉니다."""
+    import numpy as np  # numpy 는 통계를 처음 계산할 때 불러옵니다. (시작 시간 단축)
+
+    values = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+    weights = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+    order = np.argsort(values, kind="stable")
+    return values[order], weights[order]
+
+
+def playtime_stats(groups: Dict[str, Dict[int, int]]) -> Dict:
+    """장르 -> {상영 시간: 영화 수} 로 장르별 개수 / 합계 / 평균 / 백분위수를 계산합니다.
+
+    백분위수는 nearest-rank 방식입니다. (np.percentile(..., method="inverted_cdf") 와 같은 값)
+    """
+    import numpy as np
+
+    genres = {}
+    for genre, counts in sorted(groups.items()):
+        values, weights = _columns(counts)
+        cumulative = np.cumsum(weights)
+        count = int(cumulative[-1])
+        # 상영 시간은 INT64_MAX 까지 받으므로 합계는 int64 로 넘칠 수 있습니다. (서로 다른 값 수만큼만 파이썬 int 로 더합니다)
+        total = sum(value * movies for value, movies in counts.items())
+        ranks = np.ceil(np.array(PERCENTILES) / 100 * count).astype(np.int64)
+        percentiles = values[np.searchsorted(cumulative, ranks)]
+        genres[genre] = {
+            "count": count,
+            "total_playtime": total,
+            "avg_playtime": total / count,
+            **{f"p{p}_playtime": int(value) for p, value in zip(PERCENTILES, percentiles)},
+        }
+    return {"count": sum(genre["count"] for genre in genres.values()), "genres": genres}
+
+
+def age_histogram(groups: Dict[str, Dict[int, int]], bin_size: int) -> Dict:
+    """성별 -> {나이: 유저 수} 를 bin_size 살 단위 구간으로 묶습니다. (빈 구간은 생략)
+
+    구간은 값이 있는 것만 dict 로 만듭니다. (np.bincount 는 최대 나이까지 모든 구간을 할당합니다)
+    """
+    histogram = {}
+    count = 0
+    for gender, counts in sorted(groups.items()):
+        bins: Counter = Counter()
+        for age, users in counts.items():
+            bins[age // bin_size] += users
+        histogram[gender] = {
+            f"{index * bin_size}-{(index + 1) * bin_size - 1}": users
+            for index, users in sorted(bins.items()) if users
+        }
+        count += sum(counts.values())
+    return {"count": count, "bin_size": bin_size, "age_histogram": histogram}
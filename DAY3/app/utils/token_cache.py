@@ -0,0 +1,95 @@
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))  # 0 이면 캐시를 사용하지 않습니다.
+TOKEN_CACHE_TTL_SECONDS = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+
+
+class TokenCache:
+    """검증이 끝난 JWT 의 claims(user_id) 를 보관하는 LRU + TTL 캐시.
+
+    토큰 원문 대신 sha256 digest 를 키로 쓰며, 토큰의 exp 를 넘겨서 보관하지 않습니다.
+    """
+
+    def __init__(self, maxsize: int = TOKEN_CACHE_SIZE, ttl: int = TOKEN_CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # digest -> (user_id, 만료 시각)
+        self._entries: "OrderedDict[bytes, Tuple[int, float]]" = OrderedDict()
+        # user_id -> digest 집합 (유저 변경 시 무효화용)
+        self._by_user: Dict[int, Set[bytes]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[int]:
+        if self.maxsize <= 0:
+            return None
+        digest = self._digest(token)
+        entry = self._entries.get(digest)
+        if entry is None:
+            self.misses += 1
+            return None
+        user_id, expires_at = entry
+        if time.time() >= expires_at:
+            self._discard(digest, user_id)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(digest)
+        self.hits += 1
+        return user_id
+
+    def put(self, token: str, user_id: int, exp: Optional[float]) -> None:
+        if self.maxsize <= 0:
+            return
+        expires_at = time.time() + self.ttl
+        if exp is not None:
+            expires_at = min(expires_at, exp)
+        digest = self._digest(token)
+        self._entries[digest] = (user_id, expires_at)
+        self._entries.move_to_end(digest)
+        self._by_user.setdefault(user_id, set()).add(digest)
+        while len(self._entries) > self.maxsize:
+            old_digest, (old_user_id, _) = self._entries.popitem(last=False)
+            self._remove_from_user(old_digest, old_user_id)
+            self.evictions += 1
+
+    def invalidate_user(self, user_id: int) -> None:
+        for digest in self._by_user.pop(user_id, set()):
+            self._entries.pop(digest, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_user.clear()
+
+    def _discard(self, digest: bytes, user_id: int) -> None:
+        self._entries.pop(digest, None)
+        self._remove_from_user(digest, user_id)
+
+    def _remove_from_user(self, digest: bytes, user_id: int) -> None:
+        digests = self._by_user.get(user_id)
+        if digests is not None:
+            digests.discard(digest)
+            if not digests:
+                del self._by_user[user_id]
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+token_cache = TokenCache()
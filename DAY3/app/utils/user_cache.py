@@ -0,0 +1,92 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))  # 0 이면 캐시를 사용하지 않습니다.
+# 엔트리 수명(초). 변경 알림이 오지 않는 변경(다른 프로세스의 SQLite 쓰기 등)은 최대 이만큼 늦게 보입니다.
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "5"))
+
+
+class UserCache:
+    """인증된 유저(principal)를 id 별로 보관하는 LRU 캐시. get_current_user 가 매 요청 저장소를 읽지 않게 합니다.
+
+    유저 변경 알림(update / login / delete)이 오면 그 유저의 세대(generation) 번호를 올리고 엔트리를 버립니다.
+    조회를 시작할 때의 세대를 put 에 넘기므로, 조회하는 동안 바뀐 유저의 이전 값은 다시 들어가지 않습니다.
+    알림은 같은 프로세스(와 공유 저장소의 워커)에서만 오므로, 엔트리는 ttl 초가 지나면 저장소에서 다시 읽습니다.
+    """
+
+    def __init__(self, maxsize: int = USER_CACHE_SIZE, ttl: float = USER_CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # user_id -> (만료 시각, 유저)
+        self._entries: "OrderedDict[int, Tuple[float, Dict]]" = OrderedDict()
+        # user_id -> 세대 번호. 최근에 바뀐 유저만 maxsize 개까지 기억합니다.
+        self._generations: "OrderedDict[int, int]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.expirations = 0
+
+    def generation(self, user_id: int) -> int:
+        return self._generations.get(user_id, 0)
+
+    def get(self, user_id: int) -> Optional[Dict]:
+        if self.maxsize <= 0:
+            return None
+        entry = self._entries.get(user_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, user = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[user_id]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return user
+
+    def put(self, user: Dict, generation: int) -> None:
+        if self.maxsize <= 0 or self.generation(user["id"]) != generation:
+            return
+        self._entries[user["id"]] = (time.monotonic() + self.ttl, user)
+        self._entries.move_to_end(user["id"])
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def on_change(self, event: str, user: Dict) -> None:
+        """UserModel 변경 알림 listener."""
+        if event == "create":
+            return
+        user_id = user["id"]
+        if self._entries.pop(user_id, None) is not None:
+            self.invalidations += 1
+        self._generations[user_id] = self._generations.get(user_id, 0) + 1
+        self._generations.move_to_end(user_id)
+        while len(self._generations) > max(self.maxsize, 1):
+            self._generations.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._generations.clear()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "expirations": self.expirations,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+user_cache = UserCache()
@@ -0,0 +1,255 @@
+"""API 부하 테스트 하네스: 영화 / 유저 CRUD, 검색, 로그인, /users/me 의 지연 시간(p50/p95/p99)과 RPS 를 JSON 으로 남깁니다.
+
+- asgi 모드는 httpx ASGITransport 로 앱을 같은 프로세스에서 호출하고, uvicorn 모드는 앱을 별도 프로세스의 uvicorn 으로 띄워
+  실제 로컬 HTTP 로 호출합니다.
+- 데이터 크기(--rows), 동시 요청 수(--concurrency), 시나리오당 요청 수(--requests)를 바꿀 수 있습니다. 난수 시드를 고정해
+  같은 옵션이면 같은 요청을 같은 순서로 보냅니다.
+- --output 으로 결과를 저장하고, --baseline 으로 이전 결과와 비교합니다. --max-regression 을 주면 p95 가 그 비율 이상
+  나빠진 시나리오가 있을 때 종료 코드 1 로 끝납니다.
+실행: DAY3 디렉터리에서 `python -m benchmarks.bench_api [--mode asgi|uvicorn] [--rows N] [--concurrency N]
+      [--requests N] [--output result.json] [--baseline baseline.json] [--max-regression 0.1]`
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Tuple
+
+import httpx
+
+GENRES = ["action", "drama", "comedy", "horror", "sci-fi"]
+PASSWORD = "bench-password"
+
+
+def _seed(rows: int) -> None:
+    """영화 / 유저 rows 건을 모델에 직접 넣습니다. bcrypt 해시는 한 번만 계산해 모든 유저가 같이 씁니다."""
+    from app.models.movies import MovieModel
+    from app.models.users import UserModel
+    from app.utils.passwords import hash_password
+    from app.utils.rate_limit import login_guard
+
+    # 모든 요청이 같은 클라이언트 IP 에서 오므로 로그인 시도 제한을 끕니다.
+    login_guard.by_username.limit = login_guard.by_ip.limit = 0
+    rng = random.Random(0)
+    MovieModel.create_many([{"title": f"movie {i}", "playtime": rng.randint(60, 240), "genre": rng.choice(GENRES)}
+                            for i in range(rows)])
+    hashed = hash_password(PASSWORD)
+    for i in range(rows):
+        UserModel._insert(f"user{i}", hashed, rng.randint(1, 100), rng.choice(["male", "female"]))
+
+
+class State:
+    """시나리오 사이에 공유하는 값 (토큰, 새로 만들 유저명, 지울 id)."""
+
+    def __init__(self, rows: int):
+        self.rows = rows
+        self.token = ""
+        self.new_users = itertools.count()
+        # 삭제는 마지막에 실행하고 큰 id 부터 지웁니다.
+        self.movie_deletes = iter(range(rows, 0, -1))
+        self.user_deletes = iter(range(rows, 0, -1))
+
+
+# 시나리오 이름 -> (요청을 만드는 함수, 기대하는 상태 코드, bcrypt 를 쓰는지)
+Request = Tuple[str, str, Dict]
+SCENARIOS: Dict[str, Tuple[Callable[[random.Random, State], Request], int, bool]] = {
+    "movies.create": (lambda rng, s: ("POST", "/movies/", {"json": {
+        "title": f"new movie {rng.randint(1, 10 ** 6)}", "playtime": rng.randint(60, 240),
+        "genre": rng.choice(GENRES)}}), 201, False),
+    "movies.list": (lambda rng, s: ("GET", "/movies/", {"params": {"limit": 50}}), 200, False),
+    "movies.search": (lambda rng, s: ("GET", "/movies/", {"params": {
+        "title": f"movie {rng.randint(1, 999)}", "genre": rng.choice(GENRES), "limit": 50}}), 200, False),
+    "movies.get": (lambda rng, s: ("GET", f"/movies/{rng.randint(1, s.rows)}", {}), 200, False),
+    "movies.update": (lambda rng, s: ("PUT", f"/movies/{rng.randint(1, s.rows)}", {"json": {
+        "title": f"movie {rng.randint(1, s.rows)}", "playtime": rng.randint(60, 240),
+        "genre": rng.choice(GENRES)}}), 200, False),
+    "users.create": (lambda rng, s: ("POST", "/users/", {"json": {
+        "username": f"bench{next(s.new_users)}", "password": PASSWORD, "age": rng.randint(1, 100),
+        "gender": rng.choice(["male", "female"])}}), 201, True),
+    "users.list": (lambda rng, s: ("GET", "/users/", {"params": {"limit": 50}}), 200, False),
+    "users.search": (lambda rng, s: ("GET", "/users/search/", {"params": {
+        "min_age": rng.randint(1, 80), "gender": rng.choice(["male", "female"]), "limit": 50}}), 200, False),
+    "users.get": (lambda rng, s: ("GET", f"/users/{rng.randint(1, s.rows)}", {}), 200, False),
+    "users.update": (lambda rng, s: ("PATCH", f"/users/{rng.randint(1, s.rows)}", {"json": {
+        "age": rng.randint(1, 100)}}), 200, False),
+    "users.login": (lambda rng, s: ("POST", "/users/login", {"data": {
+        "username": f"user{rng.randint(0, s.rows - 1)}", "password": PASSWORD}}), 200, True),
+    "users.me": (lambda rng, s: ("GET", "/users/me", {"headers": {"Authorization": f"Bearer {s.token}"}}), 200,
+                 False),
+    "movies.delete": (lambda rng, s: ("DELETE", f"/movies/{next(s.movie_deletes)}", {}), 204, False),
+    "users.delete": (lambda rng, s: ("DELETE", f"/users/{next(s.user_deletes)}", {}), 204, False),
+}
+
+
+def _percentile(latencies: List[float], q: float) -> float:
+    return latencies[min(len(latencies) - 1, int(len(latencies) * q))]
+
+
+async def _run_scenario(client: httpx.AsyncClient, name: str, requests: int, concurrency: int,
+                        state: State, seed: int) -> Dict:
+    build, expected, _ = SCENARIOS[name]
+    rng = random.Random(seed)
+    # 요청 목록을 미리 만들어, 요청 생성 비용과 동시 실행 순서가 결과에 끼어들지 않게 합니다.
+    pending = iter([build(rng, state) for _ in range(requests)])
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        for method, url, kwargs in pending:
+            start = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != expected:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3),
+    }
+
+
+async def _run(client: httpx.AsyncClient, args: argparse.Namespace) -> Dict:
+    state = State(args.rows)
+    response = await client.post("/users/login", data={"username": "user0", "password": PASSWORD})
+    state.token = response.json()["access_token"]
+    # 워밍업: 조회 시나리오를 조금씩 실행하고 버립니다.
+    for name in ("movies.get", "movies.search", "users.get", "users.search", "users.me"):
+        await _run_scenario(client, name, 50, args.concurrency, state, seed=-1)
+
+    names = args.scenarios or list(SCENARIOS)
+    results = {}
+    for index, name in enumerate(names):
+        requests = args.bcrypt_requests if SCENARIOS[name][2] else args.requests
+        if name.endswith(".delete"):
+            requests = min(requests, args.rows)
+        results[name] = await _run_scenario(client, name, requests, args.concurrency, state, seed=args.seed + index)
+        print(f"  {name:<14} {results[name]['rps']:>9.1f} req/s   p50 {results[name]['p50_ms']:>8.2f} ms"
+              f"   p95 {results[name]['p95_ms']:>8.2f} ms   p99 {results[name]['p99_ms']:>8.2f} ms"
+              f"   errors {results[name]['errors']}", file=sys.stderr)
+    return results
+
+
+async def _run_asgi(args: argparse.Namespace) -> Dict:
+    from main import app
+
+    _seed(args.rows)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            return await _run(client, args)
+
+
+async def _run_uvicorn(args: argparse.Namespace) -> Dict:
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen([sys.executable, "-m", "benchmarks.bench_api", "--serve", "--rows", str(args.rows),
+                               "--port", str(args.port)], stdout=subprocess.DEVNULL)
+    try:
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+            for _ in range(600):
+                if server.poll() is not None:
+                    raise RuntimeError(f"server exited with {server.returncode}")
+                try:
+                    await client.get("/movies/1")
+                    break
+                except httpx.TransportError:
+                    await asyncio.sleep(0.1)
+            else:
+                raise RuntimeError("server did not start")
+            return await _run(client, args)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def _serve(args: argparse.Namespace) -> None:
+    import uvicorn
+    from main import app
+
+    _seed(args.rows)
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+def _compare(results: Dict, baseline: Dict, max_regression: float) -> bool:
+    """기준 결과와 시나리오별로 비교해 출력합니다. p95 가 max_regression 이상 나빠진 시나리오가 없으면 True."""
+    ok = True
+    print(f"compared with {baseline['meta']['timestamp']} ({baseline['meta']['mode']}, "
+          f"rows {baseline['meta']['rows']}, concurrency {baseline['meta']['concurrency']})", file=sys.stderr)
+    for name, result in results.items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        rps = result["rps"] / base["rps"] - 1
+        p95 = result["p95_ms"] / base["p95_ms"] - 1
+        regressed = max_regression is not None and p95 > max_regression
+        ok = ok and not regressed
+        print(f"  {name:<14} rps {rps:>+8.1%}   p95 {p95:>+8.1%}{'   REGRESSION' if regressed else ''}",
+              file=sys.stderr)
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=["asgi", "uvicorn"], default="asgi")
+    parser.add_argument("--rows", type=int, default=10_000, help="미리 넣을 영화 / 유저 수")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시에 요청을 보내는 클라이언트 수")
+    parser.add_argument("--requests", type=int, default=1000, help="시나리오당 요청 수")
+    parser.add_argument("--bcrypt-requests", type=int, default=50, help="가입 / 로그인 시나리오의 요청 수")
+    parser.add_argument("--scenarios", nargs="*", choices=list(SCENARIOS), help="실행할 시나리오 (기본: 전부)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--output", help="결과 JSON 을 저장할 경로 (기본: 표준 출력)")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--max-regression", type=float, help="허용하는 p95 악화 비율 (예: 0.1)")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        _serve(args)
+        return
+
+    print(f"{args.mode}: {args.rows} rows, concurrency {args.concurrency}", file=sys.stderr)
+    results = asyncio.run(_run_asgi(args) if args.mode == "asgi" else _run_uvicorn(args))
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "mode": args.mode,
+            "rows": args.rows,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "bcrypt_requests": args.bcrypt_requests,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+    if args.baseline:
+        with open(args.baseline) as file:
+            if not _compare(results, json.load(file), args.max_regression):
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
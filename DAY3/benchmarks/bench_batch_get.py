@@ -0,0 +1,88 @@
+"""묶음 조회 벤치마크: 목록 하나를 채우려고 `GET /movies/{id}` 를 N 번 호출하는 경우와 `POST /movies/batch-get` 한 번을 비교합니다.
+
+- 백엔드: memory, SQLite
+- 단건 조회는 동시 요청 CONCURRENCY 개로 나눠 보냅니다. (클라이언트가 gather 로 병렬 호출하는 경우)
+- N 개 id 중 10% 는 없는 id 입니다.
+실행: DAY3 디렉터리에서 `python -m benchmarks.bench_batch_get [rounds]`
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+import httpx
+
+from main import app
+from app.models.movies import MovieModel
+from app.repositories import set_repositories
+from app.repositories.memory import MemoryMovieRepository, MemoryUserRepository
+from app.repositories.sqlite import SqliteMovieRepository, SqlitePool, SqliteUserRepository
+
+MOVIES = 10000
+SIZES = (10, 100, 1000)
+CONCURRENCY = 8
+
+
+def _ids(size: int):
+    ids = random.sample(range(1, MOVIES + 1), size - size // 10)
+    ids += random.sample(range(MOVIES + 1, MOVIES * 2), size // 10)
+    random.shuffle(ids)
+    return ids
+
+
+async def _singles(client: httpx.AsyncClient, ids) -> None:
+    pending = iter(ids)
+
+    async def worker():
+        for movie_id in pending:
+            response = await client.get(f"/movies/{movie_id}")
+            assert response.status_code in (200, 404), response.status_code
+
+    await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+
+
+async def _batch(client: httpx.AsyncClient, ids) -> None:
+    response = await client.post("/movies/batch-get", json={"ids": ids})
+    assert response.status_code == 200, response.status_code
+    assert len(response.json()["missing"]) == len(ids) // 10
+
+
+async def _run(rounds: int) -> None:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for size in SIZES:
+            timings = {}
+            for label, fetch in (("single", _singles), ("batch", _batch)):
+                best = float("inf")
+                for _ in range(rounds):
+                    ids = _ids(size)
+                    start = time.perf_counter()
+                    await fetch(client, ids)
+                    best = min(best, time.perf_counter() - start)
+                timings[label] = best * 1000
+            print(f"  {size:>5} ids   GET /movies/{{id}} x {size:<5} {timings['single']:>7.1f} ms   "
+                  f"batch-get {timings['batch']:>7.1f} ms   x{timings['single'] / timings['batch']:.0f}")
+
+
+async def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    movies = [{"title": f"movie {i}", "playtime": 60 + i % 120, "genre": "drama"} for i in range(MOVIES)]
+    print(f"{MOVIES} movies, best of {rounds}, single requests with concurrency {CONCURRENCY}")
+    print("memory")
+    MovieModel.create_many(movies)
+    await _run(rounds)
+
+    print("sqlite")
+    with tempfile.TemporaryDirectory() as directory:
+        pool = await SqlitePool(os.path.join(directory, "bench.db")).open()
+        await pool.insert_many("INSERT INTO movies (title, playtime, genre) VALUES (?, ?, ?)",
+                               [(movie["title"], movie["playtime"], movie["genre"]) for movie in movies])
+        set_repositories(SqliteUserRepository(pool), SqliteMovieRepository(pool))
+        await _run(rounds)
+        await pool.close()
+        set_repositories(MemoryUserRepository(), MemoryMovieRepository())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
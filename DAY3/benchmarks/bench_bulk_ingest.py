@@ -0,0 +1,55 @@
+"""대량 등록 벤치마크: 단건 POST N번 vs JSON 배열 한 번 vs NDJSON 한 번.
+
+실행: DAY3 디렉터리에서 `python -m benchmarks.bench_bulk_ingest [rows]`
+"""
+import asyncio
+import json
+import random
+import sys
+import time
+
+import httpx
+
+from main import app
+from app.models.movies import _reset as reset_movies
+
+GENRES = ["action", "drama", "comedy", "horror", "sci-fi"]
+
+
+def _movies(rows: int):
+    return [{"title": f"movie {i}", "playtime": random.randint(60, 240), "genre": random.choice(GENRES)}
+            for i in range(rows)]
+
+
+async def _measure(label: str, rows: int, send) -> None:
+    reset_movies()
+    start = time.perf_counter()
+    await send()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<18} {elapsed:>8.2f} s {rows / elapsed:>12.0f} rows/s")
+
+
+async def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    movies = _movies(rows)
+    ndjson = "\n".join(json.dumps(movie) for movie in movies)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def single():
+            for movie in movies:
+                await client.post("/movies/", json=movie)
+
+        async def bulk_json():
+            await client.post("/movies/bulk", json=movies)
+
+        async def bulk_ndjson():
+            await client.post("/movies/bulk", content=ndjson, headers={"content-type": "application/x-ndjson"})
+
+        print(f"movies x {rows}")
+        await _measure("single POST", rows, single)
+        await _measure("bulk (JSON)", rows, bulk_json)
+        await _measure("bulk (NDJSON)", rows, bulk_ndjson)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
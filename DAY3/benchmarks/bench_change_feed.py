@@ -0,0 +1,89 @@
+"""변경 피드 벤치마크: 목록 폴링과 변경 피드(/movies/changes)로 변경을 따라가는 비용을 비교합니다.
+
+- 폴링: 영화 1만 개 목록을 `GET /movies/?limit=1000` 페이지로 끝까지 읽는 데 걸리는 시간 (변경이 없어도 매번 듭니다)
+- 피드: 구독자 S 명이 있을 때 영화 수정 N 건을 발행하고, 모든 구독자가 다 받을 때까지의 시간과 변경 1건당 발행 비용
+  (구독자는 같은 프로세스의 태스크입니다. 네트워크 전송 비용은 빠져 있습니다)
+- 느린 구독자: 읽지 않는 구독자가 대기열 한도를 넘으면 resync 로 끊기고, 그 뒤로는 메모리를 쓰지 않는지 확인합니다.
+실행: DAY3 디렉터리에서 `python -m benchmarks.bench_change_feed [changes]`
+"""
+import asyncio
+import sys
+import time
+
+import httpx
+
+from main import app
+from app.models.movies import MovieModel
+from app.utils.change_feed import movie_changes
+
+MOVIES = 10000
+SUBSCRIBERS = (1, 100, 1000)
+
+
+async def _poll() -> float:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        start = time.perf_counter()
+        cursor = None
+        while True:
+            params = {"limit": 1000, **({"cursor": cursor} if cursor else {})}
+            response = await client.get("/movies/", params=params)
+            cursor = response.headers.get("x-next-cursor")
+            if not cursor:
+                return (time.perf_counter() - start) * 1000
+
+
+async def _fan_out(subscribers: int, changes: int, movies) -> None:
+    movie_changes.max_subscribers = max(movie_changes.max_subscribers, subscribers)
+    movie_changes.buffer = max(movie_changes.buffer, changes)
+    received = [0] * subscribers
+    frames = set()
+
+    async def consume(index: int, subscription) -> None:
+        while received[index] < changes:
+            batch = await subscription.wait(60)
+            received[index] += len(batch)
+            frames.update(id(change.frame) for change in batch)
+
+    subscriptions = [movie_changes.subscribe() for _ in range(subscribers)]
+    tasks = [asyncio.create_task(consume(i, subscription)) for i, subscription in enumerate(subscriptions)]
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    for i in range(changes):
+        movie = movies[i % len(movies)]
+        movie.update(movie.title, movie.playtime + 1, movie.genre)
+    published = time.perf_counter() - start
+    await asyncio.gather(*tasks)
+    delivered = time.perf_counter() - start
+    for subscription in subscriptions:
+        movie_changes.unsubscribe(subscription)
+    # 같은 변경은 모든 구독자가 같은 프레임 객체를 받습니다.
+    assert len(frames) == changes, len(frames)
+    print(f"  {subscribers:>5} subscribers   publish {published / changes * 1e6:>7.1f} us/change   "
+          f"all delivered {delivered * 1000:>8.1f} ms   "
+          f"({subscribers * changes / delivered:>9.0f} deliveries/s)")
+
+
+async def _slow_consumer(changes: int, movies) -> None:
+    movie_changes.buffer = 1000
+    slow = movie_changes.subscribe()
+    for i in range(changes):
+        movie = movies[i % len(movies)]
+        movie.update(movie.title, movie.playtime + 1, movie.genre)
+    print(f"  slow subscriber after {changes} changes: resync={slow.resync!r}, queued={len(slow._queue)}, "
+          f"subscribers={movie_changes.stats()['subscribers']}")
+
+
+async def main():
+    changes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    movies = MovieModel.create_many([{"title": f"movie {i}", "playtime": 60 + i % 120, "genre": "drama"}
+                                     for i in range(MOVIES)])
+    print(f"{MOVIES} movies")
+    print(f"  poll full catalog (GET /movies/ x {MOVIES // 1000}) {await _poll():>8.1f} ms per poll")
+    print(f"{changes} updates")
+    for subscribers in SUBSCRIBERS:
+        await _fan_out(subscribers, changes, movies)
+    await _slow_consumer(changes, movies)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
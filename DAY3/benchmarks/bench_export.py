@@ -0,0 +1,53 @@
+"""내보내기 메모리 벤치마크: 행 수가 늘어도 스트리밍 내보내기의 최대 메모리가 일정한지 확인합니다.
+
+실행: DAY3 디렉터리에서 `python -m benchmarks.bench_export [rows]`
+"""
+import asyncio
+import random
+import sys
+import time
+import tracemalloc
+
+from app.models.movies import MovieModel, _reset as reset_movies
+from app.repositories.memory import MemoryMovieRepository
+from app.schemas.movies import MovieRead
+from app.utils.export import export_rows
+
+GENRES = ["action", "drama", "comedy", "horror", "sci-fi"]
+FIELDS = list(MovieRead.model_fields)
+
+
+async def _export(rows: int, fmt: str) -> None:
+    movies = MemoryMovieRepository()
+    # 저장소 자체가 쓰는 메모리는 빼고, 내보내는 동안 늘어난 메모리만 잽니다.
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = 0
+    async for chunk in export_rows(
+            lambda after_id, limit: movies.page(after_id=after_id, limit=limit),
+            lambda movie: movie.id,
+            lambda movie: {field: getattr(movie, field) for field in FIELDS},
+            FIELDS,
+            fmt,
+    ):
+        size += len(chunk)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {fmt:<7} {rows:>9} rows {size / 2 ** 20:>8.1f} MiB out {elapsed:>7.2f} s"
+          f"  peak {peak / 2 ** 20:>6.2f} MiB")
+
+
+async def main():
+    max_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    sizes = [rows for rows in (10_000, 100_000, 1_000_000) if rows < max_rows] + [max_rows]
+    for rows in sizes:
+        reset_movies()
+        MovieModel.create_many([{"title": f"movie {i}", "playtime": random.randint(60, 240),
+                                 "genre": random.choice(GENRES)} for i in range(rows)])
+        for fmt in ("ndjson", "csv"):
+            await _export(rows, fmt)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
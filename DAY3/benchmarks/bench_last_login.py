@@ -0,0 +1,116 @@
+"""last_login 쓰기 버퍼 / 유저 캐시 벤치마크: 로그인 폭주와 /users/me 처리량, 저장소 쓰기 횟수를 비교합니다.
+
+- 백엔드: memory + 로그(WAL) 저장소, SQLite
+- 변경 전: 로그인마다 last_login 을 바로 쓰고, /users/me 마다 저장소에서 유저를 읽습니다.
+- 변경 후: last_login 을 버퍼에 모아 1초마다 한 번에 쓰고, /users/me 는 유저 캐시를 씁니다.
+- 쓰기 경로를 보려는 것이므로 bcrypt cost 를 4 로 낮춘 해시를 씁니다. (실제 cost 12 에서는 로그인 처리량이 bcrypt 로 정해집니다)
+실행: DAY3 디렉터리에서 `python -m benchmarks.bench_last_login [logins]`
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import httpx
+from passlib.hash import bcrypt
+
+from main import app
+from app.models.storage import LogStorage, MemoryStorage
+from app.models.users import UserModel
+from app.repositories import get_user_repository, set_repositories
+from app.repositories.memory import MemoryMovieRepository, MemoryUserRepository
+from app.repositories.sqlite import SqliteMovieRepository, SqlitePool, SqliteUserRepository
+from app.utils.login_buffer import last_login_buffer
+from app.utils.rate_limit import login_guard
+from app.utils.token_cache import token_cache
+from app.utils.user_cache import USER_CACHE_SIZE, user_cache
+
+USERS = 1000
+HOT_USERS = 100  # 폭주 중 로그인하는 유저 수 (같은 유저가 여러 번 로그인)
+CONCURRENCY = 8  # bcrypt 대기열(PASSWORD_MAX_PENDING, 기본 워커 수 × 8)을 넘지 않게 합니다.
+ME_REQUESTS = 5000
+PASSWORD = "password123"
+
+
+class _CountingPool(SqlitePool):
+    """쓰기 트랜잭션 수를 세는 커넥션 풀."""
+
+    writes = 0
+
+    async def execute(self, sql, params=()):
+        self.writes += 1
+        return await super().execute(sql, params)
+
+    async def execute_many(self, sql, rows):
+        self.writes += 1
+        return await super().execute_many(sql, rows)
+
+
+async def _parallel(count: int, make_request) -> float:
+    pending = iter(range(count))
+
+    async def worker():
+        for index in pending:
+            response = await make_request(index)
+            assert response.status_code == 200, response.status_code
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+    return count / (time.perf_counter() - start)
+
+
+async def _run(label: str, logins: int, buffered: bool, writes) -> None:
+    user_cache.clear()
+    token_cache.clear()
+    user_cache.maxsize = USER_CACHE_SIZE if buffered else 0
+    if buffered:
+        last_login_buffer.start(get_user_repository)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        before = writes()
+        login_rps = await _parallel(logins, lambda i: client.post(
+            "/users/login", data={"username": f"user{i % HOT_USERS}", "password": PASSWORD}))
+        await last_login_buffer.stop()
+        login_writes = writes() - before
+
+        tokens = []
+        for i in range(HOT_USERS):
+            response = await client.post("/users/login", data={"username": f"user{i}", "password": PASSWORD})
+            tokens.append({"Authorization": f"Bearer {response.json()['access_token']}"})
+        hits, misses = user_cache.hits, user_cache.misses
+        me_rps = await _parallel(ME_REQUESTS, lambda i: client.get("/users/me", headers=tokens[i % HOT_USERS]))
+        hits, misses = user_cache.hits - hits, user_cache.misses - misses
+    print(f"  {label:<10} logins {login_rps:>7.0f} /s   last_login writes {login_writes:>5} "
+          f"({login_writes / logins:.2f} per login)   /users/me {me_rps:>7.0f} req/s "
+          f"(cache hits {hits}, misses {misses})")
+
+
+async def main():
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    login_guard.by_username.limit = login_guard.by_ip.limit = 0
+    hashed = bcrypt.using(rounds=4).hash(PASSWORD)
+    print(f"{logins} logins over {HOT_USERS} users, {ME_REQUESTS} /users/me, concurrency {CONCURRENCY}")
+    with tempfile.TemporaryDirectory() as directory:
+        print("memory + WAL")
+        storage = LogStorage(os.path.join(directory, "users"))
+        UserModel.use_storage(storage)
+        for i in range(USERS):
+            UserModel._insert(f"user{i}", hashed, 30, "male")
+        for label, buffered in (("before", False), ("after", True)):
+            await _run(label, logins, buffered, lambda: storage._seq)
+        UserModel.close_storage()
+        UserModel.use_storage(MemoryStorage())
+
+        print("sqlite")
+        pool = await _CountingPool(os.path.join(directory, "bench.db")).open()
+        await pool.insert_many("INSERT INTO users (username, hashed_password, age, gender) VALUES (?, ?, ?, ?)",
+                               [(f"user{i}", hashed, 30, "male") for i in range(USERS)])
+        set_repositories(SqliteUserRepository(pool), SqliteMovieRepository(pool))
+        for label, buffered in (("before", False), ("after", True)):
+            await _run(label, logins, buffered, lambda: pool.writes)
+        await pool.close()
+        set_repositories(MemoryUserRepository(), MemoryMovieRepository())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
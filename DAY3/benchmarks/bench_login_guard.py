@@ -0,0 +1,110 @@
+"""로그인 시도 제한 벤치마크: 크리덴셜 스터핑 공격 중에 정상 사용자의 로그인 처리량이 얼마나 유지되는지 잽니다.
+
+- 공격: 적은 수의 IP 에서 여러 연결로 (있는 유저 + 없는 유저) × 틀린 비밀번호를 초당 attack_rps 개씩 보냅니다.
+  (같은 프로세스에서 부하를 만들므로, 공격 클라이언트 자체가 CPU 를 다 쓰지 않게 속도를 정해 둡니다)
+- 정상 사용자: 매번 다른 IP 에서 맞는 비밀번호로 로그인합니다.
+- 제한을 끈 경우와 켠 경우를 같은 시간 동안 실행해 정상 로그인 성공 수 / 지연 시간과 실행된 bcrypt 검증 수를 비교합니다.
+- 마지막으로 틀린 비밀번호 로그인의 응답 시간을 있는 유저 / 없는 유저로 나눠 비교합니다. (dummy 검증으로 비슷해야 합니다)
+실행: DAY3 디렉터리에서 `python -m benchmarks.bench_login_guard [seconds] [attack_rps]`
+"""
+import asyncio
+import itertools
+import statistics
+import sys
+import time
+
+import httpx
+
+from main import app
+from app.models.users import UserModel
+from app.utils.passwords import hash_password, password_service
+from app.utils.rate_limit import login_guard
+
+USERS = 1000
+ATTACK_IPS = 8
+ATTACK_CONNECTIONS = 32
+LEGIT_CONNECTIONS = 2
+PASSWORD = "password123"
+
+
+def _client(ip: str) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app, client=(ip, 40000)), base_url="http://bench")
+
+
+async def _attack(ip: str, interval: float, deadline: float, counts: dict) -> None:
+    targets = itertools.cycle([f"user{i}" for i in range(0, USERS, 7)] + [f"ghost{i}" for i in range(100)])
+    async with _client(ip) as client:
+        next_at = time.perf_counter()
+        while time.perf_counter() < deadline:
+            next_at += interval
+            await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+            response = await client.post("/users/login", data={"username": next(targets), "password": "wrong-pass"})
+            counts[response.status_code] = counts.get(response.status_code, 0) + 1
+
+
+async def _legit(worker: int, deadline: float, latencies: list, counts: dict) -> None:
+    for attempt in itertools.count():
+        if time.perf_counter() >= deadline:
+            return
+        user = (worker * 7919 + attempt * 31) % USERS
+        async with _client(f"10.1.{worker}.{attempt % 250 + 1}") as client:
+            start = time.perf_counter()
+            response = await client.post("/users/login", data={"username": f"user{user}", "password": PASSWORD})
+            counts[response.status_code] = counts.get(response.status_code, 0) + 1
+            if response.status_code == 200:
+                latencies.append((time.perf_counter() - start) * 1000)
+
+
+async def _run(seconds: float, attack_rps: float) -> None:
+    login_guard.by_username.clear()
+    login_guard.by_ip.clear()
+    verifications = password_service.completed
+    deadline = time.perf_counter() + seconds
+    attack_counts, legit_counts, latencies = {}, {}, []
+    await asyncio.gather(
+        *(_attack(f"203.0.113.{i % ATTACK_IPS + 1}", ATTACK_CONNECTIONS / attack_rps, deadline, attack_counts)
+          for i in range(ATTACK_CONNECTIONS)),
+        *(_legit(worker, deadline, latencies, legit_counts) for worker in range(LEGIT_CONNECTIONS)),
+    )
+    ok = legit_counts.get(200, 0)
+    p50 = statistics.median(latencies) if latencies else float("nan")
+    print(f"    legit logins {ok / seconds:>6.1f} /s ok   p50 {p50:>8.1f} ms   "
+          f"legit statuses {dict(sorted(legit_counts.items()))}")
+    print(f"    attack statuses {dict(sorted(attack_counts.items()))}   "
+          f"bcrypt verifications {password_service.completed - verifications}")
+
+
+async def _timing() -> None:
+    # 틀린 비밀번호: 있는 유저 vs 없는 유저 (제한은 끈 상태)
+    async with _client("198.51.100.1") as client:
+        for label, names in (("existing user", [f"user{i}" for i in range(20)]),
+                             ("unknown user", [f"ghost-{i}" for i in range(20)])):
+            latencies = []
+            for name in names:
+                start = time.perf_counter()
+                await client.post("/users/login", data={"username": name, "password": "wrong-pass"})
+                latencies.append((time.perf_counter() - start) * 1000)
+            print(f"    {label:<14} wrong password p50 {statistics.median(latencies):>7.1f} ms")
+
+
+async def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    attack_rps = float(sys.argv[2]) if len(sys.argv) > 2 else 200.0
+    hashed = hash_password(PASSWORD)
+    for i in range(USERS):
+        UserModel._insert(f"user{i}", hashed, 30, "male")
+    print(f"{seconds:.0f} s, {attack_rps:.0f} attack req/s from {ATTACK_IPS} IPs, "
+          f"{LEGIT_CONNECTIONS} legit connections, {password_service.workers} bcrypt workers")
+    limits = (login_guard.by_username.limit, login_guard.by_ip.limit)
+    for label, (per_username, per_ip) in (("limiter off", (0, 0)), ("limiter on", limits)):
+        login_guard.by_username.limit, login_guard.by_ip.limit = per_username, per_ip
+        print(f"  {label} (per username {per_username}, per IP {per_ip})")
+        await _run(seconds, attack_rps)
+    login_guard.by_username.limit = login_guard.by_ip.limit = 0
+    print("  timing")
+    await _timing()
+    password_service.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,63 @@
+"""로그인 폭주 중 /users/me 지연 시간 부하 테스트.
+
+로그인 요청 N 개를 동시에 보내면서 /users/me 를 반복 호출해, bcrypt 가 워커 풀에서 실행되는 동안
+인증된 요청의 지연 시간이 평소와 비슷하게 유지되는지 확인합니다.
+
+실행: DAY3 디렉터리에서 `python -m benchmarks.bench_login_storm [logins]`
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+import httpx
+
+from main import app
+from app.utils.passwords import password_service
+from app.utils.rate_limit import login_guard
+
+ME_REQUESTS = 200
+
+
+async def _me_latencies(client: httpx.AsyncClient, token: str):
+    latencies = []
+    for _ in range(ME_REQUESTS):
+        start = time.perf_counter()
+        response = await client.get("/users/me", headers={"Authorization": f"Bearer {token}"})
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200
+        await asyncio.sleep(0.001)
+    return latencies
+
+
+def _report(label: str, latencies):
+    latencies = sorted(latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"{label:<16} p50 {statistics.median(latencies):7.2f} ms   p99 {p99:7.2f} ms   max {latencies[-1]:7.2f} ms")
+
+
+async def main():
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    # 워커 풀의 동작을 보려는 벤치마크이므로 로그인 시도 제한을 끕니다.
+    login_guard.by_username.limit = login_guard.by_ip.limit = 0
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/users/", json={"username": "bench", "password": "password123", "age": 30, "gender": "male"})
+        response = await client.post("/users/login", data={"username": "bench", "password": "password123"})
+        token = response.json()["access_token"]
+
+        _report("idle", await _me_latencies(client, token))
+
+        async def login():
+            return await client.post("/users/login", data={"username": "bench", "password": "password123"})
+
+        storm = asyncio.gather(*(login() for _ in range(logins)))
+        _report("login storm", await _me_latencies(client, token))
+        statuses = [response.status_code for response in await storm]
+        print(f"logins: {statuses.count(200)} ok, {statuses.count(503)} rejected (503)")
+        print(password_service.metrics())
+    password_service.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
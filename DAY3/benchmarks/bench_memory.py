@@ -0,0 +1,59 @@
+"""레코드당 메모리 벤치마크: 영화/유저 N건을 넣고 모델 + 인덱스가 차지하는 바이트 수를 잽니다.
+
+tracemalloc 은 천만 건에서 너무 느리고 메모리를 많이 쓰므로 프로세스 RSS 증가량으로 잽니다. (Linux 전용)
+해제된 메모리가 다음 측정에 재사용되지 않도록 테이블마다 따로 실행합니다.
+실행: DAY3 디렉터리에서 `[COMPACT_STORAGE=1] python -m benchmarks.bench_memory [rows] [movies|users]`
+(기본 10,000,000 행, movies)
+"""
+import gc
+import os
+import random
+import sys
+import time
+
+from app.models.movies import MovieModel
+from app.models.users import UserModel
+
+GENRES = ["action", "drama", "comedy", "horror", "sci-fi"]
+GENDERS = ["male", "female", "other"]
+
+
+def _rss() -> int:
+    with open("/proc/self/statm") as file:
+        return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _measure(label: str, rows: int, load) -> None:
+    gc.collect()
+    before = _rss()
+    start = time.perf_counter()
+    load()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    used = _rss() - before
+    print(f"  {label:<8} {rows:>11,} rows {used / 2 ** 20:>10.1f} MiB {used / rows:>8.1f} B/row {elapsed:>8.1f} s")
+
+
+def _load_movies(rows: int) -> None:
+    for i in range(rows):
+        # 요청 본문에서 파싱된 것처럼 매번 새 문자열을 만듭니다.
+        MovieModel.create(title=f"movie {i}", playtime=random.randint(60, 240),
+                          genre="".join(random.choice(GENRES)))
+
+
+def _load_users(rows: int) -> None:
+    for i in range(rows):
+        UserModel._insert(f"user{i}", "hashed", random.randint(1, 100), "".join(random.choice(GENDERS)))
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    table = sys.argv[2] if len(sys.argv) > 2 else "movies"
+    if table == "movies":
+        _measure("movies", rows, lambda: _load_movies(rows))
+    else:
+        _measure("users", rows, lambda: _load_users(rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""지표 수집 오버헤드 벤치마크: METRICS_ENABLED=0 / 1 로 같은 요청을 보내 처리량(CPU 시간 기준)을 비교합니다.
+
+지표 설정은 import 시점에 정해지므로 모드마다 자식 프로세스를 새로 띄우고, 번갈아 여러 번 실행합니다.
+공유 머신에서는 잡음이 커서 라운드별 최고값(잡음이 가장 적은 실행)과 중앙값을 함께 보여 줍니다.
+실행: DAY3 디렉터리에서 `python -m benchmarks.bench_metrics [rounds]`
+"""
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+ROWS = 10_000
+REQUESTS = 3000
+ENDPOINTS = ["/movies/{id}", "/movies/?title=movie {id}&limit=20", "/users/{id}", "/movies/?limit=100"]
+
+
+async def _child() -> None:
+    import httpx
+    from main import app
+    from app.models.movies import MovieModel
+    from app.models.users import UserModel
+
+    MovieModel.create_many([{"title": f"movie {i}", "playtime": random.randint(60, 240), "genre": "drama"}
+                            for i in range(ROWS)])
+    for i in range(ROWS):
+        UserModel._insert(f"user{i}", "hashed", random.randint(1, 100), "male")
+    random.seed(0)
+    urls = [random.choice(ENDPOINTS).format(id=random.randint(1, ROWS)) for _ in range(REQUESTS)]
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for url in urls[:300]:  # 워밍업
+            await client.get(url)
+        # 다른 프로세스의 영향을 줄이려고 벽시계 대신 이 프로세스의 CPU 시간으로 잽니다.
+        start = time.process_time()
+        for url in urls:
+            response = await client.get(url)
+            assert response.status_code == 200, response.status_code
+        elapsed = time.process_time() - start
+    print(json.dumps({"rps": REQUESTS / elapsed}))
+
+
+def _run(enabled: bool) -> float:
+    env = {**os.environ, "METRICS_ENABLED": "1" if enabled else "0"}
+    output = subprocess.run([sys.executable, "-m", "benchmarks.bench_metrics", "--child"], env=env, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])["rps"]
+
+
+def main():
+    if sys.argv[1:] == ["--child"]:
+        asyncio.run(_child())
+        return
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    results = {False: [], True: []}
+    for round_index in range(rounds):
+        # 실행 순서에 따른 편향을 없애려고 라운드마다 순서를 바꿉니다.
+        for enabled in ((False, True) if round_index % 2 == 0 else (True, False)):
+            results[enabled].append(_run(enabled))
+    print(f"{REQUESTS} requests x {rounds} rounds ({', '.join(ENDPOINTS)})")
+    for name, pick in (("best", max), ("median", statistics.median)):
+        off, on = pick(results[False]), pick(results[True])
+        print(f"  {name:<6}  metrics off {off:>6.0f} req/s   metrics on {on:>6.0f} req/s   overhead {(off - on) / off:>6.2%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""저장소 백엔드 비교 벤치마크: 메모리(MovieModel/UserModel) vs SQLite(aiosqlite + 커넥션 풀).
+
+실행: DAY3 디렉터리에서 `python -m benchmarks.bench_repositories [rows]`
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+from app.models.users import UserModel
+from app.repositories.memory import MemoryMovieRepository, MemoryUserRepository
+from app.repositories.sqlite import SqliteMovieRepository, SqlitePool, SqliteUserRepository
+from app.utils import passwords
+
+GENRES = ["action", "drama", "comedy", "horror", "sci-fi"]
+CONCURRENCY = 8
+OPERATIONS = 2000
+
+
+async def _measure(label: str, operation) -> None:
+    async def worker(count: int):
+        for _ in range(count):
+            await operation()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(OPERATIONS // CONCURRENCY) for _ in range(CONCURRENCY)))
+    print(f"  {label:<28} {OPERATIONS / (time.perf_counter() - start):>10.0f} ops/s")
+
+
+async def _run(name: str, users, movies, rows: int) -> None:
+    print(name)
+    start = time.perf_counter()
+    for i in range(rows):
+        await movies.create(title=f"movie {i}", playtime=random.randint(60, 240), genre=random.choice(GENRES))
+        await users.create(username=f"user{i}", password="password123", age=random.randint(1, 100), gender="male")
+    print(f"  {'load ' + str(rows) + ' rows':<28} {time.perf_counter() - start:>10.2f} s")
+
+    await _measure("movies.get_by_id", lambda: movies.get_by_id(random.randint(1, rows)))
+    await _measure("users.get_by_username", lambda: users.get_by_username(f"user{random.randint(0, rows - 1)}"))
+    await _measure("movies.page(limit=100)", lambda: movies.page(after_id=random.randint(0, rows), limit=100))
+    await _measure("movies.search(genre, limit=100)", lambda: movies.search(genre="sci", limit=100))
+    await _measure("movies.update", lambda: movies.update(random.randint(1, rows), "updated", 100, "drama"))
+
+
+async def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    # bcrypt 해싱은 백엔드 비교와 무관하므로 건너뜁니다.
+    passwords.hash_password = lambda password: password
+    UserModel.get_hashed_password = classmethod(lambda cls, password: password)
+
+    await _run("memory", MemoryUserRepository(), MemoryMovieRepository(), rows)
+
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    pool = await SqlitePool(path, size=4).open()
+    try:
+        await _run("sqlite", SqliteUserRepository(pool), SqliteMovieRepository(pool), rows)
+    finally:
+        await pool.close()
+        passwords.password_service.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
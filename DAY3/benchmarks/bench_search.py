@@ -0,0 +1,48 @@
+"""UserModel.search / MovieModel.search 벤치마크 (보조 인덱스 + 플래너).
+
+실행: DAY3 디렉터리에서 `python -m benchmarks.bench_search [rows]`
+"""
+import random
+import sys
+import time
+
+from app.models.movies import MovieModel
+from app.models.users import UserModel
+
+GENRES = ["action", "drama", "comedy", "horror", "sci-fi", "romance", "thriller", "animation"]
+GENDERS = ["male", "female", "other"]
+REPEAT = 200
+
+
+def _fill(n: int):
+    # bcrypt 해싱은 검색 성능과 무관하므로 벤치마크에서는 건너뜁니다.
+    UserModel.get_hashed_password = classmethod(lambda cls, password: password)
+    for i in range(n):
+        UserModel.create(username=f"user{i}", password="password123", age=random.randint(1, 100),
+                         gender=random.choice(GENDERS))
+        MovieModel.create(title=f"movie {i}", playtime=random.randint(60, 240), genre=random.choice(GENRES))
+
+
+def _measure(label: str, fn):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        count = len(fn())
+    elapsed = (time.perf_counter() - start) / REPEAT * 1e3
+    print(f"{label:<45} {elapsed:>10.3f} ms  ({count} rows)")
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    _fill(rows)
+    print(f"rows = {rows}")
+    _measure("users: username", lambda: UserModel.search(username="user4242"))
+    _measure("users: username + gender", lambda: UserModel.search(username="user4242", gender="male"))
+    _measure("users: age=30 + gender=female", lambda: UserModel.search(age=30, gender="female"))
+    _measure("users: 30 <= age <= 31 + gender=other", lambda: UserModel.search(gender="other", min_age=30, max_age=31))
+    _measure("movies: playtime = 100", lambda: MovieModel.search(min_playtime=100, max_playtime=100))
+    _measure("movies: genre=sci + playtime = 100",
+             lambda: MovieModel.search(genre="sci", min_playtime=100, max_playtime=100))
+
+
+if __name__ == "__main__":
+    main()
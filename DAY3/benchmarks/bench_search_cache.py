@@ -0,0 +1,92 @@
+"""검색 응답 캐시 벤치마크: Zipf 분포를 따르는 검색 쿼리로 캐시 사용 / 미사용 처리량을 비교합니다.
+
+인기 쿼리 몇 개가 대부분을 차지하는 실제 트래픽을 흉내 내어, 쿼리 k 를 1/k^s 에 비례하는 확률로 고릅니다.
+쓰기 비율을 바꿔 가며(쓰기마다 컬렉션 버전이 바뀌어 캐시가 무효화됨) 적중률과 처리량이 어떻게 변하는지 봅니다.
+실행: DAY3 디렉터리에서 `python -m benchmarks.bench_search_cache [rows] [zipf_s]`
+"""
+import asyncio
+import random
+import sys
+import time
+
+import httpx
+
+from main import app
+from app.models.movies import MovieModel
+from app.models.users import UserModel
+from app.utils.response_cache import movie_search_cache, user_search_cache
+
+GENRES = ["action", "drama", "comedy", "horror", "sci-fi"]
+DISTINCT_QUERIES = 2000
+REQUESTS = 5000
+WRITE_RATIOS = [0.0, 0.001, 0.01]
+
+
+def _load(rows: int) -> None:
+    MovieModel.create_many([{"title": f"movie {i}", "playtime": random.randint(60, 240),
+                             "genre": random.choice(GENRES)} for i in range(rows)])
+    for i in range(rows):
+        UserModel._insert(f"user{i}", "hashed", random.randint(1, 100), random.choice(["male", "female"]))
+
+
+def _queries() -> list:
+    # 영화 제목 / 장르 / 상영 시간 범위, 유저 나이 / 성별 검색을 섞은 쿼리 목록 (앞쪽일수록 인기 쿼리)
+    queries = []
+    for _ in range(DISTINCT_QUERIES):
+        kind = random.random()
+        if kind < 0.4:
+            queries.append(f"/movies/?title=movie {random.randint(1, 999)}&limit=50")
+        elif kind < 0.6:
+            low = random.randint(60, 200)
+            queries.append(f"/movies/?genre={random.choice(GENRES)}&min_playtime={low}&max_playtime={low + 20}&limit=50")
+        elif kind < 0.8:
+            queries.append(f"/users/search/?min_age={random.randint(1, 80)}&gender=female&limit=50")
+        else:
+            queries.append(f"/users/search/?age={random.randint(1, 100)}&limit=50")
+    random.shuffle(queries)
+    return queries
+
+
+def _zipf_workload(queries: list, s: float) -> list:
+    weights = [1 / rank ** s for rank in range(1, len(queries) + 1)]
+    return random.choices(queries, weights=weights, k=REQUESTS)
+
+
+async def _run(client: httpx.AsyncClient, workload: list, write_ratio: float, rows: int) -> float:
+    start = time.perf_counter()
+    for url in workload:
+        if random.random() < write_ratio:
+            movie_id = random.randint(1, rows)
+            await client.put(f"/movies/{movie_id}", json={"title": f"movie {movie_id}", "playtime": 100,
+                                                            "genre": random.choice(GENRES)})
+            await client.patch(f"/users/{movie_id}", json={"age": random.randint(1, 100)})
+        response = await client.get(url)
+        assert response.status_code in (200, 404), response.status_code
+    return len(workload) / (time.perf_counter() - start)
+
+
+async def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    s = float(sys.argv[2]) if len(sys.argv) > 2 else 1.1
+    _load(rows)
+    workload = _zipf_workload(_queries(), s)
+    print(f"{rows} movies / users, {DISTINCT_QUERIES} distinct queries, {REQUESTS} requests, zipf s={s}")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        await _run(client, workload[:500], 0.0, rows)  # 워밍업
+        for write_ratio in WRITE_RATIOS:
+            results = {}
+            for size in (0, 1024):
+                for cache in (movie_search_cache, user_search_cache):
+                    cache.maxsize = size
+                    cache.clear()
+                    cache.hits = cache.misses = cache.evictions = cache.invalidations = cache.expirations = 0
+                results[size] = await _run(client, workload, write_ratio, rows)
+            hits = movie_search_cache.hits + user_search_cache.hits
+            lookups = hits + movie_search_cache.misses + user_search_cache.misses
+            invalidations = movie_search_cache.invalidations + user_search_cache.invalidations
+            print(f"  writes {write_ratio:>6.1%}   no cache {results[0]:>8.0f} req/s   cache {results[1024]:>8.0f} req/s"
+                  f"   x{results[1024] / results[0]:.1f}   hit ratio {hits / lookups:.1%}   invalidations {invalidations}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
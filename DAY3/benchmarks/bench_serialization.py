@@ -0,0 +1,90 @@
+"""응답 직렬화 벤치마크: response_model 검증 경로 vs FAST_RESPONSES 경로.
+
+엔드포인트마다 ASGI 요청 처리량을 비교하고, 직렬화만 따로 떼어 잰 결과도 함께 출력합니다.
+실행: DAY3 디렉터리에서 `python -m benchmarks.bench_serialization [rows]`
+"""
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from typing import List
+
+import httpx
+from pydantic import TypeAdapter
+
+from main import app
+from app.models.movies import MovieModel
+from app.models.users import UserModel
+from app.schemas.movies import MovieRead
+from app.schemas.users import UserRead
+from app.utils import serializers
+
+GENRES = ["action", "drama", "comedy", "horror", "sci-fi"]
+REQUESTS = 200
+ENDPOINTS = [
+    "/movies/?limit=1000",
+    "/movies/?genre=sci&limit=1000",
+    "/movies/1",
+    "/users/?limit=1000",
+    "/users/search/?min_age=20&limit=1000",
+    "/users/1",
+]
+
+
+def _load(rows: int) -> None:
+    MovieModel.create_many([{"title": f"movie {i}", "playtime": random.randint(60, 240),
+                             "genre": random.choice(GENRES)} for i in range(rows)])
+    for i in range(rows):
+        user = UserModel._insert(f"user{i}", "hashed", random.randint(1, 100), "male")
+        user["last_login"] = datetime.now(timezone.utc)
+
+
+def _timeit(label: str, func, repeat: int = 50) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"  {label:<40} {elapsed * 1000:>8.3f} ms")
+    return elapsed
+
+
+async def _endpoints() -> None:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for url in ENDPOINTS:
+            results = {}
+            for fast in (False, True):
+                serializers.FAST_RESPONSES = fast
+                start = time.perf_counter()
+                for _ in range(REQUESTS):
+                    response = await client.get(url)
+                results[fast] = REQUESTS / (time.perf_counter() - start)
+                assert response.status_code == 200, response.text
+            print(f"  {url:<40} {results[False]:>8.0f} -> {results[True]:>8.0f} req/s"
+                  f"  (x{results[True] / results[False]:.2f})")
+
+
+def _encoders() -> None:
+    movies = MovieModel.page(limit=1000)
+    users = UserModel.page(limit=1000)
+    for label, adapter, encoder, records in (
+            ("movies", TypeAdapter(List[MovieRead]), serializers.movie_encoder, movies),
+            ("users", TypeAdapter(List[UserRead]), serializers.user_encoder, users),
+    ):
+        assert adapter.dump_json(adapter.validate_python(records, from_attributes=True)) == encoder.many(records)
+        _timeit(f"{label} x1000 validate + dump_json", lambda adapter=adapter, records=records: adapter.dump_json(
+            adapter.validate_python(records, from_attributes=True)))
+        _timeit(f"{label} x1000 encoder.many", lambda encoder=encoder, records=records: encoder.many(records))
+
+
+async def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    _load(rows)
+    print(f"endpoints ({REQUESTS} requests each, {'orjson' if serializers.orjson else 'pydantic_core'})")
+    await _endpoints()
+    print("serialization only")
+    _encoders()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,88 @@
+"""시작 시간 벤치마크: STARTUP_MODE=eager / lazy 로 앱 import 시간과 엔드포인트별 첫 요청 지연 시간을 잽니다.
+
+모드마다 새 프로세스를 띄워(import 캐시가 없는 상태) 측정하고, 여러 번 실행한 중앙값을 비교합니다.
+- import: `import main` 에 걸린 시간
+- ready: import + lifespan 시작(fixture 시드 포함) + 첫 GET /movies/1 응답까지 (콜드 스타트에서 사용자가 느끼는 시간)
+- 첫 로그인 / 첫 /users/me: passlib / bcrypt / python-jose 를 처음 불러오는 비용이 포함됩니다.
+ready 중앙값이 회귀 예산(--budget-ms, 기본 750 ms)보다 긴 모드가 있으면 종료 코드 1 로 끝납니다.
+실행: DAY3 디렉터리에서 `python -m benchmarks.bench_startup [--rounds N] [--budget-ms MS]`
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+def _child() -> None:
+    import asyncio
+
+    start = time.perf_counter()
+    from main import app
+    results = {"import_ms": (time.perf_counter() - start) * 1000}
+
+    async def first_requests():
+        import httpx
+
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+                steps = [
+                    ("get_movie_ms", lambda: client.get("/movies/1")),
+                    ("login_ms", lambda: client.post("/users/login",
+                                                     data={"username": "john_doe", "password": "password123"})),
+                ]
+                for name, request in steps:
+                    step_start = time.perf_counter()
+                    response = await request()
+                    assert response.status_code == 200, (name, response.status_code)
+                    results[name] = (time.perf_counter() - step_start) * 1000
+                    if name == "get_movie_ms":
+                        results["ready_ms"] = (time.perf_counter() - start) * 1000
+                token = response.json()["access_token"]
+                step_start = time.perf_counter()
+                response = await client.get("/users/me", headers={"Authorization": f"Bearer {token}"})
+                assert response.status_code == 200, response.status_code
+                results["me_ms"] = (time.perf_counter() - step_start) * 1000
+
+    asyncio.run(first_requests())
+    print(json.dumps(results))
+
+
+def _run(mode: str) -> dict:
+    env = {**os.environ, "STARTUP_MODE": mode, "SEED_FIXTURE": "default", "REPOSITORY_BACKEND": "memory"}
+    output = subprocess.run([sys.executable, "-m", "benchmarks.bench_startup", "--child"], env=env, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=750, help="ready 시간의 상한 (ms)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        _child()
+        return
+
+    runs = {"eager": [], "lazy": []}
+    for round_index in range(args.rounds):
+        for mode in (("eager", "lazy") if round_index % 2 == 0 else ("lazy", "eager")):
+            runs[mode].append(_run(mode))
+    medians = {mode: {key: statistics.median(run[key] for run in results) for key in results[0]}
+               for mode, results in runs.items()}
+    print(f"median of {args.rounds} runs (ms)")
+    print(f"  {'mode':<6} {'import':>8} {'ready':>8} {'GET /movies/1':>14} {'first login':>12} {'first /me':>10}")
+    for mode, median in medians.items():
+        print(f"  {mode:<6} {median['import_ms']:>8.1f} {median['ready_ms']:>8.1f} {median['get_movie_ms']:>14.1f}"
+              f" {median['login_ms']:>12.1f} {median['me_ms']:>10.1f}")
+    over = [mode for mode, median in medians.items() if median["ready_ms"] > args.budget_ms]
+    print(f"  ready budget {args.budget_ms:.0f} ms: {'OVER BUDGET (' + ', '.join(over) + ')' if over else 'OK'}")
+    if over:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""통계 벤치마크: 전체 영화를 파이썬으로 순회하는 방식 vs Histogram 집계 + NumPy 요약.
+
+모델 전체(인덱스 포함)를 천만 건 채우는 대신, 같은 레코드로 Histogram 만 채워 계산 비용을 비교합니다.
+실행: DAY3 디렉터리에서 `python -m benchmarks.bench_stats [rows ...]` (기본 1,000,000 과 10,000,000)
+"""
+import math
+import random
+import sys
+import time
+
+from app.models.indexes import Histogram
+from app.models.movies import MovieModel
+from app.utils.stats import PERCENTILES, cached, playtime_stats
+
+GENRES = ["action", "drama", "comedy", "horror", "sci-fi", "romance", "thriller", "animation"]
+
+
+def naive_stats(movies) -> dict:
+    """기존처럼 전체 목록을 가져와 장르별로 모은 뒤 정렬해서 계산합니다."""
+    groups = {}
+    for movie in movies:
+        groups.setdefault(movie.genre.lower(), []).append(movie.playtime)
+    genres = {}
+    for genre, playtimes in sorted(groups.items()):
+        playtimes.sort()
+        count = len(playtimes)
+        total = sum(playtimes)
+        genres[genre] = {
+            "count": count,
+            "total_playtime": total,
+            "avg_playtime": total / count,
+            **{f"p{p}_playtime": playtimes[max(math.ceil(p / 100 * count), 1) - 1] for p in PERCENTILES},
+        }
+    return {"count": len(movies), "genres": genres}
+
+
+def _timeit(label: str, func, repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"  {label:<36} {elapsed * 1e6:>14.1f} us")
+    return elapsed
+
+
+def _run(rows: int) -> None:
+    movies = [MovieModel(id=i, title="", playtime=random.randint(60, 240), genre=random.choice(GENRES))
+              for i in range(1, rows + 1)]
+    histogram = Histogram(lambda movie: movie.genre.lower(), lambda movie: movie.playtime)
+    for movie in movies:
+        histogram.add(movie.id, movie)
+
+    print(f"rows = {rows:,}")
+    assert naive_stats(movies) == playtime_stats(histogram.groups())
+    _timeit("naive iteration", lambda: naive_stats(movies))
+    _timeit("histogram + numpy (cold)", lambda: playtime_stats(histogram.groups()), repeat=20)
+    def stats():
+        return cached(("bench", rows), histogram.version, lambda: playtime_stats(histogram.groups()))
+
+    stats()
+    _timeit("histogram + numpy (cached)", stats, repeat=10_000)
+
+    # 변경 한 건 = 분포 갱신 + 다음 요청 때 요약 다시 계산
+    def update_then_stats():
+        movie = random.choice(movies)
+        histogram.remove(movie.id, movie)
+        movie.playtime = random.randint(60, 240)
+        histogram.add(movie.id, movie)
+        stats()
+
+    _timeit("update + stats", update_then_stats, repeat=1000)
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000_000, 10_000_000]
+    for rows in sizes:
+        _run(rows)
+
+
+if __name__ == "__main__":
+    main()
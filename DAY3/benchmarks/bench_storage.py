@@ -0,0 +1,57 @@
+"""LogStorage 벤치마크: group commit 에 따른 쓰기 처리량과 레코드 수에 따른 복구 시간.
+
+실행: DAY3 디렉터리에서 `python -m benchmarks.bench_storage [records]`
+"""
+import shutil
+import sys
+import tempfile
+import time
+
+from app.models.movies import MovieModel
+from app.models.storage import LogStorage
+
+WRITES = 2_000
+
+
+def _write_throughput(directory: str, flush_interval: float, writes: int) -> float:
+    storage = LogStorage(directory, flush_interval=flush_interval, snapshot_every=10 ** 9)
+    MovieModel.use_storage(storage)
+    start = time.perf_counter()
+    for i in range(writes):
+        MovieModel.create(title=f"movie {i}", playtime=120, genre="drama")
+    MovieModel.close_storage()  # 남은 버퍼까지 fsync 한 시간을 포함합니다.
+    return writes / (time.perf_counter() - start)
+
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    root = tempfile.mkdtemp()
+    try:
+        print("write throughput")
+        for flush_interval, writes in [(0, WRITES), (0.001, WRITES * 10), (0.01, WRITES * 50)]:
+            rate = _write_throughput(f"{root}/w{flush_interval}", flush_interval, writes)
+            label = "fsync per write" if flush_interval == 0 else f"group commit {flush_interval * 1000:g} ms"
+            print(f"  {label:<24} {rate:>10.0f} writes/s")
+
+        print(f"recovery ({records} records)")
+        MovieModel.use_storage(LogStorage(f"{root}/r", snapshot_every=10 ** 9))
+        for i in range(records):
+            MovieModel.create(title=f"movie {i}", playtime=120, genre="drama")
+        MovieModel.close_storage()
+
+        start = time.perf_counter()
+        MovieModel.use_storage(LogStorage(f"{root}/r", snapshot_every=10 ** 9))
+        print(f"  log only                 {time.perf_counter() - start:>10.2f} s")
+
+        MovieModel.snapshot()
+        MovieModel.close_storage()
+        start = time.perf_counter()
+        MovieModel.use_storage(LogStorage(f"{root}/r", snapshot_every=10 ** 9))
+        print(f"  snapshot                 {time.perf_counter() - start:>10.2f} s")
+        MovieModel.close_storage()
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""MovieModel.search(title=...) 벤치마크: trigram 역색인 vs 기존 선형 스캔.
+
+두 방식의 결과가 같은지도 함께 확인합니다.
+실행: DAY3 디렉터리에서 `python -m benchmarks.bench_title_search [rows]`
+"""
+import random
+import string
+import sys
+import time
+
+from app.models import movies
+from app.models.movies import MovieModel
+
+GENRES = ["action", "drama", "comedy", "horror", "sci-fi", "romance", "thriller", "animation"]
+WORDS = ["star", "war", "night", "love", "dark", "king", "return", "lost", "city", "dream", "blue", "iron"]
+QUERIES = ["star", "Night Ki", "return of", "xyz", "lost city", "dream", "ing"]
+REPEAT = 20
+
+
+def linear_search(title: str):
+    # 인덱스 도입 전 MovieModel.search 와 같은 방식
+    return [movie for movie in movies._db.values() if title.lower() in movie.title.lower()]
+
+
+def _random_title() -> str:
+    words = random.choices(WORDS, k=random.randint(1, 4))
+    return " ".join(words) + " " + "".join(random.choices(string.ascii_lowercase, k=4))
+
+
+def _measure(fn, query: str) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn(query)
+    return (time.perf_counter() - start) / REPEAT * 1e3
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    start = time.perf_counter()
+    for _ in range(rows):
+        MovieModel.create(title=_random_title(), playtime=random.randint(60, 240), genre=random.choice(GENRES))
+    print(f"rows = {rows}, build {time.perf_counter() - start:.1f}s")
+    print(f"{'query':<12} {'rows':>8} {'linear(ms)':>12} {'ngram(ms)':>12}")
+    for query in QUERIES:
+        expected = linear_search(query)
+        assert MovieModel.search(title=query) == expected, query
+        linear = _measure(linear_search, query)
+        indexed = _measure(lambda q: MovieModel.search(title=q), query)
+        print(f"{query!r:<12} {len(expected):>8} {linear:>12.3f} {indexed:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""/users/me 처리량(RPS) 벤치마크: 검증된 토큰 캐시 사용 vs 미사용.
+
+실행: DAY3 디렉터리에서 `python -m benchmarks.bench_token_cache [requests]`
+"""
+import asyncio
+import sys
+import time
+
+import httpx
+
+from main import app
+from app.utils.passwords import password_service
+from app.utils.token_cache import token_cache
+
+CONCURRENCY = 16
+
+
+async def _run(client: httpx.AsyncClient, token: str, requests: int) -> float:
+    headers = {"Authorization": f"Bearer {token}"}
+
+    async def worker(count: int):
+        for _ in range(count):
+            response = await client.get("/users/me", headers=headers)
+            assert response.status_code == 200
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(requests // CONCURRENCY) for _ in range(CONCURRENCY)))
+    return requests / (time.perf_counter() - start)
+
+
+async def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/users/", json={"username": "bench", "password": "password123", "age": 30, "gender": "male"})
+        response = await client.post("/users/login", data={"username": "bench", "password": "password123"})
+        token = response.json()["access_token"]
+
+        maxsize = token_cache.maxsize
+        token_cache.maxsize = 0
+        without_cache = await _run(client, token, requests)
+        token_cache.maxsize = maxsize
+        with_cache = await _run(client, token, requests)
+
+    print(f"without cache: {without_cache:8.0f} req/s")
+    print(f"with cache:    {with_cache:8.0f} req/s")
+    print(token_cache.stats())
+    password_service.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,45 @@
+"""UserModel 조회 지연 시간 벤치마크.
+
+유저 수를 1k -> 1M 으로 늘려가며 get_by_id / get_by_username / 중복 username 체크(create)의
+평균 지연 시간을 측정합니다. 인덱스 기반 저장소라면 유저 수와 무관하게 값이 일정해야 합니다.
+
+실행: DAY3 디렉터리에서 `python -m benchmarks.bench_user_lookup`
+"""
+import random
+import time
+
+from app.models.users import UserModel
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+LOOKUPS = 100_000
+
+
+def _fill(n: int):
+    # bcrypt 해싱은 조회 성능과 무관하므로 벤치마크에서는 건너뜁니다.
+    UserModel.get_hashed_password = classmethod(lambda cls, password: password)
+    for i in range(n):
+        UserModel.create(username=f"user{i}", password="password123", age=20 + i % 50, gender="male")
+
+
+def _measure(fn, keys) -> float:
+    start = time.perf_counter()
+    for key in keys:
+        fn(key)
+    return (time.perf_counter() - start) / len(keys) * 1e9
+
+
+def main():
+    print(f"{'users':>10} {'get_by_id(ns)':>15} {'get_by_username(ns)':>20} {'dup check(ns)':>15}")
+    for n in SIZES:
+        UserModel._reset()
+        _fill(n)
+        ids = [random.randint(1, n) for _ in range(LOOKUPS)]
+        names = [f"user{i - 1}" for i in ids]
+        by_id = _measure(UserModel.get_by_id, ids)
+        by_name = _measure(UserModel.get_by_username, names)
+        dup = _measure(lambda name: UserModel.create(name, "password123", 30, "male"), names)
+        print(f"{n:>10} {by_id:>15.1f} {by_name:>20.1f} {dup:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
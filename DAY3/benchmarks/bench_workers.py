@@ -0,0 +1,136 @@
+"""멀티 워커 확장성 벤치마크: shared 백엔드(store.py)로 uvicorn 워커 수를 1 → 8 로 늘리며 RPS 를 잽니다.
+
+- 저장소 프로세스 하나를 띄우고 영화 / 유저를 미리 넣은 뒤, 워커 수마다 uvicorn 을 새로 띄워 같은 부하를 줍니다.
+- 부하는 여러 프로세스에서 keep-alive 연결로 GET /movies/{id} 와 제목 검색(GET /movies/?title=)을 섞어 보냅니다.
+- 워커 수마다 "한 워커에서 가입 → 다른 연결(다른 워커일 수 있음)에서 로그인" 이 모두 성공하는지도 확인합니다.
+- 비교용으로 같은 부하를 in-process 메모리 백엔드(워커 1개)에도 줍니다.
+실행: DAY3 디렉터리에서 `python -m benchmarks.bench_workers [workers ...]` (기본 1 2 4 8, CPU 코어가 워커 수 이상이어야 의미가 있습니다)
+"""
+import asyncio
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROWS = 10_000
+DURATION = 5.0
+LOAD_PROCESSES = max(1, min(8, (os.cpu_count() or 1) // 2))
+CONNECTIONS = 8  # 부하 프로세스당 동시 연결 수 (httpx 는 연결이 많으면 오히려 느려집니다)
+PORT = 8765
+BASE_URL = f"http://127.0.0.1:{PORT}"
+
+
+def _start(command, env):
+    return subprocess.Popen(command, env={**os.environ, **env}, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def _wait_ready(process, url: str) -> None:
+    for _ in range(200):
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with {process.returncode}")
+        try:
+            httpx.get(url, timeout=0.5)
+            return
+        except httpx.TransportError:
+            time.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+def _stop(process) -> None:
+    process.terminate()
+    process.wait(timeout=30)
+
+
+async def _load(duration: float) -> int:
+    requests = 0
+    deadline = time.perf_counter() + duration
+
+    async def connection(client: httpx.AsyncClient):
+        nonlocal requests
+        while time.perf_counter() < deadline:
+            if random.random() < 0.8:
+                response = await client.get(f"/movies/{random.randint(1, ROWS)}")
+            else:
+                response = await client.get("/movies/", params={"title": f"movie {random.randint(1, 999)}", "limit": 20})
+            assert response.status_code == 200, response.status_code
+            requests += 1
+
+    limits = httpx.Limits(max_connections=CONNECTIONS, max_keepalive_connections=CONNECTIONS)
+    async with httpx.AsyncClient(base_url=BASE_URL, limits=limits) as client:
+        await asyncio.gather(*(connection(client) for _ in range(CONNECTIONS)))
+    return requests
+
+
+def _load_process(duration: float) -> int:
+    return asyncio.run(_load(duration))
+
+
+def _measure_rps() -> float:
+    with multiprocessing.Pool(LOAD_PROCESSES) as pool:
+        return sum(pool.map(_load_process, [DURATION] * LOAD_PROCESSES)) / DURATION
+
+
+def _seed() -> None:
+    genres = ["action", "drama", "comedy", "horror", "sci-fi"]
+    with httpx.Client(base_url=BASE_URL, timeout=60) as client:
+        for start in range(0, ROWS, 1000):
+            movies = [{"title": f"movie {i}", "playtime": random.randint(60, 240), "genre": random.choice(genres)}
+                      for i in range(start, start + 1000)]
+            assert client.post("/movies/bulk", json=movies).status_code == 200
+
+
+def _check_cross_worker_login(workers: int) -> int:
+    # 연결을 매번 새로 열어 커널이 요청을 여러 워커에 나눠 주도록 합니다.
+    username = f"user-{workers}-{random.randint(0, 1 << 30)}"
+    body = {"username": username, "password": "password123", "age": 30, "gender": "male"}
+    assert httpx.post(f"{BASE_URL}/users/", json=body).status_code == 201
+    logins = 0
+    for _ in range(workers * 2):
+        response = httpx.post(f"{BASE_URL}/users/login", data={"username": username, "password": "password123"})
+        assert response.status_code == 200, f"login failed on another worker: {response.status_code}"
+        logins += 1
+    return logins
+
+
+def main():
+    worker_counts = [int(arg) for arg in sys.argv[1:]] or [1, 2, 4, 8]
+    socket_path = os.path.join(tempfile.mkdtemp(), "store.sock")
+    uvicorn = [sys.executable, "-m", "uvicorn", "main:app", "--port", str(PORT), "--log-level", "warning",
+               "--no-access-log"]
+    print(f"{ROWS} movies, {LOAD_PROCESSES} load processes x {CONNECTIONS} connections, {DURATION:.0f} s per run, "
+          f"{os.cpu_count()} CPUs")
+
+    # 기준: in-process 메모리 백엔드, 워커 1개
+    server = _start(uvicorn, {"REPOSITORY_BACKEND": "memory"})
+    try:
+        _wait_ready(server, f"{BASE_URL}/movies/stats")
+        _seed()
+        print(f"  {'memory, 1 worker':<24} {_measure_rps():>10.0f} req/s")
+    finally:
+        _stop(server)
+
+    store = _start([sys.executable, "store.py"], {"STORE_SOCKET": socket_path})
+    try:
+        env = {"REPOSITORY_BACKEND": "shared", "STORE_SOCKET": socket_path}
+        for index, workers in enumerate(worker_counts):
+            server = _start([*uvicorn, "--workers", str(workers)], env)
+            try:
+                _wait_ready(server, f"{BASE_URL}/movies/stats")
+                if index == 0:
+                    _seed()
+                rps = _measure_rps()
+                logins = _check_cross_worker_login(workers)
+                print(f"  {f'shared, {workers} workers':<24} {rps:>10.0f} req/s   cross-worker logins ok: {logins}")
+            finally:
+                _stop(server)
+    finally:
+        _stop(store)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""동시성 스트레스 테스트: 여러 스레드와 asyncio 태스크가 모델을 동시에 고쳐도 불변식이 지켜지는지 확인합니다.
+
+- id 는 중복 없이 1..N 으로 발급된다.
+- 같은 username 으로 동시에 가입하면 정확히 하나만 성공한다.
+- 쓰기가 계속되는 동안 검색이 예외 없이 일관된 결과를 돌려준다.
+- expected_version 으로 재시도하는 증가 연산은 하나도 유실되지 않는다.
+실행: DAY3 디렉터리에서 `python -m benchmarks.stress_concurrency [threads]`
+"""
+import asyncio
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.models.concurrency import VersionConflict
+from app.models.movies import MovieModel, _reset as reset_movies
+from app.models.users import UserModel
+from app.repositories.memory import MemoryMovieRepository
+from app.schemas.users import UserUpdate
+
+GENRES = ["action", "drama", "comedy"]
+PER_THREAD = 2000
+
+
+def _run_threads(threads: int, target) -> list:
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return [future.result() for future in [pool.submit(target, index) for index in range(threads)]]
+
+
+def check_id_allocation(threads: int) -> None:
+    reset_movies()
+    created = _run_threads(threads, lambda _: [
+        MovieModel.create(title="t", playtime=random.randint(1, 100), genre=random.choice(GENRES)).id
+        for _ in range(PER_THREAD)
+    ])
+    ids = sorted(movie_id for batch in created for movie_id in batch)
+    assert ids == list(range(1, threads * PER_THREAD + 1)), "id 가 중복되거나 비었습니다"
+    assert len(MovieModel.all()) == len(ids)
+    print(f"  id allocation: {len(ids)} movies from {threads} threads, ids unique and contiguous")
+
+
+def check_username_uniqueness(threads: int) -> None:
+    UserModel._reset()
+    barrier = threading.Barrier(threads)
+
+    def signup(_):
+        results = []
+        for i in range(200):
+            if i == 0:
+                barrier.wait()
+            results.append(UserModel._insert(f"user{i}", "hashed", 20, "male"))
+        return results
+
+    results = [user for batch in _run_threads(threads, signup) for user in batch if user is not None]
+    assert len(results) == 200 and len({user["username"] for user in results}) == 200
+    print(f"  username uniqueness: {threads} threads x 200 signups -> {len(results)} users")
+
+
+def check_reads_during_writes(threads: int) -> None:
+    reset_movies()
+    MovieModel.create_many([{"title": f"movie {i}", "playtime": i % 200 + 1, "genre": random.choice(GENRES)}
+                            for i in range(5000)])
+    stop = threading.Event()
+    errors = []
+
+    def writer(_):
+        while not stop.is_set():
+            movie = MovieModel.create(title="new movie", playtime=random.randint(1, 200), genre="drama")
+            MovieModel.get_by_id(movie.id).update("renamed", random.randint(1, 200), "action")
+            MovieModel.delete(random.randint(1, movie.id))
+
+    def reader(_):
+        count = 0
+        while not stop.is_set():
+            try:
+                found = MovieModel.search(title="movie", min_playtime=50, max_playtime=150, limit=100)
+                assert all(50 <= movie.playtime <= 150 for movie in found)
+                ids = [movie.id for movie in MovieModel.page(after_id=random.randint(0, 5000), limit=50)]
+                assert ids == sorted(ids)
+                count += 1
+            except Exception as error:  # 스트레스 테스트이므로 모든 예외를 모읍니다.
+                errors.append(error)
+        return count
+
+    with ThreadPoolExecutor(max_workers=threads * 2) as pool:
+        writers = [pool.submit(writer, index) for index in range(threads)]
+        readers = [pool.submit(reader, index) for index in range(threads)]
+        time.sleep(3)
+        stop.set()
+        reads = sum(future.result() for future in readers)
+        for future in writers:
+            future.result()
+    assert not errors, errors[:3]
+    print(f"  reads during writes: {reads} searches while {threads} writers ran, no errors")
+
+
+def check_optimistic_updates(threads: int) -> None:
+    UserModel._reset()
+    user = UserModel._insert("counter", "hashed", 1, "male")
+
+    def increment(_):
+        retries = 0
+        for _ in range(200):
+            while True:
+                # get_by_id 는 저장된 dict 를 그대로 돌려주므로 버전을 먼저 읽어야 값과 버전이 어긋나지 않습니다.
+                current = UserModel.get_by_id(user["id"])
+                version = current["version"]
+                try:
+                    UserModel.update(user["id"], UserUpdate(age=current["age"] + 1), expected_version=version)
+                    break
+                except VersionConflict:
+                    retries += 1
+        return retries
+
+    conflicts = _run_threads(threads, increment)
+    assert UserModel.get_by_id(user["id"])["age"] == 1 + threads * 200, "증가 연산이 유실되었습니다"
+    print(f"  optimistic updates: {threads * 200} increments, {sum(conflicts)} conflicts retried, none lost")
+
+
+async def check_async_tasks(tasks: int) -> None:
+    """이벤트 루프의 태스크와 스레드 풀(to_thread)의 쓰기가 섞여도 id 와 버전이 어긋나지 않는지 확인합니다."""
+    reset_movies()
+    movies = MemoryMovieRepository()
+    movie = await movies.create(title="shared", playtime=1, genre="drama")
+
+    async def bump():
+        while True:
+            current = await movies.get_by_id(movie.id)
+            try:
+                await movies.update(movie.id, "shared", current.playtime + 1, "drama", expected_version=current.version)
+                return
+            except VersionConflict:
+                await asyncio.sleep(0)
+
+    async def create():
+        return (await movies.create(title="task", playtime=1, genre="drama")).id
+
+    thread_ids = asyncio.gather(*(asyncio.to_thread(
+        lambda: [MovieModel.create(title="thread", playtime=1, genre="drama").id for _ in range(100)])
+        for _ in range(8)))
+    results = await asyncio.gather(thread_ids, *(create() for _ in range(tasks)), *(bump() for _ in range(tasks)))
+    ids = [movie_id for batch in results[0] for movie_id in batch] + [r for r in results[1:] if r is not None]
+    assert len(set(ids)) == len(ids) == 800 + tasks
+    assert (await movies.get_by_id(movie.id)).playtime == 1 + tasks
+    print(f"  asyncio: {tasks} tasks + 8 threads, {len(ids)} unique ids, {tasks} versioned updates applied")
+
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    # GIL 전환을 자주 일으켜 경쟁 상태가 드러나기 쉽게 합니다.
+    sys.setswitchinterval(1e-6)
+    check_id_allocation(threads)
+    check_username_uniqueness(threads)
+    check_reads_during_writes(threads)
+    check_optimistic_updates(threads)
+    asyncio.run(check_async_tasks(1000))
+    print("ok")
+
+
+if __name__ == "__main__":
+    main()
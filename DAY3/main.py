@@ -1,116 +1,147 @@
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.models.users import UserModel
+from fastapi.responses import PlainTextResponse
 from app.models.movies import MovieModel
-from app.schemas.users import UserCreate, UserRead, UserUpdate, UserSearch
-from app.schemas.movies import MovieCreate, MovieRead, MovieSearch, MovieUpdate
-from typing import List
-from fastapi import Path, Depends, status
+from app.models.storage import LogStorage
+from app.models.users import UserModel
+from app.repositories import get_user_repository, set_repositories
+from app.utils.change_feed import change_feeds
+from app.utils.login_buffer import last_login_buffer
+from app.utils.metrics import METRICS_ENABLED, MetricsMiddleware, instrument, registry
+from app.utils.passwords import password_service
+from app.utils.rate_limit import login_guard
+from app.utils.profiling import LOOP_LAG_THRESHOLD_SECONDS, LoopLagMonitor
+from app.utils.response_cache import movie_search_cache, user_search_cache
+from app.utils.startup import STARTUP_MODE, LazyRouters, load_router
+from app.utils.token_cache import token_cache
+from app.utils.user_cache import user_cache
+
+
+# 설정하면 데이터를 이 디렉터리에 로그 + 스냅샷으로 저장하고, 시작할 때 복구합니다.
+STORAGE_DIR = os.getenv("STORAGE_DIR")
+# "memory"(기본값), "sqlite" 또는 "shared"(여러 워커가 store.py 프로세스의 데이터를 공유)
+REPOSITORY_BACKEND = os.getenv("REPOSITORY_BACKEND", "memory")
+SQLITE_PATH = os.getenv("SQLITE_PATH", "app.db")
+SQLITE_POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", "4"))
+STORE_SOCKET = os.getenv("STORE_SOCKET", "/tmp/fastapi-store.sock")
+# 설정하면 memory 백엔드가 비어 있을 때 이 fixture(미리 해싱한 유저 + 영화)를 넣습니다. "default" 는 fixtures/seed.json
+SEED_FIXTURE = os.getenv("SEED_FIXTURE")
+
+# 이벤트 루프를 막는 콜백을 찾는 감시기 (LOOP_LAG_THRESHOLD_MS=0 이면 끔)
+loop_lag_monitor = LoopLagMonitor() if LOOP_LAG_THRESHOLD_SECONDS > 0 else None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if loop_lag_monitor is not None:
+        loop_lag_monitor.start()
+    # shared 모드에서는 저장소 프로세스(store.py)가 영속화를 맡습니다.
+    if STORAGE_DIR and REPOSITORY_BACKEND != "shared":
+        UserModel.use_storage(LogStorage(os.path.join(STORAGE_DIR, "users")))
+        MovieModel.use_storage(LogStorage(os.path.join(STORAGE_DIR, "movies")))
+    if SEED_FIXTURE and REPOSITORY_BACKEND == "memory":
+        from app.models.fixtures import FIXTURE_PATH, seed
+
+        seed(FIXTURE_PATH if SEED_FIXTURE == "default" else SEED_FIXTURE)
+    pool = client = None
+    if REPOSITORY_BACKEND == "shared":
+        from app.repositories.shared import SharedMovieRepository, SharedUserRepository, StoreClient
+
+        client = await StoreClient(STORE_SOCKET).connect()
+        await client.follow_changes()
+        set_repositories(SharedUserRepository(client), SharedMovieRepository(client))
+    if REPOSITORY_BACKEND == "sqlite":
+        # aiosqlite 는 sqlite 백엔드를 쓸 때만 필요하므로 여기서 import 합니다.
+        from app.repositories.sqlite import SqliteMovieRepository, SqlitePool, SqliteUserRepository
+
+        pool = await SqlitePool(SQLITE_PATH, size=SQLITE_POOL_SIZE).open()
+        set_repositories(SqliteUserRepository(pool), SqliteMovieRepository(pool))
+    last_login_buffer.start(get_user_repository)
+    yield
+    # 남은 last_login 을 저장소를 닫기 전에 씁니다.
+    await last_login_buffer.stop()
+    # 열려 있는 변경 피드 스트림을 끝냅니다.
+    for feed in change_feeds.values():
+        feed.close()
+    # 종료 시 커넥션 풀, 비밀번호 해싱 워커 풀과 저장소를 정리합니다.
+    if pool is not None:
+        await pool.close()
+    if client is not None:
+        await client.close()
+    password_service.shutdown()
+    if loop_lag_monitor is not None:
+        loop_lag_monitor.stop()
+    UserModel.close_storage()
+    MovieModel.close_storage()
+
 
 # FastAPI 애플리케이션 인스턴스 생성
-app = FastAPI()
-
-# --- 유저 관련 라우터 ---
-@app.post("/users/", response_model=UserRead)
-async def create_user(user_data: UserCreate):
-    new_user = UserModel.create(
-        username=user_data.username,
-        age=user_data.age,
-        gender=user_data.gender
-    )
-    return new_user
-
-@app.get("/users/", response_model=List[UserRead])
-async def get_all_users():
-    users = UserModel.all()
-    if not users:
-        raise HTTPException(status_code=404, detail="User not found")
-    return users
-
-@app.get("/users/{user_id}", response_model=UserRead)
-async def get_user_by_id(user_id: int = Path(..., gt=0)):
-    user = UserModel.get_by_id(user_id)
-    if user is None:
-        raise HTTPException(status_code=404, detail="User not found")
-    return user
-
-@app.put("/users/{user_id}", response_model=UserRead)
-async def update_user(
-        user_id: int = Path(..., gt=0),
-        user_update_data: UserUpdate = ...
-):
-    user = UserModel.get_by_id(user_id)
-    if user is None:
-        raise HTTPException(status_code=404, detail="User not found")
-    user.update(user_update_data)
-    return user
-
-@app.delete("/users/{user_id}")
-async def delete_user(user_id: int = Path(..., gt=0)):
-    user = UserModel.get_by_id(user_id)
-    if user is None:
-        raise HTTPException(status_code=404, detail="User not found")
-    UserModel.delete(user_id)
-    return {"detail": f"User: {user_id}, Successfully Deleted."}
-
-@app.get("/users/search/", response_model=List[UserRead])
-async def search_users(params: UserSearch = Depends()):
-    users = UserModel.search(
-        username=params.username,
-        age=params.age,
-        gender=params.gender
-    )
-    if not users:
-        raise HTTPException(status_code=404, detail="User not found")
-    return users
-
-# --- 영화 관련 라우터 ---
-@app.post("/movies/", response_model=List[MovieRead], status_code=status.HTTP_201_CREATED)
-async def create_movie(movie_data: MovieCreate):
-    MovieModel.create(
-        title=movie_data.title,
-        playtime=movie_data.playtime,
-        genre=movie_data.genre
-    )
-    all_movies = MovieModel.all()
-    return all_movies
-
-@app.get("/movies/", response_model=List[MovieRead], status_code=status.HTTP_200_OK)
-async def get_movies(params: MovieSearch = Depends()):
-    is_search_query = params.title is not None or params.genre is not None
-
-    if is_search_query:
-        movies = MovieModel.search(title=params.title, genre=params.genre)
-        if not movies:
-            movies = MovieModel.all()
-    else:
-        movies = MovieModel.all()
-    return movies
-
-@app.get("/movies/{movie_id}", response_model=MovieRead, status_code=status.HTTP_200_OK)
-async def get_movie_by_id(movie_id: int = Path(..., gt=0)):
-    movie = MovieModel.get_by_id(movie_id)
-    if movie is None:
-        raise HTTPException(status_code=404, detail="Movie not found")
-    return movie
-
-@app.put("/movies/{movie_id}", response_model=MovieRead, status_code=status.HTTP_200_OK)
-async def update_movie(
-        movie_id: int = Path(..., gt=0),
-        movie_update_data: MovieUpdate = ...
-):
-    movie = MovieModel.get_by_id(movie_id)
-    if movie is None:
-        raise HTTPException(status_code=404, detail="Movie not found")
-    movie.update(
-        title=movie_update_data.title,
-        playtime=movie_update_data.playtime,
-        genre=movie_update_data.genre
-    )
-    return movie
-
-@app.delete("/movies/{movie_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_movie(movie_id: int = Path(..., gt=0)):
-    movie = MovieModel.get_by_id(movie_id)
-    if movie is None:
-        raise HTTPException(status_code=404, detail="Movie not found")
-    MovieModel.delete(movie_id)
+app = FastAPI(lifespan=lifespan)
+
+# --- 지표 (/metrics) ---
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    instrument(MovieModel, "movies", ["create", "create_many", "all", "page", "search", "get_by_id", "update", "delete"])
+    instrument(UserModel, "users", ["create_async", "create_many_async", "get_by_id", "get_by_username", "page",
+                                    "search", "update_async", "delete", "authenticate_async", "record_login"])
+    registry.add_collector("password_service", password_service.metrics)
+    registry.add_collector("token_cache", token_cache.stats)
+    registry.add_collector("user_cache", user_cache.stats)
+    registry.add_collector("last_login_buffer", last_login_buffer.stats)
+    registry.add_collector("movie_search_cache", movie_search_cache.stats)
+    registry.add_collector("user_search_cache", user_search_cache.stats)
+    registry.add_collector("movie_changes", change_feeds["movies"].stats)
+    registry.add_collector("user_changes", change_feeds["users"].stats)
+    if loop_lag_monitor is not None:
+        registry.add_collector("event_loop", loop_lag_monitor.stats)
+    registry.add_collector("login_rate_username", login_guard.by_username.stats)
+    registry.add_collector("login_rate_ip", login_guard.by_ip.stats)
+
+# --- 라우터 등록 ---
+ROUTERS = {
+    "/users": "app.routers.users:router",
+    "/movies": "app.routers.movies:movie_router",
+    "/debug": "app.routers.debug:debug_router",
+}
+if STARTUP_MODE == "lazy":
+    app.add_middleware(LazyRouters, target=app, routers=ROUTERS)
+else:
+    for target in ROUTERS.values():
+        app.include_router(load_router(target))
+
+
+# 비밀번호 해싱 워커 풀의 대기열 길이 / 지연 시간 지표
+@app.get("/metrics/passwords")
+async def get_password_metrics():
+    return password_service.metrics()
+
+
+# 검증된 토큰 캐시의 적중률 지표
+@app.get("/metrics/token-cache")
+async def get_token_cache_metrics():
+    return token_cache.stats()
+
+
+# 인증된 유저 캐시와 last_login 쓰기 버퍼 지표
+@app.get("/metrics/principal")
+async def get_principal_metrics():
+    return {"user_cache": user_cache.stats(), "last_login_buffer": last_login_buffer.stats()}
+
+
+# 검색 응답 캐시의 적중률 / 무효화 지표
+@app.get("/metrics/search-cache")
+async def get_search_cache_metrics():
+    return {"movies": movie_search_cache.stats(), "users": user_search_cache.stats()}
+
+
+# 로그인 시도 제한(유저명 / IP)의 허용 / 거절 지표
+@app.get("/metrics/login-guard")
+async def get_login_guard_metrics():
+    return login_guard.stats()
+
+
+# Prometheus 텍스트 형식의 전체 지표
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,38 @@
+"""공유 저장소 프로세스.
+
+여러 워커(uvicorn --workers N)가 같은 데이터를 보도록 메모리 모델을 이 프로세스 하나에만 두고 Unix 소켓으로 제공합니다.
+실행: DAY3 디렉터리에서 `python store.py` 후 `REPOSITORY_BACKEND=shared uvicorn main:app --workers 4`
+"""
+import asyncio
+import os
+import signal
+
+from app.models.movies import MovieModel
+from app.models.storage import LogStorage
+from app.models.users import UserModel
+from app.repositories.shared import StoreServer
+
+STORE_SOCKET = os.getenv("STORE_SOCKET", "/tmp/fastapi-store.sock")
+# 설정하면 main.py 의 memory 백엔드와 같은 방식(로그 + 스냅샷)으로 저장하고 복구합니다.
+STORAGE_DIR = os.getenv("STORAGE_DIR")
+
+
+async def main() -> None:
+    if STORAGE_DIR:
+        UserModel.use_storage(LogStorage(os.path.join(STORAGE_DIR, "users")))
+        MovieModel.use_storage(LogStorage(os.path.join(STORAGE_DIR, "movies")))
+    server = await StoreServer(STORE_SOCKET).start()
+    stop = asyncio.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        asyncio.get_running_loop().add_signal_handler(signum, stop.set)
+    print(f"store listening on {STORE_SOCKET}", flush=True)
+    try:
+        await stop.wait()
+    finally:
+        await server.close()
+        UserModel.close_storage()
+        MovieModel.close_storage()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())